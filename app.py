@@ -1,6 +1,6 @@
 # app.py
 import supabase
-from flask import Flask, request, redirect, url_for, render_template, session, flash, jsonify, g
+from flask import Flask, request, redirect, url_for, render_template, session, flash, jsonify, g, Response, send_file, stream_with_context, make_response
 from supabase import create_client, Client
 import hashlib
 import os
@@ -19,8 +19,25 @@ from google_auth import start_google_login, handle_google_callback
 from flask_session import Session
 from github_auth import start_github_login, handle_github_callback
 from state_storage import cleanup_expired_states
-from news_fetcher import load_news_data, start_news_updater
-from career_test import get_test_questions, calculate_career_matches, save_test_results, get_personality_insights, generate_pdf_report
+from news_archive import news_archive, parse_archive_day, MAX_ARCHIVE_RANGE_DAYS
+from news_fetcher import news_snapshot, news_page, start_news_updater, CATEGORIES as NEWS_CATEGORIES, NEWS_PAGE_SIZE, MAX_NEWS_PAGE_SIZE, MAX_NEWS_QUERY_LENGTH
+from reviews import (
+    fetch_review_page,
+    fetch_review_summary,
+    serialize_review,
+    toggle_review_like,
+    apply_review_aggregate_delta,
+    delete_review as delete_user_review,
+    review_cache,
+    MAX_REVIEW_PAGE_SIZE,
+    REVIEW_PAGE_SIZE
+)
+from career_cache import career_result_cache
+from report_jobs import report_queue, JOB_DONE, JOB_FAILED, REPORT_DELIVERY_MODE
+from report_export import stream_report_zip, parse_export_range
+from career_history import fetch_history_page, HISTORY_PAGE_SIZE, MAX_HISTORY_PAGE_SIZE
+from career_progress import progress_point, record_progress, fetch_progress_series, MAX_PROGRESS_POINTS
+from career_test import get_test_questions, calculate_career_matches, save_test_results, get_personality_insights, render_report, report_cache_key, cached_report_path, QUESTION_INDEX
 from subscription_plans import (
     FEATURES, 
     get_user_subscriptions, 
@@ -212,6 +229,31 @@ DEGREE_PROGRAMS = {
     }
 }
 
+def degree_route_key(level, stream, course):
+    """Build the DEGREE_ROUTES key for a set of /careers query parameters"""
+    # Only undergraduate degrees are grouped into streams
+    return (level, stream if level == "students" else None, course)
+
+def build_degree_routes(programs):
+    """
+    Flatten DEGREE_PROGRAMS into a lookup table for the degree pages
+    
+    Returns:
+        Dictionary mapping (level, stream, course) to (template name, degree path)
+    """
+    routes = {}
+    for level, level_data in programs.items():
+        if "streams" in level_data:
+            for stream, stream_data in level_data["streams"].items():
+                for degree in stream_data.get("degrees", []):
+                    routes[degree_route_key(level, stream, degree["id"])] = (degree["template"], f"{level}/{stream}/{degree['id']}")
+        for degree in level_data.get("degrees", []):
+            routes[degree_route_key(level, None, degree["id"])] = (degree["template"], f"{level}/{degree['id']}")
+    return routes
+
+# Degree page lookup table, built once at import time
+DEGREE_ROUTES = build_degree_routes(DEGREE_PROGRAMS)
+
 def init_supabase():
     """Initialize the Supabase client if not already done"""
     if app.supabase is None:
@@ -287,6 +329,22 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Email addresses allowed to use admin tools such as bulk report exports
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
+# Admin required decorator
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            flash('Please log in to access this page', 'error')
+            return redirect(url_for('login'))
+        if (session.get('email') or '').lower() not in ADMIN_EMAILS:
+            flash('You do not have permission to access this page', 'error')
+            return redirect(url_for('profile'))
+        return f(*args, **kwargs)
+    return decorated_function
+
 # Get career details by ID
 def get_career_by_id(career_id):
     for category in CAREER_CATEGORIES.values():
@@ -750,198 +808,51 @@ def careers():
     stream = request.args.get('stream')
     course = request.args.get('course')
     
-    # Redirect to specific templates based on query parameters
-    if level == 'students':
-        # Create degree path for students (includes stream)
-        degree_path = f"{level}/{stream}/{course}"
-        user_id = session.get('user_id')
-        username = session.get('username')
-        
-        # Initialize Supabase if not already done
-        init_supabase()
-        
-        # Get reviews for this degree path
-        reviews = []
-        try:
-            # Get all reviews for this degree path
-            reviews_response = app.supabase.table("Reviews").select("*").filter("degree_path", "eq", degree_path).order("created_at", desc=True).execute()
-            
-            if hasattr(reviews_response, 'data') and reviews_response.data:
-                for review in reviews_response.data:
-                    # Get username for each review
-                    user_response = app.supabase.table("Users").select("username").filter("id", "eq", review["user_id"]).execute()
-                    username_from_db = user_response.data[0]["username"] if user_response.data else "Anonymous"
-                    
-                    # Check if current user has liked this review
-                    user_liked = False
-                    if user_id:
-                        liked_response = app.supabase.table("ReviewLikes").select("*").filter("user_id", "eq", user_id).filter("review_id", "eq", review["review_id"]).execute()
-                        user_liked = hasattr(liked_response, 'data') and liked_response.data and len(liked_response.data) > 0
-                    
-                    # Convert string dates to datetime objects
-                    created_at = datetime.datetime.fromisoformat(review["created_at"].replace('Z', '+00:00')) if isinstance(review["created_at"], str) else review["created_at"]
-                    
-                    # Add review with username to the list
-                    reviews.append({
-                        **review,
-                        "username": username_from_db,
-                        "user_liked": user_liked,
-                        "created_at": created_at
-                    })
-        except Exception as e:
-            print(f"Error fetching reviews: {str(e)}")
-            # Continue without reviews if there's an error
-        
-        template_params = {
-            "categories": categories,
-            "reviews": reviews,
-            "user_id": user_id,
-            "username": username,
-            "degree_path": degree_path
-        }
-        
-        if stream == 'science':
-            if course == 'btech':
-                return render_template("students_science_btech.html", **template_params)
-            elif course == 'bsc':
-                return render_template("students_science_bsc.html", **template_params)
-        elif stream == 'commerce':
-            if course == 'bba':
-                return render_template("students_commerce_bba.html", **template_params)
-            elif course == 'bcom':
-                return render_template("students_commerce_bcom.html", **template_params)
-        elif stream == 'arts':
-            if course == 'ba':
-                return render_template("students_arts_ba.html", **template_params)
-        elif stream == 'education':
-            if course == 'bed':
-                return render_template("students_education_bed.html", **template_params)
-
-    elif level == 'graduates':
-        # Check for specific graduate courses
-        degree_path = f"{level}/{course}"
-        user_id = session.get('user_id')
-        username = session.get('username')
-        
-        # Initialize Supabase if not already done
-        init_supabase()
-        
-        # Get reviews for this degree path
-        reviews = []
-        try:
-            # Get all reviews for this degree path
-            reviews_response = app.supabase.table("Reviews").select("*").filter("degree_path", "eq", degree_path).order("created_at", desc=True).execute()
-            
-            if hasattr(reviews_response, 'data') and reviews_response.data:
-                for review in reviews_response.data:
-                    # Get username for each review
-                    user_response = app.supabase.table("Users").select("username").filter("id", "eq", review["user_id"]).execute()
-                    username_from_db = user_response.data[0]["username"] if user_response.data else "Anonymous"
-                    
-                    # Check if current user has liked this review
-                    user_liked = False
-                    if user_id:
-                        liked_response = app.supabase.table("ReviewLikes").select("*").filter("user_id", "eq", user_id).filter("review_id", "eq", review["review_id"]).execute()
-                        user_liked = hasattr(liked_response, 'data') and liked_response.data and len(liked_response.data) > 0
-                    
-                    # Convert string dates to datetime objects
-                    created_at = datetime.datetime.fromisoformat(review["created_at"].replace('Z', '+00:00')) if isinstance(review["created_at"], str) else review["created_at"]
-                    
-                    # Add review with username to the list
-                    reviews.append({
-                        **review,
-                        "username": username_from_db,
-                        "user_liked": user_liked,
-                        "created_at": created_at
-                    })
-        except Exception as e:
-            print(f"Error fetching reviews: {str(e)}")
-            # Continue without reviews if there's an error
-        
-        template_params = {
-            "categories": categories,
-            "reviews": reviews,
-            "user_id": user_id,
-            "username": username,
-            "degree_path": degree_path
-        }
-        
-        if course == 'mba':
-            return render_template("graduates_mba.html", **template_params)
-        elif course == 'mca':
-            return render_template("graduates_mca.html", **template_params)
-        elif course == 'msc':
-            return render_template("graduates_msc.html", **template_params)
-        elif course == 'mcom':
-            return render_template("graduates_mcom.html", **template_params)
-        elif course == 'ma':
-            return render_template("graduates_ma.html", **template_params)
-        elif course == 'med':
-            return render_template("graduates_med.html", **template_params)
-        elif course == 'pgdm':
-            return render_template("graduates_pgdm.html", **template_params)
-        else:
-            # Redirect to careers page if no specific graduate course is selected
-            return redirect(url_for('careers'))
-    elif level == 'postgraduates':
-        # Check for specific postgraduate courses
-        degree_path = f"{level}/{course}"
-        user_id = session.get('user_id')
-        username = session.get('username')
-        
-        # Initialize Supabase if not already done
-        init_supabase()
-        
-        # Get reviews for this degree path
-        reviews = []
-        try:
-            # Get all reviews for this degree path
-            reviews_response = app.supabase.table("Reviews").select("*").filter("degree_path", "eq", degree_path).order("created_at", desc=True).execute()
-            
-            if hasattr(reviews_response, 'data') and reviews_response.data:
-                for review in reviews_response.data:
-                    # Get username for each review
-                    user_response = app.supabase.table("Users").select("username").filter("id", "eq", review["user_id"]).execute()
-                    username_from_db = user_response.data[0]["username"] if user_response.data else "Anonymous"
-                    
-                    # Check if current user has liked this review
-                    user_liked = False
-                    if user_id:
-                        liked_response = app.supabase.table("ReviewLikes").select("*").filter("user_id", "eq", user_id).filter("review_id", "eq", review["review_id"]).execute()
-                        user_liked = hasattr(liked_response, 'data') and liked_response.data and len(liked_response.data) > 0
-                    
-                    # Convert string dates to datetime objects
-                    created_at = datetime.datetime.fromisoformat(review["created_at"].replace('Z', '+00:00')) if isinstance(review["created_at"], str) else review["created_at"]
-                    
-                    # Add review with username to the list
-                    reviews.append({
-                        **review,
-                        "username": username_from_db,
-                        "user_liked": user_liked,
-                        "created_at": created_at
-                    })
-        except Exception as e:
-            print(f"Error fetching reviews: {str(e)}")
-            # Continue without reviews if there's an error
-        
-        template_params = {
-            "categories": categories,
-            "reviews": reviews,
-            "user_id": user_id,
-            "username": username,
-            "degree_path": degree_path
-        }
-        
-        if course == 'phd':
-            return render_template("postgraduates_phd.html", **template_params)
-        elif course == 'postdoc':
-            return render_template("postgraduates_postdoc.html", **template_params)
-        else:
-            # Redirect to careers page if no specific postgraduate course is selected
+    # Look up the degree page for these query parameters
+    route = DEGREE_ROUTES.get(degree_route_key(level, stream, course))
+    
+    if route is None:
+        if level in ('graduates', 'postgraduates'):
+            # Redirect to careers page if no specific course is selected
             return redirect(url_for('careers'))
+        # If no specific template matches, use the default careers template
+        return render_template("careers.html", categories=categories)
+    
+    template_name, degree_path = route
+    user_id = session.get('user_id')
+    username = session.get('username')
     
-    # If no specific template matches, use the default careers template
-    return render_template("careers.html", categories=categories)
+    # Initialize Supabase if not already done
+    init_supabase()
+    
+    # Get the first page of reviews for this degree path; the rest are
+    # lazy-loaded by reviews.js from the reviews API
+    reviews = []
+    next_cursor = None
+    try:
+        # Reviews and author usernames come from the review cache when possible
+        reviews, next_cursor = fetch_review_page(app.supabase, degree_path, user_id, cache=review_cache)
+    except Exception as e:
+        print(f"Error fetching reviews: {str(e)}")
+        # Continue without reviews if there's an error
+    
+    # Get the precomputed rating summary for this degree path
+    review_summary = None
+    try:
+        review_summary = fetch_review_summary(app.supabase, degree_path, cache=review_cache)
+    except Exception as e:
+        print(f"Error fetching review summary: {str(e)}")
+    
+    return render_template(
+        template_name,
+        categories=categories,
+        reviews=reviews,
+        next_cursor=next_cursor,
+        review_summary=review_summary,
+        user_id=user_id,
+        username=username,
+        degree_path=degree_path
+    )
 
 @app.route("/careers/category/<category_id>")
 @login_required
@@ -1008,6 +919,44 @@ def search():
     )
 
 # Reviews functionality
+@app.route("/reviews/<path:degree_path>")
+@login_required
+def list_reviews(degree_path):
+    """Return a page of reviews for a degree program as JSON"""
+    user_id = session.get("user_id")
+    sort = request.args.get("sort", "recent")
+    cursor = request.args.get("cursor")
+    
+    try:
+        limit = min(max(int(request.args.get("limit", REVIEW_PAGE_SIZE)), 1), MAX_REVIEW_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid limit"}), 400
+    
+    try:
+        # Initialize Supabase if not already done
+        init_supabase()
+        
+        reviews, next_cursor = fetch_review_page(
+            app.supabase,
+            degree_path,
+            user_id,
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+            cache=review_cache
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        print(f"Error listing reviews: {str(e)}")
+        return jsonify({"success": False, "message": str(e)}), 500
+    
+    return jsonify({
+        "success": True,
+        "reviews": [serialize_review(review, user_id) for review in reviews],
+        "next_cursor": next_cursor
+    }), 200
+
 @app.route("/submit-review/<path:degree_path>", methods=["POST"])
 @login_required
 def submit_review(degree_path):
@@ -1079,6 +1028,14 @@ def submit_review(degree_path):
             
             if hasattr(response, 'data') and response.data:
                 print("Review inserted successfully")
+                
+                # Keep the degree path's rating summary up to date
+                try:
+                    apply_review_aggregate_delta(app.supabase, degree_path, rating, 1)
+                except Exception as aggregate_error:
+                    print(f"Error updating review aggregate: {str(aggregate_error)}")
+                    
+                review_cache.invalidate(degree_path)
                 # Note: UserActivities table doesn't exist, so we're skipping activity tracking
                 
                 return jsonify({"success": True, "review_id": review_id}), 200
@@ -1104,40 +1061,15 @@ def like_review(review_id):
         # Initialize Supabase if not already done
         init_supabase()
         
-        # Check if user has already liked this review
-        liked_response = app.supabase.table("ReviewLikes").select("*").filter("user_id", "eq", user_id).filter("review_id", "eq", review_id).execute()
+        # Toggle the like and update the counter atomically in the database
+        toggle = toggle_review_like(app.supabase, review_id, user_id)
         
-        if hasattr(liked_response, 'data') and liked_response.data and len(liked_response.data) > 0:
-            # User already liked this review, so unlike it
-            app.supabase.table("ReviewLikes").delete().filter("user_id", "eq", user_id).filter("review_id", "eq", review_id).execute()
-            
-            # Decrement likes count
-            review_response = app.supabase.table("Reviews").select("likes").filter("review_id", "eq", review_id).execute()
-            current_likes = review_response.data[0]["likes"] if review_response.data else 0
-            new_likes = max(0, current_likes - 1)  # Ensure likes don't go below 0
-            
-            app.supabase.table("Reviews").update({"likes": new_likes}).filter("review_id", "eq", review_id).execute()
-            
-            return jsonify({"success": True, "liked": False, "likes": new_likes}), 200
-        else:
-            # User hasn't liked this review yet, so add a like
-            like_data = {
-                "like_id": str(uuid.uuid4()),
-                "user_id": user_id,
-                "review_id": review_id,
-                "created_at": str(datetime.datetime.now())
-            }
-            
-            app.supabase.table("ReviewLikes").insert(like_data).execute()
-            
-            # Increment likes count
-            review_response = app.supabase.table("Reviews").select("likes").filter("review_id", "eq", review_id).execute()
-            current_likes = review_response.data[0]["likes"] if review_response.data else 0
-            new_likes = current_likes + 1
-            
-            app.supabase.table("Reviews").update({"likes": new_likes}).filter("review_id", "eq", review_id).execute()
-            
-            return jsonify({"success": True, "liked": True, "likes": new_likes}), 200
+        if toggle is None:
+            return jsonify({"success": False, "message": "Review not found"}), 404
+        
+        review_cache.patch_review(review_id, likes=toggle["likes"])
+        
+        return jsonify({"success": True, "liked": toggle["liked"], "likes": toggle["likes"]}), 200
             
     except Exception as e:
         print(f"Error liking review: {str(e)}")
@@ -1154,21 +1086,13 @@ def delete_review(review_id):
         # Initialize Supabase if not already done
         init_supabase()
         
-        # Check if the review exists and belongs to the current user
-        review_response = app.supabase.table("Reviews").select("*").filter("review_id", "eq", review_id).filter("user_id", "eq", user_id).execute()
+        # Delete the review, its likes and its share of the rating summary together
+        degree_path = delete_user_review(app.supabase, review_id, user_id)
         
-        if not hasattr(review_response, 'data') or not review_response.data:
+        if degree_path is None:
             return jsonify({"success": False, "message": "Review not found or you don't have permission to delete it"}), 404
-        
-        try:
-            # Delete all likes for this review
-            app.supabase.table("ReviewLikes").delete().filter("review_id", "eq", review_id).execute()
-        except Exception as likes_error:
-            print(f"Error deleting review likes: {str(likes_error)}")
-            # Continue even if deleting likes fails
-        
-        # Delete the review
-        app.supabase.table("Reviews").delete().filter("review_id", "eq", review_id).filter("user_id", "eq", user_id).execute()
+            
+        review_cache.invalidate(degree_path)
         
         # Note: UserActivities table doesn't exist, so we're skipping activity deletion
         
@@ -1576,11 +1500,82 @@ def verify_with_github():
 @app.route("/news")
 @login_required
 def news():
-    news_data = load_news_data()
+    # Served from memory; the snapshot reloads only when the data file changes
+    news_data = news_snapshot.get()
+    
+    # Unknown categories and malformed numbers fall back to the defaults
+    category = request.args.get('category')
+    if category not in NEWS_CATEGORIES:
+        category = None
+    try:
+        page = int(request.args.get('page', 1))
+    except ValueError:
+        page = 1
+    try:
+        page_size = min(max(int(request.args.get('page_size', NEWS_PAGE_SIZE)), 1), MAX_NEWS_PAGE_SIZE)
+    except ValueError:
+        page_size = NEWS_PAGE_SIZE
+    # Searches cover the whole feed, so they are applied before paging
+    query = request.args.get('q', '').strip()[:MAX_NEWS_QUERY_LENGTH]
+    
+    result = news_page(news_data, category, page, page_size, query)
     return render_template(
         "news.html", 
-        news_items=news_data.get('articles', []), 
-        last_updated=news_data.get('last_updated')
+        news_items=result['articles'], 
+        last_updated=news_data.get('last_updated'),
+        category=category,
+        query=query or None,
+        page=result['page'],
+        pages=result['pages'],
+        # Only carried in links when it differs from the default
+        page_size_arg=page_size if page_size != NEWS_PAGE_SIZE else None,
+        total=result['total'],
+        category_counts=result['category_counts']
+    )
+
+@app.route("/news/archive")
+@login_required
+def news_archive_page():
+    """
+    Browse archived education news by date range
+    """
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    try:
+        end = parse_archive_day(request.args['end']) if request.args.get('end') else today
+        start = parse_archive_day(request.args['start']) if request.args.get('start') else end - datetime.timedelta(days=6)
+    except ValueError:
+        flash("Please enter dates as YYYY-MM-DD", "error")
+        return redirect(url_for("news_archive_page"))
+    
+    category = request.args.get('category')
+    if category not in NEWS_CATEGORIES:
+        category = None
+    try:
+        page = int(request.args.get('page', 1))
+    except ValueError:
+        page = 1
+    
+    try:
+        articles = news_archive.query(start, end, category)
+    except ValueError as e:
+        flash(str(e), "error")
+        return redirect(url_for("news_archive_page"))
+    
+    # The archive query returns the whole range, so it is paged like the live feed
+    result = news_page({'articles': articles}, None, page, NEWS_PAGE_SIZE)
+    days = news_archive.days()
+    return render_template(
+        "news_archive.html",
+        news_items=result['articles'],
+        start=start.isoformat(),
+        end=end.isoformat(),
+        category=category,
+        page=result['page'],
+        pages=result['pages'],
+        total=result['total'],
+        first_day=days[0].isoformat() if days else None,
+        last_day=days[-1].isoformat() if days else None,
+        max_range_days=MAX_ARCHIVE_RANGE_DAYS
     )
 
 # Route for reporting bugs
@@ -1758,16 +1753,15 @@ def submit_career_test():
     answers = {}
     for key, value in request.form.items():
         # Only process question IDs (p1, p2, i1, etc.)
-        if key.startswith(('p', 'i', 's', 'v')) and len(key) <= 3:
+        if key in QUESTION_INDEX:
             answers[key] = value
     
-    # Calculate career matches based on plan type
-    results = calculate_career_matches(answers, plan_type)
-    
-    # Get personality insights based on plan type
-    personality_insights = get_personality_insights(answers, plan_type)
+    # Calculate career matches and personality insights based on plan type,
+    # reusing cached results for answers that were scored before
+    results, personality_insights = career_result_cache.get_results(answers, plan_type)
     
     # Save test results to database
+    result_id = None
     try:
         # Initialize Supabase if not already done
         init_supabase()
@@ -1788,10 +1782,19 @@ def submit_career_test():
             "answers": json.dumps(answers),
             "results": json.dumps(results),
             "personality_insights": json.dumps(personality_insights),
+            "top_matches": result_data["top_matches"],
             "plan_type": plan_type,
-            "created_at": str(datetime.datetime.now())
+            "created_at": result_data["created_at"]
         }).execute()
         
+        # Append the test to the user's progress time series
+        try:
+            record_progress(app.supabase, progress_point(
+                result_id, user_id, answers, results, result_data["created_at"]
+            ))
+        except Exception as e:
+            print(f"Error recording test progress: {str(e)}")
+        
         # Add to user activities
         app.supabase.table("UserActivities").insert({
             "id": str(uuid.uuid4()),
@@ -1810,9 +1813,9 @@ def submit_career_test():
         print(f"Error saving test results: {str(e)}")
         # Continue to show results even if saving fails
     
-    # Generate PDF report for premium users
-    pdf_report_path = None
-    if plan_type == "premium" and check_feature_access("career_test", "downloadable_report"):
+    # Queue PDF report generation for premium users
+    report_job = None
+    if result_id and plan_type == "premium" and check_feature_access("career_test", "downloadable_report"):
         try:
             # Get user data for the report
             user_data = {
@@ -1821,15 +1824,18 @@ def submit_career_test():
                 "email": session.get('email', '')
             }
             
-            # Generate the PDF report
-            pdf_report_path = generate_pdf_report(
+            # Generate the PDF report in the background
+            report_job = report_queue.enqueue(
+                result_id,
+                user_id,
                 user_data, 
                 results, 
-                personality_insights
+                personality_insights,
+                report_key=report_cache_key(result_id, user_data, results, personality_insights)
             )
         except Exception as e:
-            print(f"Error generating PDF report: {str(e)}")
-            # Continue without PDF if generation fails
+            print(f"Error queueing PDF report: {str(e)}")
+            # Continue without PDF if the report cannot be queued
     
     # Show results page
     return render_template(
@@ -1837,7 +1843,7 @@ def submit_career_test():
         results=results,
         personality_insights=personality_insights,
         plan_type=plan_type,
-        pdf_report_path=pdf_report_path
+        report_job=report_job
     )
 
 @app.route("/career-test-history")
@@ -1865,55 +1871,13 @@ def career_test_history():
     try:
         # Initialize test_history as an empty list
         test_history = []
+        next_cursor = None
         
-        # Try to get results from Supabase
+        # Try to get the first page of results from Supabase
         try:
-            results = app.supabase.table("CareerTestResults").select("*").filter("user_id", "eq", user_id).order("created_at", desc=True).execute()
-            
-            if results and hasattr(results, 'data') and results.data:
-                for result in results.data:
-                    try:
-                        # Parse the results JSON
-                        parsed_results = []
-                        if result.get("results"):
-                            try:
-                                parsed_results = json.loads(result.get("results", "[]"))
-                            except json.JSONDecodeError:
-                                parsed_results = []
-                        
-                        top_matches = []
-                        
-                        if parsed_results and len(parsed_results) > 0:
-                            # Get top matches (limit based on plan)
-                            match_limit = 3 if plan_type == "premium" else 2
-                            for match in parsed_results[:match_limit]:
-                                title = match.get("title", match.get("category_title", "Unknown"))
-                                top_matches.append({
-                                    "title": title,
-                                    "match_percentage": match.get("match_percentage", 0)
-                                })
-                        
-                        # Format the date
-                        try:
-                            if isinstance(result.get("created_at"), str):
-                                created_at = datetime.datetime.fromisoformat(result["created_at"].replace('Z', '+00:00'))
-                            else:
-                                created_at = result.get("created_at", datetime.datetime.now())
-                        except (ValueError, TypeError):
-                            created_at = datetime.datetime.now()
-                        
-                        # Get the test's plan type
-                        test_plan_type = result.get("plan_type", "free")
-                        
-                        test_history.append({
-                            "id": result.get("id"),
-                            "created_at": created_at,
-                            "top_matches": top_matches,
-                            "plan_type": test_plan_type
-                        })
-                    except Exception as item_error:
-                        print(f"Error processing test history item: {str(item_error)}")
-                        continue
+            # Get top matches (limit based on plan)
+            match_limit = 3 if plan_type == "premium" else 2
+            test_history, next_cursor = fetch_history_page(app.supabase, user_id, match_limit=match_limit)
         except Exception as db_error:
             print(f"Database error retrieving test history: {str(db_error)}")
             # Continue with empty test_history
@@ -1922,6 +1886,7 @@ def career_test_history():
         return render_template(
             "career_test_history.html", 
             test_history=test_history,
+            next_cursor=next_cursor,
             plan_type=plan_type,
             progress_tracking=progress_tracking
         )
@@ -1931,6 +1896,84 @@ def career_test_history():
         flash("An error occurred while retrieving your test history", "error")
         return redirect(url_for("profile"))
 
+@app.route("/career-test-history/page")
+def career_test_history_page():
+    """
+    Return a further page of the user's test history as JSON, for "load more"
+    """
+    user_id = session.get('user_id')
+    
+    if not user_id:
+        return jsonify({"success": False, "message": "You must be logged in to view your test history"}), 401
+    
+    plan_type = get_feature_tier("career_test")
+    match_limit = 3 if plan_type == "premium" else 2
+    
+    try:
+        limit = min(int(request.args.get("limit", HISTORY_PAGE_SIZE)), MAX_HISTORY_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid limit"}), 400
+    
+    init_supabase()
+    
+    try:
+        entries, next_cursor = fetch_history_page(
+            app.supabase,
+            user_id,
+            cursor=request.args.get("cursor"),
+            limit=limit,
+            match_limit=match_limit
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception as e:
+        print(f"Error loading test history page: {str(e)}")
+        return jsonify({"success": False, "message": str(e)}), 500
+    
+    return jsonify({
+        "success": True,
+        "tests": [{
+            "id": entry["id"],
+            "created_at_display": entry["created_at"].strftime('%B %d, %Y at %I:%M %p'),
+            "top_matches": entry["top_matches"],
+            "plan_type": entry["plan_type"],
+            "download_url": url_for('download_report', result_id=entry["id"]) if plan_type == "premium" and entry["plan_type"] == "premium" else None
+        } for entry in entries],
+        "next_cursor": next_cursor
+    })
+
+@app.route("/career-test-progress")
+def career_test_progress():
+    """
+    Return the user's trait, skill and value scores over time as JSON, for charting
+    """
+    user_id = session.get('user_id')
+    
+    if not user_id:
+        return jsonify({"success": False, "message": "You must be logged in to view your progress"}), 401
+    
+    if not check_feature_access("career_test", "progress_tracking"):
+        return jsonify({"success": False, "message": "Progress tracking is only available to Career Test Premium subscribers"}), 403
+    
+    try:
+        limit = min(int(request.args.get("limit", MAX_PROGRESS_POINTS)), MAX_PROGRESS_POINTS)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid limit"}), 400
+    
+    init_supabase()
+    
+    try:
+        series = fetch_progress_series(app.supabase, user_id, limit=limit)
+    except Exception as e:
+        print(f"Error loading test progress: {str(e)}")
+        return jsonify({"success": False, "message": str(e)}), 500
+    
+    return jsonify({"success": True, **series})
+
 @app.route("/download-report/<result_id>")
 @login_required
 def download_report(result_id):
@@ -1971,30 +2014,131 @@ def download_report(result_id):
             "email": session.get('email', '')
         }
         
-        # Generate the PDF report
-        pdf_report_path = generate_pdf_report(
+        # The report key identifies the report content, so it doubles as a weak ETag
+        report_key = report_cache_key(result_id, user_data, results, personality_insights)
+        if request.if_none_match.contains_weak(report_key):
+            response = make_response("", 304)
+            response.set_etag(report_key, weak=True)
+            return response
+        
+        # Serve a report rendered earlier from the same data straight from disk
+        report_path = cached_report_path(report_key)
+        if os.path.exists(report_path):
+            response = send_file(
+                report_path,
+                mimetype="text/plain",
+                as_attachment=True,
+                download_name="career_report.txt",
+                etag=False
+            )
+            response.set_etag(report_key, weak=True)
+            return response
+        
+        # Stream the report straight into the response without writing it to disk
+        if request.args.get("mode", REPORT_DELIVERY_MODE) == "stream":
+            response = Response(
+                stream_with_context(render_report(user_data, results, personality_insights)),
+                mimetype="text/plain",
+                headers={"Content-Disposition": "attachment; filename=career_report.txt"}
+            )
+            response.set_etag(report_key, weak=True)
+            return response
+        
+        # Queue the PDF report; repeated clicks join the job already in progress
+        report_job = report_queue.enqueue(
+            result_id,
+            user_id,
             user_data, 
             results, 
-            personality_insights
+            personality_insights,
+            report_key=report_key
         )
         
-        if pdf_report_path and os.path.exists(pdf_report_path):
-            # In a real implementation, this would return the PDF file
-            # For our implementation, we'll serve the text file
-            report_filename = os.path.basename(pdf_report_path)
-            report_url = url_for('static', filename=f'reports/{report_filename}')
-            
-            flash(f"Your report has been generated and is ready for download", "success")
-            return redirect(report_url)
-        else:
-            flash("An error occurred while generating your report", "error")
-            return redirect(url_for("career_test_history"))
+        return redirect(url_for("report_status", job_id=report_job["job_id"]))
         
     except Exception as e:
         print(f"Error generating PDF report: {str(e)}")
         flash("An error occurred while generating your PDF report", "error")
         return redirect(url_for("career_test_history"))
 
+@app.route("/admin/export-reports")
+@admin_required
+def export_reports():
+    """
+    Stream a zip archive with the career reports of a cohort (admins only).
+    Query parameters: user_ids (comma-separated), start and end (YYYY-MM-DD).
+    """
+    user_ids = [user_id.strip() for user_id in request.args.get("user_ids", "").split(",") if user_id.strip()]
+    start = request.args.get("start") or None
+    end = request.args.get("end") or None
+    
+    if not user_ids and not start and not end:
+        flash("Select users or a date range to export", "error")
+        return redirect(url_for("profile"))
+    
+    # Validate before streaming starts; an error inside the stream would leave a truncated zip
+    try:
+        start, end = parse_export_range(start, end)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    
+    # Initialize Supabase if not already done
+    init_supabase()
+    
+    archive_name = f"career_reports_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return Response(
+        stream_with_context(stream_report_zip(app.supabase, user_ids, start, end)),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={archive_name}"}
+    )
+
+@app.route("/report-jobs/<job_id>")
+def report_status(job_id):
+    """
+    Show the progress of a queued report, redirecting to the report once it is ready.
+    Requests sent with X-Requested-With: XMLHttpRequest get the job status as JSON.
+    """
+    user_id = session.get('user_id')
+    wants_json = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+    
+    if not user_id:
+        if wants_json:
+            return jsonify({"success": False, "message": "You must be logged in to download reports"}), 401
+        flash("You must be logged in to download reports", "error")
+        return redirect(url_for("login"))
+    
+    job = report_queue.get(job_id)
+    if not job or job["user_id"] != user_id:
+        if wants_json:
+            return jsonify({"success": False, "message": "Report not found"}), 404
+        flash("Report not found", "error")
+        return redirect(url_for("career_test_history"))
+    
+    report_url = None
+    if job["status"] == JOB_DONE:
+        # In a real implementation, this would return the PDF file
+        # For our implementation, we'll serve the text file
+        report_filename = os.path.basename(job["report_path"])
+        report_url = url_for('static', filename=f'reports/{report_filename}')
+    
+    if wants_json:
+        return jsonify({
+            "success": True,
+            "status": job["status"],
+            "report_url": report_url,
+            "message": job["error"]
+        })
+    
+    if job["status"] == JOB_DONE:
+        flash(f"Your report has been generated and is ready for download", "success")
+        return redirect(report_url)
+    
+    if job["status"] == JOB_FAILED:
+        flash("An error occurred while generating your report", "error")
+        return redirect(url_for("career_test_history"))
+    
+    return render_template("report_status.html", job=job)
+
 # Import network utilities
 from functools import wraps
 from flask import make_response
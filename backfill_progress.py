@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Script to build the CareerTestProgress time series from existing test results.
+Run this after deploying setup_career_test_table.sql, and with --rebuild after
+the question bank changes, so progress charts cover tests taken before then.
+"""
+
+import argparse
+import datetime
+import os
+
+from dotenv import load_dotenv
+
+from career_progress import backfill_progress
+from report_export import iter_career_test_results
+from supabase_client import create_client
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Backfill CareerMate career test progress')
+    parser.add_argument('--batch-size', type=int, default=500, help='Test results read per request')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute progress points that already exist')
+    args = parser.parse_args()
+
+    # Load Supabase credentials from the .env file
+    load_dotenv()
+    client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+    start_time = datetime.datetime.now()
+    print(f"Backfilling test progress at {start_time.strftime('%Y-%m-%d %H:%M:%S')}...")
+
+    read_total = 0
+    written_total = 0
+    pages = iter_career_test_results(client, "id, user_id, answers, top_matches, created_at", args.batch_size)
+    for read, written in backfill_progress(client, pages, rebuild=args.rebuild):
+        read_total += read
+        written_total += written
+        print(f"Read {read_total} test results, wrote {written_total} progress points")
+
+    time_taken = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"\nBackfilled {written_total} of {read_total} test results in {time_taken:.2f} seconds")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Script to re-score career test answer sets in bulk.
+Reads answer records from a JSONL file (or straight from the CareerTestResults
+table) and writes one JSON line of career matches and personality insights per
+record, in input order. Use it after changing CAREER_PROFILES or for cohort analyses.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from career_test import score_answer_sets, read_answer_sets_jsonl, BATCH_SCORE_CHUNK_SIZE
+from report_export import iter_career_test_results
+from supabase_client import create_client
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Batch score CareerMate career test answers')
+    parser.add_argument('input', nargs='?', help='JSONL file of {"id", "answers", "plan_type"} records (omit with --from-supabase)')
+    parser.add_argument('--from-supabase', action='store_true', help='Read every record from the CareerTestResults table')
+    parser.add_argument('--output', help='JSONL file to write results to (defaults to stdout)')
+    parser.add_argument('--plan-type', default='free', choices=['free', 'premium'], help='Plan for records without a plan_type')
+    parser.add_argument('--processes', type=int, default=None, help='Worker processes (defaults to the CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=BATCH_SCORE_CHUNK_SIZE, help='Records sent to a worker at a time')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows read per request with --from-supabase')
+    args = parser.parse_args()
+
+    if args.from_supabase:
+        # Load Supabase credentials from the .env file
+        load_dotenv()
+        client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+        pages = iter_career_test_results(client, "id, answers, plan_type", args.batch_size)
+        records = (row for rows in pages for row in rows)
+    elif args.input:
+        records = read_answer_sets_jsonl(args.input)
+    else:
+        parser.error("an input file or --from-supabase is required")
+
+    start_time = datetime.datetime.now()
+    print(f"Scoring answer sets at {start_time.strftime('%Y-%m-%d %H:%M:%S')}...", file=sys.stderr)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    scored = 0
+    try:
+        for result in score_answer_sets(records, args.plan_type, args.processes, args.chunk_size):
+            output.write(json.dumps(result) + "\n")
+            scored += 1
+    finally:
+        if args.output:
+            output.close()
+
+    time_taken = (datetime.datetime.now() - start_time).total_seconds()
+    rate = scored / time_taken if time_taken > 0 else 0
+    print(f"Scored {scored} answer sets in {time_taken:.2f} seconds ({rate:.0f} per second)", file=sys.stderr)
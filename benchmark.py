@@ -0,0 +1,1222 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for CareerMate hot paths.
+
+Run a single benchmark with:
+    python benchmark.py reviews --reviews 200
+
+Database-backed benchmarks run against StubSupabase, an in-memory stand-in
+for the Supabase client that counts round trips instead of hitting the network.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StubResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+def _split_top_level(text):
+    """Split a PostgREST logical expression on commas outside parentheses and quotes"""
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return parts
+
+
+def _compile_condition(expression):
+    """Compile a PostgREST or=(...) / and(...) expression into a row predicate"""
+    if expression.startswith("and("):
+        checks = [_compile_condition(part) for part in _split_top_level(expression[4:-1])]
+        return lambda row: all(check(row) for check in checks)
+    if expression.startswith("("):
+        checks = [_compile_condition(part) for part in _split_top_level(expression[1:-1])]
+        return lambda row: any(check(row) for check in checks)
+
+    column, operator, value = expression.split(".", 2)
+    value = value[1:-1].replace('\\"', '"') if value.startswith('"') else value
+
+    def check(row):
+        actual = row.get(column)
+        expected = type(actual)(value) if isinstance(actual, (int, float)) else value
+        return actual == expected if operator == "eq" else actual < expected
+    return check
+
+
+class StubParams:
+    """Collects raw query parameters added directly to a query, as the app does for or/order"""
+
+    def __init__(self, query):
+        self.query = query
+
+    def add(self, key, value):
+        if key == "or":
+            self.query.filters.append(_compile_condition(value))
+        elif key == "order":
+            for clause in value.split(","):
+                column, _, direction = clause.partition(".")
+                self.query.ordering.append((column, direction == "desc"))
+        else:
+            raise NotImplementedError(f"StubParams does not support parameter '{key}'")
+        return self
+
+
+# Conflict targets used by StubQuery.upsert
+STUB_PRIMARY_KEYS = {
+    "ReviewAggregates": "degree_path",
+    "CareerTestProgress": "id"
+}
+
+
+# Comparison operators supported by StubQuery.filter
+STUB_OPERATORS = {
+    "eq": lambda actual, expected: actual == expected,
+    "gt": lambda actual, expected: actual is not None and actual > expected,
+    "gte": lambda actual, expected: actual is not None and actual >= expected,
+    "lt": lambda actual, expected: actual is not None and actual < expected
+}
+
+
+class StubQuery:
+    """Chainable query builder mimicking the subset of postgrest-py used by the app"""
+
+    def __init__(self, stub, table):
+        self.stub = stub
+        self.table = table
+        self.action = "select"
+        self.payload = None
+        self.filters = []
+        self.ordering = []
+        self.row_limit = None
+        self.row_offset = 0
+        self.params = StubParams(self)
+
+    def select(self, *columns):
+        self.action = "select"
+        return self
+
+    def insert(self, payload):
+        self.action, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload):
+        self.action, self.payload = "upsert", payload
+        return self
+
+    def update(self, payload):
+        self.action, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def filter(self, column, operator, criteria):
+        if operator not in STUB_OPERATORS:
+            raise NotImplementedError(f"StubQuery does not support operator '{operator}'")
+        compare = STUB_OPERATORS[operator]
+        self.filters.append(lambda row: compare(row.get(column), criteria))
+        return self
+
+    def eq(self, column, value):
+        return self.filter(column, "eq", value)
+
+    def gt(self, column, value):
+        return self.filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self.filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self.filter(column, "lt", value)
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column, desc=False):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, size):
+        self.row_limit = size
+        return self
+
+    def range(self, start, end):
+        self.row_offset, self.row_limit = start, end - start
+        return self
+
+    def execute(self):
+        with self.stub.lock:
+            self.stub.round_trips += 1
+            return self._run()
+
+    def _run(self):
+        rows = self.stub.tables.setdefault(self.table, [])
+
+        if self.action == "insert":
+            payload = self.payload if isinstance(self.payload, list) else [self.payload]
+            rows.extend(dict(row) for row in payload)
+            return StubResponse([dict(row) for row in payload])
+
+        if self.action == "upsert":
+            key = STUB_PRIMARY_KEYS[self.table]
+            payload = self.payload if isinstance(self.payload, list) else [self.payload]
+            for new_row in payload:
+                existing = next((row for row in rows if row[key] == new_row[key]), None)
+                if existing is None:
+                    rows.append(dict(new_row))
+                else:
+                    existing.update(new_row)
+            return StubResponse([dict(row) for row in payload])
+
+        matched = [row for row in rows if all(check(row) for check in self.filters)]
+
+        if self.action == "update":
+            for row in matched:
+                row.update(self.payload)
+            return StubResponse([dict(row) for row in matched])
+
+        if self.action == "delete":
+            self.stub.tables[self.table] = [row for row in rows if row not in matched]
+            return StubResponse([dict(row) for row in matched])
+
+        for column, desc in reversed(self.ordering):
+            matched.sort(key=lambda row, column=column: row.get(column), reverse=desc)
+        if self.row_limit is not None:
+            matched = matched[self.row_offset:self.row_offset + self.row_limit]
+        return StubResponse([dict(row) for row in matched])
+
+
+class StubRpc:
+    def __init__(self, stub, function, params):
+        self.stub = stub
+        self.function = function
+        self.params = params
+
+    def execute(self):
+        # Each call runs under the stub lock, like a database function in its own transaction
+        with self.stub.lock:
+            self.stub.round_trips += 1
+            return StubResponse(self.function(self.stub, **self.params))
+
+
+class StubSupabase:
+    """In-memory Supabase client that counts every executed request"""
+
+    def __init__(self):
+        self.tables = {}
+        self.functions = {
+            "apply_review_aggregate_delta": stub_apply_review_aggregate_delta,
+            "toggle_review_like": stub_toggle_review_like,
+            "delete_review": stub_delete_review
+        }
+        self.round_trips = 0
+        self.lock = threading.RLock()
+
+    def table(self, name):
+        return StubQuery(self, name)
+
+    def rpc(self, name, params):
+        return StubRpc(self, self.functions[name], params)
+
+
+def stub_apply_review_aggregate_delta(stub, p_degree_path, p_rating, p_count_delta, p_likes_delta=0):
+    """In-memory equivalent of the apply_review_aggregate_delta database function"""
+    from reviews import empty_aggregate
+
+    aggregates = stub.tables.setdefault("ReviewAggregates", [])
+    aggregate = next((row for row in aggregates if row["degree_path"] == p_degree_path), None)
+    if aggregate is None:
+        aggregate = empty_aggregate(p_degree_path)
+        aggregates.append(aggregate)
+
+    aggregate["review_count"] += p_count_delta
+    if p_rating:
+        aggregate["rating_sum"] += p_count_delta * p_rating
+        aggregate[f"rating_{p_rating}"] += p_count_delta
+    aggregate["total_likes"] += p_likes_delta
+    return []
+
+
+def stub_toggle_review_like(stub, p_review_id, p_user_id):
+    """In-memory equivalent of the toggle_review_like database function"""
+    review = next((row for row in stub.tables.get("Reviews", []) if row["review_id"] == p_review_id), None)
+    if review is None:
+        return []
+
+    likes = stub.tables.setdefault("ReviewLikes", [])
+    existing = [row for row in likes if row["review_id"] == p_review_id and row["user_id"] == p_user_id]
+    if existing:
+        stub.tables["ReviewLikes"] = [row for row in likes if row not in existing]
+        review["likes"] = max(review["likes"] - 1, 0)
+        stub_apply_review_aggregate_delta(stub, review["degree_path"], None, 0, -1)
+        return [{"liked": False, "likes": review["likes"]}]
+
+    likes.append({"like_id": str(uuid.uuid4()), "user_id": p_user_id, "review_id": p_review_id})
+    review["likes"] += 1
+    stub_apply_review_aggregate_delta(stub, review["degree_path"], None, 0, 1)
+    return [{"liked": True, "likes": review["likes"]}]
+
+
+def stub_delete_review(stub, p_review_id, p_user_id):
+    """In-memory equivalent of the delete_review database function"""
+    reviews = stub.tables.get("Reviews", [])
+    review = next((row for row in reviews
+                   if row["review_id"] == p_review_id and row["user_id"] == p_user_id), None)
+    if review is None:
+        return []
+
+    stub.tables["ReviewLikes"] = [row for row in stub.tables.get("ReviewLikes", []) if row["review_id"] != p_review_id]
+    stub.tables["Reviews"] = [row for row in reviews if row is not review]
+    stub_apply_review_aggregate_delta(stub, review["degree_path"], review["rating"], -1, -review["likes"])
+    return [{"degree_path": review["degree_path"]}]
+
+
+def seed_reviews(stub, degree_path, count):
+    """Populate the stub with users, reviews and likes for one degree path"""
+    users = [{"id": str(uuid.uuid4()), "username": f"user{i}"} for i in range(max(1, count // 4))]
+    now = datetime.datetime(2025, 1, 1)
+    reviews = []
+    for i in range(count):
+        reviews.append({
+            "review_id": str(uuid.uuid4()),
+            "user_id": users[i % len(users)]["id"],
+            "degree_path": degree_path,
+            "rating": i % 5 + 1,
+            "review_text": f"Review number {i}",
+            "pros": None,
+            "cons": None,
+            "current_status": "Student",
+            "created_at": str(now + datetime.timedelta(minutes=i)),
+            "likes": i % 7
+        })
+    likes = [
+        {"like_id": str(uuid.uuid4()), "user_id": users[0]["id"], "review_id": review["review_id"]}
+        for review in reviews[::3]
+    ]
+    stub.tables["Users"] = users
+    stub.tables["Reviews"] = reviews
+    stub.tables["ReviewLikes"] = likes
+    return users[0]["id"]
+
+
+def bench_reviews(args):
+    from reviews import ReviewCache, fetch_review_page, fetch_review_summary, rebuild_review_aggregates
+
+    stub = StubSupabase()
+    degree_path = "graduates/mba"
+    viewer_id = seed_reviews(stub, degree_path, args.reviews)
+
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        stub.round_trips = 0
+        reviews, _ = fetch_review_page(stub, degree_path, viewer_id)
+    elapsed = time.perf_counter() - start
+
+    print(f"Degree page with {args.reviews} reviews, {len(reviews)} embedded in the first page")
+    print(f"Round trips per page view: {stub.round_trips}")
+    print(f"Hydration time per page view: {elapsed / args.iterations * 1000:.2f} ms (stub, no network)")
+
+    cache = ReviewCache()
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        stub.round_trips = 0
+        fetch_review_page(stub, degree_path, viewer_id, cache=cache)
+    elapsed = time.perf_counter() - start
+
+    print(f"Round trips per cached page view: {stub.round_trips}")
+    print(f"Cached hydration time per page view: {elapsed / args.iterations * 1000:.2f} ms")
+    print(f"Cache stats: {cache.stats()}")
+
+    rebuild_review_aggregates(stub)
+    stub.round_trips = 0
+    summary = fetch_review_summary(stub, degree_path)
+    print(f"Rating summary ({summary['count']} reviews, average {summary['average']}) in {stub.round_trips} round trip")
+
+    for sort in ("recent", "likes"):
+        stub.round_trips = 0
+        seen, cursor, pages = [], None, 0
+        while True:
+            page, cursor = fetch_review_page(stub, degree_path, viewer_id, sort=sort, cursor=cursor)
+            seen.extend(review["review_id"] for review in page)
+            pages += 1
+            if not cursor:
+                break
+        complete = len(seen) == len(set(seen)) == args.reviews
+        print(f"Paged through '{sort}' in {pages} pages, {stub.round_trips} round trips, every review once: {complete}")
+
+
+def bench_likes(args):
+    """Hammer /like-review through the Flask test client from many threads"""
+    from app import app
+
+    stub = StubSupabase()
+    seed_reviews(stub, "graduates/mba", 1)
+    review = stub.tables["Reviews"][0]
+    review["likes"] = 0
+    stub.tables["ReviewLikes"] = []
+    app.supabase = stub
+
+    user_ids = [str(uuid.uuid4()) for _ in range(args.clients)]
+
+    def click(user_id):
+        client = app.test_client()
+        with client.session_transaction() as flask_session:
+            flask_session["user_id"] = user_id
+        for _ in range(args.iterations):
+            client.post(f"/like-review/{review['review_id']}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        list(pool.map(click, user_ids))
+    elapsed = time.perf_counter() - start
+
+    clicks = args.clients * args.iterations
+    like_rows = len([row for row in stub.tables["ReviewLikes"] if row["review_id"] == review["review_id"]])
+    print(f"{clicks} clicks from {args.clients} concurrent users in {elapsed:.2f} s")
+    print(f"Round trips per click: {stub.round_trips / clicks:.2f}")
+    print(f"Likes counter: {review['likes']}, ReviewLikes rows: {like_rows}")
+    assert review["likes"] == like_rows, "likes counter drifted from the ReviewLikes rows"
+    # StubSupabase runs one query at a time, so this measures the route, not the
+    # database locking; tests/test_review_likes.py runs the SQL function concurrently
+
+
+def synthetic_career_profiles(count, seed=42):
+    """Generate career profiles shaped like CAREER_PROFILES over the real question dimensions"""
+    from career_test import CAREER_TEST_QUESTIONS, QUESTION_DIMENSIONS
+
+    rng = random.Random(seed)
+    names = {}
+    for category, questions in CAREER_TEST_QUESTIONS.items():
+        section, name_key = QUESTION_DIMENSIONS[category]
+        names.setdefault(section, sorted({question[name_key] for question in questions}))
+
+    profiles = {}
+    for i in range(count):
+        profile = {
+            "title": f"Synthetic Career {i}",
+            "category": rng.choice(["technology", "business", "healthcare", "education"]),
+            "education_paths": [f"Path {j}" for j in range(3)],
+            "skill_gaps": {}
+        }
+        for section in ("traits", "skills", "values"):
+            chosen = rng.sample(names[section], 5)
+            profile[section] = {name: round(rng.uniform(0.5, 0.9), 1) for name in chosen}
+            if section == "skills":
+                profile["skill_gaps"] = {name: f"Improve {name}" for name in chosen[:4]}
+        profiles[f"synthetic-{i}"] = profile
+    return profiles
+
+
+def synthetic_answers(count, seed=7):
+    """Generate complete premium answer sets for the real question bank"""
+    from career_test import CAREER_TEST_QUESTIONS
+
+    rng = random.Random(seed)
+    question_ids = [question["id"] for questions in CAREER_TEST_QUESTIONS.values() for question in questions]
+    return [{question_id: str(rng.randint(1, 5)) for question_id in question_ids} for _ in range(count)]
+
+
+def synthetic_question_bank(count):
+    """Expand the real question bank to count questions, cycling through its dimensions"""
+    from career_test import CAREER_TEST_QUESTIONS
+
+    per_category = count // len(CAREER_TEST_QUESTIONS)
+    bank = {}
+    for category, questions in CAREER_TEST_QUESTIONS.items():
+        prefix = questions[0]["id"][0]
+        bank[category] = [
+            dict(questions[i % len(questions)], id=f"{prefix}{i + 1}")
+            for i in range(per_category)
+        ]
+    return bank
+
+
+def bench_matching(args):
+    from career_test import CAREER_TEST_QUESTIONS, CareerMatchEngine
+
+    answer_sets = synthetic_answers(args.iterations)
+    for count in (12, 1000, args.profiles):
+        engine = CareerMatchEngine(CAREER_TEST_QUESTIONS, synthetic_career_profiles(count))
+        profiles = [engine.aggregate(answers) for answers in answer_sets]
+
+        start = time.perf_counter()
+        for profile in profiles:
+            sorted(engine.match(profile), key=lambda x: x["match_percentage"], reverse=True)[:10]
+        full_sort = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for profile in profiles:
+            engine.top_matches(profile, 10)
+        top_k = time.perf_counter() - start
+
+        print(f"{count:>6} profiles: describe and sort all {full_sort / len(profiles) * 1000:.2f} ms, "
+              f"top 10 {top_k / len(profiles) * 1000:.2f} ms per submission")
+
+
+def bench_answers(args):
+    from career_test import CAREER_PROFILES, CAREER_TEST_QUESTIONS, CareerMatchEngine, get_personality_insights
+
+    banks = [("premium question set", CAREER_TEST_QUESTIONS), ("600-question bank", synthetic_question_bank(600))]
+    for label, bank in banks:
+        engine = CareerMatchEngine(bank, CAREER_PROFILES)
+        rng = random.Random(7)
+        question_ids = list(engine.question_index)
+        answer_sets = [{question_id: str(rng.randint(1, 5)) for question_id in question_ids} for _ in range(args.iterations)]
+
+        timings = {"aggregate": 0.0, "matches": 0.0, "insights": 0.0}
+        for answers in answer_sets:
+            start = time.perf_counter()
+            profile = engine.aggregate(answers)
+            parsed = time.perf_counter()
+            engine.top_matches(profile, 10)
+            matched = time.perf_counter()
+            get_personality_insights(answers, "premium", profile=profile)
+            done = time.perf_counter()
+            timings["aggregate"] += parsed - start
+            timings["matches"] += matched - parsed
+            timings["insights"] += done - matched
+
+        per_submission = {name: total / len(answer_sets) * 1000 for name, total in timings.items()}
+        print(f"{label} ({len(question_ids)} questions): "
+              f"aggregate {per_submission['aggregate']:.3f} ms, "
+              f"matches {per_submission['matches']:.3f} ms, "
+              f"insights {per_submission['insights']:.3f} ms, "
+              f"total {sum(per_submission.values()):.3f} ms per submission")
+
+
+def bench_batch(args):
+    from career_test import score_answer_sets
+
+    records = [
+        {"id": str(i), "answers": json.dumps(answers), "plan_type": "premium"}
+        for i, answers in enumerate(synthetic_answers(args.answer_sets))
+    ]
+    for processes in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        scored = sum(1 for _ in score_answer_sets(records, processes=processes))
+        elapsed = time.perf_counter() - start
+        print(f"{processes:>3} processes: {scored} answer sets in {elapsed:.2f} s ({scored / elapsed:.0f} per second)")
+
+
+def bench_cache(args):
+    import tempfile
+    from career_cache import CareerResultCache
+
+    answer_sets = synthetic_answers(args.iterations)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CareerResultCache(directory=directory)
+        shared = CareerResultCache(directory=directory)
+        runs = [
+            ("miss (score and store)", cache),
+            ("in-process hit", cache),
+            ("shared hit from another worker", shared),
+        ]
+        for label, worker_cache in runs:
+            start = time.perf_counter()
+            for answers in answer_sets:
+                worker_cache.get_results(answers, "premium")
+            elapsed = time.perf_counter() - start
+            print(f"{label}: {elapsed / len(answer_sets) * 1000:.3f} ms per submission")
+        print(f"Stats: {cache.stats()}")
+
+
+def bench_report(args):
+    """Compare report delivery through the job queue, streaming and the on-disk cache"""
+    import shutil
+    import tempfile
+    import career_test
+    import report_jobs
+    from app import app
+
+    reports_dir = tempfile.mkdtemp()
+    career_test.REPORTS_DIR = reports_dir
+    report_jobs.report_queue.db_path = os.path.join(reports_dir, "report_jobs.db")
+
+    answers = synthetic_answers(1)[0]
+    stub = StubSupabase()
+    stub.tables["CareerTestResults"] = [{
+        "id": str(i),
+        "user_id": "benchmark-user",
+        "results": json.dumps(career_test.calculate_career_matches(answers, "premium")),
+        "personality_insights": json.dumps(career_test.get_personality_insights(answers, "premium")),
+        "plan_type": "premium"
+    } for i in range(args.iterations)]
+    app.supabase = stub
+
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session["user_id"] = "benchmark-user"
+        flask_session["subscriptions"] = {"career_test": {"active": True}}
+
+    def first_byte(path, **kwargs):
+        start = time.perf_counter()
+        response = client.get(path, **kwargs)
+        next(iter(response.response), None)
+        elapsed = time.perf_counter() - start
+        response.close()
+        return elapsed, response
+
+    try:
+        stream_times = [first_byte(f"/download-report/{i}?mode=stream")[0] for i in range(args.iterations)]
+
+        queue_times = []
+        for i in range(args.iterations):
+            start = time.perf_counter()
+            response = client.get(f"/download-report/{i}?mode=queue")
+            status_url = response.location
+            while True:
+                status = client.get(status_url, headers={"X-Requested-With": "XMLHttpRequest"}).get_json()
+                if status["status"] in (report_jobs.JOB_DONE, report_jobs.JOB_FAILED):
+                    break
+                time.sleep(0.001)
+            queue_times.append(time.perf_counter() - start)
+
+        cached_times = [first_byte(f"/download-report/{i}")[0] for i in range(args.iterations)]
+        _, response = first_byte("/download-report/0")
+        etag = response.headers["ETag"]
+        not_modified = [first_byte("/download-report/0", headers={"If-None-Match": etag})[0] for _ in range(args.iterations)]
+    finally:
+        report_jobs.report_queue.stop()
+        shutil.rmtree(reports_dir, ignore_errors=True)
+
+    for label, times in (("queued render until ready", queue_times),
+                         ("streamed, first byte", stream_times),
+                         ("cached file, first byte", cached_times),
+                         ("conditional 304", not_modified)):
+        print(f"{label}: {sum(times) / len(times) * 1000:.2f} ms per download")
+
+
+def seed_career_test_results(stub, count, users=50):
+    """Add count stored test results, spread across users, to a stub database"""
+    import career_test
+
+    answers = synthetic_answers(1)[0]
+    results = json.dumps(career_test.calculate_career_matches(answers, "premium"))
+    insights = json.dumps(career_test.get_personality_insights(answers, "premium"))
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+
+    stub.tables.setdefault("Users", []).extend(
+        {"id": user_id, "username": f"student{i}", "email": f"student{i}@example.edu"}
+        for i, user_id in enumerate(user_ids)
+    )
+    stub.tables.setdefault("CareerTestResults", []).extend({
+        "id": str(uuid.uuid4()),
+        "user_id": user_ids[i % users],
+        "answers": json.dumps(answers),
+        "results": results,
+        "personality_insights": insights,
+        "plan_type": "premium",
+        "created_at": (datetime.datetime(2024, 1, 1) + datetime.timedelta(minutes=i)).isoformat()
+    } for i in range(count))
+
+
+def bench_export(args):
+    """Stream cohort exports of different sizes and track the peak memory of the streaming process"""
+    import io
+    import tracemalloc
+    import zipfile
+    from report_export import stream_report_zip
+
+    for count in (10, 1000, args.reports):
+        stub = StubSupabase()
+        seed_career_test_results(stub, count)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        size = 0
+        checksum = io.BytesIO() if count <= 1000 else None
+        for chunk in stream_report_zip(stub, start="2024-01-01", processes=os.cpu_count() or 1):
+            size += len(chunk)
+            if checksum is not None:
+                checksum.write(chunk)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        members = len(zipfile.ZipFile(checksum).namelist()) if checksum is not None else count
+        print(f"{members:>6} reports: {size / 1024:.0f} KiB archive in {elapsed:.2f} s, "
+              f"peak traced memory {peak / 1024:.0f} KiB, {stub.round_trips} round trips")
+
+
+def bench_history(args):
+    """Load the first history page for users with short and long test histories"""
+    from career_test import summarize_top_matches
+    from career_history import fetch_history_page
+
+    for count in (10, 100, 1000):
+        stub = StubSupabase()
+        seed_career_test_results(stub, count, users=1)
+        for row in stub.tables["CareerTestResults"]:
+            row["top_matches"] = summarize_top_matches(json.loads(row["results"]))
+        user_id = stub.tables["Users"][0]["id"]
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            entries, _ = fetch_history_page(stub, user_id)
+        elapsed = time.perf_counter() - start
+
+        payload = len(json.dumps([{key: row[key] for key in ("id", "created_at", "plan_type", "top_matches")}
+                                  for row in stub.tables["CareerTestResults"][:len(entries)]]))
+        full = len(json.dumps(stub.tables["CareerTestResults"]))
+        print(f"{count:>5} past tests: {len(entries)} entries, {stub.round_trips / args.iterations:.0f} round trip, "
+              f"~{payload / 1024:.1f} KiB selected (select * would read {full / 1024:.0f} KiB), "
+              f"{elapsed / args.iterations * 1000:.2f} ms in the stub")
+
+
+def bench_progress(args):
+    """Backfill the progress series, then read it back against re-parsing every stored result"""
+    from career_progress import backfill_progress, fetch_progress_series
+    from report_export import iter_career_test_results
+
+    for count in (10, 100, 1000):
+        stub = StubSupabase()
+        seed_career_test_results(stub, count, users=1)
+        user_id = stub.tables["Users"][0]["id"]
+
+        start = time.perf_counter()
+        pages = iter_career_test_results(stub, "id, user_id, answers, top_matches, created_at", 500)
+        written = sum(points for read, points in backfill_progress(stub, pages))
+        backfill_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            series = fetch_progress_series(stub, user_id)
+        series_time = (time.perf_counter() - start) / args.iterations
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            rows = stub.table("CareerTestResults").select("*").eq("user_id", user_id).execute().data
+            trend = [json.loads(row["results"])[0]["match_percentage"] for row in rows]
+        parse_time = (time.perf_counter() - start) / args.iterations
+
+        payload = len(json.dumps(series))
+        print(f"{count:>5} past tests: backfilled {written} points in {backfill_time:.2f} s; "
+              f"series of {len(series['timestamps'])} points ({payload / 1024:.1f} KiB) in {series_time * 1000:.2f} ms, "
+              f"re-parsing {len(trend)} result blobs takes {parse_time * 1000:.2f} ms")
+
+
+def synthetic_news_fixtures(sites):
+    """Build News API, Google News and education site responses in the shape the fetcher parses"""
+    topics = ["university admissions", "career readiness", "online learning", "scholarship funding", "education policy"]
+    news_api = {"status": "ok", "articles": [{
+        "title": f"Report on {topics[i % len(topics)]} #{i}",
+        "description": f"New research on {topics[i % len(topics)]} for college students.",
+        "url": f"https://example.org/news/{i}",
+        "urlToImage": None,
+        "source": {"name": "Example Wire"},
+        "publishedAt": f"2024-05-{i % 28 + 1:02d}T08:00:00Z"
+    } for i in range(20)]}
+
+    google_articles = "".join(
+        f'<article><h3><a href="./articles/{i}">University degree news {i}</a></h3>'
+        f'<div class="TVFRme x"><a>Campus Daily</a><time>{i} hours ago</time></div></article>'
+        for i in range(8)
+    )
+    fixtures = {
+        "news_api.json": json.dumps(news_api).encode(),
+        "google_news.html": f"<html><body>{google_articles}</body></html>".encode()
+    }
+
+    for index, site in enumerate(sites):
+        tag, attributes = site["article_selector"].split(".", 1)
+        heading = site["title_selector"].split()[0]
+        description_tag, description_class = site["description_selector"].split(".", 1)
+        date_tag, date_class = site["date_selector"].split(".", 1)
+        articles = "".join(
+            f'<{tag} class="{attributes}"><{heading}><a href="/story/{i}">College career story {i}</a></{heading}>'
+            f'<{description_tag} class="{description_class}">Students and degree programs, part {i}.</{description_tag}>'
+            f'<{date_tag} class="{date_class}">May {i + 1}, 2024</{date_tag}></{tag}>'
+            for i in range(6)
+        )
+        fixtures[f"site_{index}.html"] = f"<html><body>{articles}</body></html>".encode()
+    return fixtures
+
+
+def start_news_stub(fixtures, delays):
+    """
+    Serve news fixtures from a local HTTP server
+
+    Paths are /newsapi, /google/search and /sites/<index>/. delays maps a path
+    prefix to the seconds the server waits before answering it. News API and
+    Google News answers carry an ETag and honour If-None-Match; the sites send
+    no validators, like many CMS front pages.
+    """
+    import hashlib
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            for prefix, delay in delays.items():
+                if path.startswith(prefix):
+                    time.sleep(delay)
+            if path == "/newsapi":
+                body, content_type = fixtures["news_api.json"], "application/json"
+            elif path == "/google/search":
+                body, content_type = fixtures["google_news.html"], "text/html"
+            elif path.startswith("/sites/"):
+                body, content_type = fixtures[f"site_{path.split('/')[2]}.html"], "text/html"
+            else:
+                self.send_error(404)
+                return
+            etag = None if path.startswith("/sites/") else '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+            try:
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        # Every source connects at once; the default backlog of 5 would delay some by a SYN retry
+        request_queue_size = 64
+        daemon_threads = True
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def point_news_fetcher_at(news_fetcher, server, sites):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    news_fetcher.NEWS_API_KEY = news_fetcher.NEWS_API_KEY or "benchmark"
+    news_fetcher.NEWS_API_URL = f"{base}/newsapi"
+    news_fetcher.GOOGLE_NEWS_URL = f"{base}/google"
+    news_fetcher.EDUCATION_SITES = [dict(site, url=f"{base}/sites/{index}/") for index, site in enumerate(sites)]
+
+
+def bench_news(args):
+    """Refresh the news from a local HTTP stub, serially, concurrently and against a warm HTTP cache"""
+    import logging
+    import tempfile
+    import news_fetcher
+
+    logging.getLogger("news_fetcher").setLevel(logging.WARNING)
+    sites = list(news_fetcher.EDUCATION_SITES)
+
+    if args.news_fixtures:
+        # Replay recorded responses: news_api.json, google_news.html and site_<index>.html
+        fixtures = {}
+        for name in os.listdir(args.news_fixtures):
+            with open(os.path.join(args.news_fixtures, name), "rb") as f:
+                fixtures[name] = f.read()
+    else:
+        fixtures = synthetic_news_fixtures(sites)
+
+    latency = args.news_latency
+    requests_per_refresh = 1 + len(news_fetcher.GOOGLE_NEWS_QUERIES) + len(sites)
+    slowest = latency * 3
+
+    # Every source answers after the base latency, and one site is three times slower
+    server = start_news_stub(fixtures, {"/newsapi": latency, "/google": latency, "/sites/0": latency, "/sites/1": slowest})
+    point_news_fetcher_at(news_fetcher, server, sites)
+    cache_dir = tempfile.mkdtemp(prefix="news_cache_")
+    try:
+        for label, workers in (("serial", 1), ("concurrent", news_fetcher.NEWS_FETCH_WORKERS)):
+            news_fetcher.news_http_cache = news_fetcher.HttpCache(os.path.join(cache_dir, f"{label}.json"))
+            start = time.perf_counter()
+            news_api, google, sites_articles = news_fetcher.fetch_all_sources(deadline=60, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>10}: {requests_per_refresh} requests in {elapsed:.2f} s "
+                  f"({len(news_api)} News API, {len(google)} Google News, {len(sites_articles)} site articles; "
+                  f"slowest source takes {slowest:.2f} s)")
+    finally:
+        server.shutdown()
+
+    # Unchanged pages are answered with 304 or recognised by their body hash and not parsed again
+    server = start_news_stub(fixtures, {})
+    point_news_fetcher_at(news_fetcher, server, sites)
+    news_fetcher.news_http_cache = news_fetcher.HttpCache(os.path.join(cache_dir, "conditional.json"))
+    try:
+        for label in ("cold cache", "warm cache"):
+            news_fetcher.news_http_cache.reset_stats()
+            start = time.perf_counter()
+            articles = sum(len(source) for source in news_fetcher.fetch_all_sources(deadline=60))
+            elapsed = time.perf_counter() - start
+            stats = news_fetcher.news_http_cache.stats
+            print(f"{label:>10}: {articles} articles in {elapsed * 1000:.1f} ms; {stats['parsed']} parsed, "
+                  f"{stats['not_modified']} not modified, {stats['unchanged']} unchanged, "
+                  f"{stats['bytes'] / 1024:.1f} KiB of bodies downloaded")
+    finally:
+        server.shutdown()
+
+    # A site that hangs past the refresh deadline only costs its own articles
+    deadline = slowest + latency
+    server = start_news_stub(fixtures, {"/newsapi": latency, "/google": latency, "/sites/0": latency, "/sites/1": deadline * 4})
+    point_news_fetcher_at(news_fetcher, server, sites)
+    news_fetcher.news_http_cache = news_fetcher.HttpCache(os.path.join(cache_dir, "deadline.json"))
+    try:
+        start = time.perf_counter()
+        news_api, google, sites_articles = news_fetcher.fetch_all_sources(deadline=deadline)
+        elapsed = time.perf_counter() - start
+        print(f"{'deadline':>10}: stopped after {elapsed:.2f} s (deadline {deadline:.2f} s) with partial results: "
+              f"{len(news_api)} News API, {len(google)} Google News, {len(sites_articles)} site articles")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def lease_contender(lease_path, log_path, ttl, interval, stop_at):
+    """Worker process competing for the news updater lease, logging each refresh it performs"""
+    import news_fetcher
+
+    lease = news_fetcher.LeaderLease(lease_path, ttl=ttl)
+    while time.time() < stop_at:
+        if lease.acquire() and lease.refresh_due(interval):
+            with open(log_path, "a") as f:
+                f.write(f"{time.time()} {os.getpid()}\n")
+            lease.mark_refreshed()
+        time.sleep(interval / 10)
+
+
+def bench_lease(args):
+    """Run several processes against one updater lease, then crash and freeze the leader"""
+    import logging
+    import multiprocessing
+    import signal
+    import tempfile
+
+    logging.getLogger("news_fetcher").setLevel(logging.ERROR)
+    directory = tempfile.mkdtemp(prefix="news_lease_")
+    lease_path = os.path.join(directory, "updater.lease")
+    log_path = os.path.join(directory, "refreshes.log")
+    ttl, interval, phase = 1.0, 0.2, 2.0
+
+    def leader_pid():
+        with open(lease_path) as f:
+            return json.load(f)["pid"]
+
+    def refreshes():
+        with open(log_path) as f:
+            return [(float(t), int(pid)) for t, pid in (line.split() for line in f)]
+
+    stop_at = time.time() + phase * 3
+    processes = [multiprocessing.Process(target=lease_contender, args=(lease_path, log_path, ttl, interval, stop_at))
+                 for _ in range(args.clients)]
+    try:
+        for process in processes:
+            process.start()
+
+        time.sleep(phase)
+        crashed = leader_pid()
+        os.kill(crashed, signal.SIGKILL)
+        crashed_at = time.time()
+        # Reap it like gunicorn's arbiter would, so the PID no longer exists
+        next(process for process in processes if process.pid == crashed).join()
+
+        time.sleep(phase)
+        frozen = leader_pid()
+        os.kill(frozen, signal.SIGSTOP)
+        frozen_at = time.time()
+
+        for process in processes:
+            process.join(timeout=phase * 2)
+        os.kill(frozen, signal.SIGCONT)
+
+        log = refreshes()
+        leaders = [pid for t, pid in log]
+        gaps = [b[0] - a[0] for a, b in zip(log, log[1:])]
+        overlaps = sum(1 for gap in gaps if gap < interval * 0.9)
+        after_crash = next(t for t, pid in log if t > crashed_at)
+        after_freeze = next(t for t, pid in log if t > frozen_at)
+        print(f"{args.clients} processes, {len(log)} refreshes by {len(set(leaders))} successive leaders "
+              f"(interval {interval} s, lease TTL {ttl} s); refreshes closer than the interval: {overlaps}")
+        print(f"crashed leader replaced after {after_crash - crashed_at:.2f} s (dead PID on this host), "
+              f"frozen leader after {after_freeze - frozen_at:.2f} s (lease expiry)")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def synthetic_news_articles(count):
+    """Build stored news articles in the shape update_news_data writes"""
+    categories = ["higher-education", "technology", "policy", "career"]
+    now = datetime.datetime.now().timestamp()
+    return [{
+        "title": f"Education story {i}",
+        "description": f"Students, degrees and careers: update number {i} on campus life and the job market.",
+        "url": f"https://example.org/story/{i}",
+        "image_url": None,
+        "source": f"Source {i % 7}",
+        "published_date": "May 01, 2024",
+        "categories": [categories[i % 4], categories[(i // 4) % 4]] if i % 3 else [categories[i % 4]],
+        "added_timestamp": now - i * 60
+    } for i in range(count)]
+
+
+def bench_newsfeed(args):
+    """Serve /news data: parsing the file per request vs the snapshot, and filtered pages via the category index"""
+    import logging
+    import tempfile
+    import news_fetcher
+
+    logging.getLogger("news_fetcher").setLevel(logging.WARNING)
+    directory = tempfile.mkdtemp(prefix="news_feed_")
+    try:
+        for count in (50, 500, 5000):
+            path = os.path.join(directory, f"news_{count}.json")
+            news_fetcher.write_json_atomic(path, {"last_updated": "now", "articles": synthetic_news_articles(count)},
+                                           ensure_ascii=False, indent=2)
+
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                with open(path, "r", encoding="utf-8") as f:
+                    json.load(f)
+            per_load = (time.perf_counter() - start) / args.iterations
+
+            snapshot = news_fetcher.NewsSnapshot(path)
+            snapshot.get()
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                snapshot.get()
+            per_get = (time.perf_counter() - start) / args.iterations
+
+            # Another process replacing the file is picked up at the next check
+            news_fetcher.write_json_atomic(path, {"last_updated": "later", "articles": []})
+            snapshot.checked_at = 0
+            reloaded = snapshot.get()["last_updated"] == "later"
+
+            print(f"{count:>5} articles: json.load per request {per_load * 1000:.3f} ms, "
+                  f"snapshot {per_get * 1e6:.2f} us; picked up a replaced file: {reloaded}")
+
+            # A filtered page: scanning every article vs slicing the precomputed category index
+            articles = synthetic_news_articles(count)
+            data = {"articles": articles, "category_index": news_fetcher.build_category_index(articles)}
+            last_page = max(1, count // 4 // news_fetcher.NEWS_PAGE_SIZE)
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                matching = [article for article in articles if "policy" in article["categories"]]
+                matching[(last_page - 1) * news_fetcher.NEWS_PAGE_SIZE:last_page * news_fetcher.NEWS_PAGE_SIZE]
+            per_scan = (time.perf_counter() - start) / args.iterations
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                news_fetcher.news_page(data, "policy", last_page)
+            per_page = (time.perf_counter() - start) / args.iterations
+            print(f"{'':>14} policy page {last_page}: filtering every article {per_scan * 1e6:.1f} us, "
+                  f"category index slice {per_page * 1e6:.1f} us")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_archive(args):
+    """Archive a year of news, then query a week of it by date range"""
+    import tempfile
+    from news_archive import NewsArchive
+
+    directory = tempfile.mkdtemp(prefix="news_archive_")
+    try:
+        archive = NewsArchive(directory, retention_days=400)
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        per_day = 100
+        articles = synthetic_news_articles(365 * per_day)
+        for i, article in enumerate(articles):
+            day = today - datetime.timedelta(days=i // per_day)
+            article["published_at"] = f"{day.isoformat()}T{(i % 24):02d}:00:00Z"
+
+        start = time.perf_counter()
+        written = archive.append(articles)
+        repeated = archive.append(articles[:per_day * 7])
+        append_time = time.perf_counter() - start
+
+        end_day = today - datetime.timedelta(days=180)
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            week = archive.query(end_day - datetime.timedelta(days=6), end_day, "policy")
+        query_time = (time.perf_counter() - start) / args.iterations
+
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"archived {written} articles over {len(archive.days())} day files ({size / 1024 / 1024:.1f} MiB) "
+              f"in {append_time:.2f} s; re-archiving a week wrote {repeated}")
+        print(f"policy articles for one week 6 months back: {len(week)} in {query_time * 1000:.2f} ms "
+              f"(reads 7 of {len(archive.days())} files)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def substring_classify(text, categories, education_keywords):
+    """The substring-per-keyword classification the keyword matcher replaced, for comparison"""
+    text = text.lower()
+    found = [category for category, keywords in categories.items() if any(keyword in text for keyword in keywords)]
+    related = bool(found) or any(keyword in text for keyword in education_keywords)
+    return found, related
+
+
+def bench_classify(args):
+    """Classify archived articles with the substring scans the keyword matcher replaced, and with the matcher"""
+    import news_fetcher
+
+    rng = random.Random(7)
+    vocabulary = ("students universities lawn colleges government policy careers jobs digital campus reform "
+                  "weather sports markets educational research teachers online learning e-learning budget city "
+                  "council election football lawmakers skillet professionals academics degrees housing").split()
+    articles = [{
+        "title": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 12))).capitalize(),
+        "description": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(15, 30))) + "."
+    } for _ in range(args.archived_articles)]
+
+    start = time.perf_counter()
+    baseline = [substring_classify(article["title"] + " " + article["description"],
+                                   news_fetcher.CATEGORIES, news_fetcher.EDUCATION_KEYWORDS) for article in articles]
+    substring_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = []
+    for article in articles:
+        article["categories"] = news_fetcher.classify_news(article["title"], article["description"])
+        matched.append((article["categories"], news_fetcher.is_education_related(article)))
+    matcher_time = time.perf_counter() - start
+
+    # The matcher is there for whole-word matches; this shows what they cost per article
+    changed = sum(1 for old, new in zip(baseline, matched) if old != new)
+    print(f"{len(articles)} articles: substring scans {substring_time:.2f} s "
+          f"({len(articles) / substring_time:,.0f}/s), keyword matcher {matcher_time:.2f} s "
+          f"({len(articles) / matcher_time:,.0f}/s, {matcher_time / substring_time:.2f}x the substring time)")
+    print(f"{changed} articles classified differently (word boundaries: 'lawn' is not 'law', "
+          f"'skillet' is not 'skill', 'lawmakers' is not 'law')")
+
+
+def syndicated_news_articles(count, rng):
+    """Build articles where many stories appear several times with edited titles and tracked URLs"""
+    vocabulary = [f"w{i}" for i in range(5000)] + ["university", "students", "tuition", "policy", "careers", "campus"]
+    articles = []
+    story = 0
+    while len(articles) < count:
+        title = [rng.choice(vocabulary) for _ in range(rng.randint(6, 10))]
+        description = [rng.choice(vocabulary) for _ in range(rng.randint(18, 30))]
+        for copy in range(rng.choice((1, 1, 2, 3))):
+            copy_title = list(title)
+            if copy:
+                # Syndicated copies get a reworded title and a source suffix
+                copy_title[rng.randrange(len(copy_title))] = rng.choice(vocabulary)
+                copy_title += ["-", f"Source {copy}"]
+            url = f"https://news{copy}.example.org/story/{story}"
+            if copy == 2:
+                url = f"https://www.news0.example.org/story/{story}/?utm_source=feed"
+            articles.append({"title": " ".join(copy_title), "description": " ".join(description),
+                             "url": url, "story": story})
+        story += 1
+    return articles[:count]
+
+
+def bench_dedup(args):
+    """Drop syndicated copies: exact titles vs pairwise Jaccard vs URL set plus MinHash LSH"""
+    import logging
+    from news_dedup import NewsDeduplicator, article_shingles, NEWS_DEDUP_THRESHOLD
+
+    logging.getLogger("news_dedup").setLevel(logging.WARNING)
+    articles = syndicated_news_articles(args.dedup_articles, random.Random(11))
+
+    def report(name, kept, elapsed):
+        seen = set()
+        missed = 0
+        for article in kept:
+            if article["story"] in seen:
+                missed += 1
+            seen.add(article["story"])
+        merged = stories - len(seen)
+        print(f"  {name}: {elapsed:.3f} s, {len(kept)} kept, {missed} duplicates missed, {merged} distinct stories dropped")
+
+    for count in (len(articles) // 10, len(articles)):
+        sample = articles[:count]
+        stories = len({article["story"] for article in sample})
+        print(f"{count} articles, {stories} distinct stories")
+
+        start = time.perf_counter()
+        seen_titles = set()
+        kept = []
+        for article in sample:
+            if article["title"] not in seen_titles:
+                seen_titles.add(article["title"])
+                kept.append(article)
+        report("exact titles", kept, time.perf_counter() - start)
+
+        if count <= 5000:
+            start = time.perf_counter()
+            kept = []
+            for article in sample:
+                shingles = article_shingles(article)
+                if all(len(shingles & other) / len(shingles | other) < NEWS_DEDUP_THRESHOLD for other, _ in kept):
+                    kept.append((shingles, article))
+            report("pairwise Jaccard", [article for _, article in kept], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        deduplicator = NewsDeduplicator()
+        kept = deduplicator.filter(sample)
+        report("URL set + MinHash LSH", kept, time.perf_counter() - start)
+        print(f"    decisions: {dict(deduplicator.stats)}")
+
+
+BENCHMARKS = {
+    "answers": bench_answers,
+    "archive": bench_archive,
+    "batch": bench_batch,
+    "cache": bench_cache,
+    "classify": bench_classify,
+    "dedup": bench_dedup,
+    "export": bench_export,
+    "history": bench_history,
+    "likes": bench_likes,
+    "lease": bench_lease,
+    "matching": bench_matching,
+    "news": bench_news,
+    "newsfeed": bench_newsfeed,
+    "progress": bench_progress,
+    "report": bench_report,
+    "reviews": bench_reviews,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CareerMate benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--reviews", type=int, default=200, help="Reviews on the benchmarked degree page")
+    parser.add_argument("--reports", type=int, default=10000, help="Largest cohort exported by the export benchmark")
+    parser.add_argument("--profiles", type=int, default=5000, help="Largest synthetic career catalogue for the matching benchmark")
+    parser.add_argument("--answer-sets", type=int, default=20000, help="Answer sets scored by the batch benchmark")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent users for the likes benchmark")
+    parser.add_argument("--news-latency", type=float, default=0.2, help="Seconds each stubbed news source takes to answer")
+    parser.add_argument("--news-fixtures", help="Directory of recorded news responses to replay instead of synthetic ones, e.g. tests/fixtures/news")
+    parser.add_argument("--archived-articles", type=int, default=100000, help="Articles classified by the classify benchmark")
+    parser.add_argument("--dedup-articles", type=int, default=20000, help="Articles deduplicated by the dedup benchmark")
+    parser.add_argument("--iterations", type=int, default=50, help="Repetitions per measurement")
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args)
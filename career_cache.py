@@ -0,0 +1,248 @@
+# career_cache.py
+# Memoized career test results for CareerMate
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+
+import career_test
+
+# Result cache limits, overridable from the environment. Set CAREER_CACHE_DIR
+# to an empty string to keep the cache in-process only.
+CAREER_CACHE_MAX_ENTRIES = int(os.getenv("CAREER_CACHE_MAX_ENTRIES", 1024))
+CAREER_CACHE_DIR = os.getenv("CAREER_CACHE_DIR", os.path.join(os.path.dirname(__file__), "career_cache"))
+CAREER_CACHE_MAX_FILES = int(os.getenv("CAREER_CACHE_MAX_FILES", 20000))
+
+# Bump when the scoring or insight logic changes in a way the data fingerprint cannot see
+CAREER_RESULTS_VERSION = 1
+
+# Writes between checks of the shared directory's size
+SWEEP_INTERVAL = 100
+
+
+def answers_key(answers, plan_type):
+    """
+    Build the canonical cache key for a set of answers
+
+    Answers are normalized to integer scores and sorted by question ID, so the
+    same answers submitted in a different order or as strings share a key.
+
+    Args:
+        answers: Dictionary of question IDs and their scores (1-5)
+        plan_type: "free" or "premium"
+
+    Returns:
+        Hex digest identifying the answers and plan
+    """
+    canonical = json.dumps([plan_type, sorted((question_id, int(score)) for question_id, score in answers.items())])
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# (engine, fingerprint) pair, so the fingerprint is only recomputed when the engine is rebuilt
+_fingerprint_memo = (None, None)
+
+
+def results_fingerprint():
+    """Return a version string for the question bank, career profiles and insight texts in use"""
+    global _fingerprint_memo
+
+    engine = career_test.career_match_engine
+    if _fingerprint_memo[0] is not engine:
+        source = json.dumps([
+            CAREER_RESULTS_VERSION,
+            engine.fingerprint,
+            career_test.TRAIT_DESCRIPTIONS
+        ], sort_keys=True)
+        _fingerprint_memo = (engine, hashlib.sha256(source.encode("utf-8")).hexdigest()[:16])
+    return _fingerprint_memo[1]
+
+
+class CareerResultCache:
+    """
+    Two-tier LRU cache of career matches and personality insights
+
+    The first tier is an in-process LRU of serialized results. The optional
+    second tier is a directory of JSON files shared by every worker process on
+    the machine, so a result computed by one gunicorn worker is reused by the
+    others. Entries are stored as JSON and decoded on every hit, so callers
+    always get their own copy to modify.
+
+    Every key is scoped by a fingerprint of the data behind the results. When
+    the fingerprint changes, the in-process tier is cleared and files written
+    under older fingerprints are deleted.
+    """
+
+    def __init__(self, max_entries=CAREER_CACHE_MAX_ENTRIES, directory=CAREER_CACHE_DIR, max_files=CAREER_CACHE_MAX_FILES):
+        self.max_entries = max_entries
+        self.directory = directory or None
+        self.max_files = max_files
+        self._entries = OrderedDict()  # answers key -> serialized results
+        self._fingerprint = None
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_results(self, answers, plan_type="free"):
+        """
+        Return career matches and personality insights, computing them on a miss
+
+        Args:
+            answers: Dictionary of question IDs and their scores (1-5)
+            plan_type: "free" or "premium"
+
+        Returns:
+            Tuple of (career matches, personality insights)
+        """
+        fingerprint = results_fingerprint()
+        key = answers_key(answers, plan_type)
+
+        payload = self._get(fingerprint, key)
+        if payload is None:
+            profile = career_test.aggregate_answers(answers)
+            payload = json.dumps({
+                "results": career_test.calculate_career_matches(answers, plan_type, profile=profile),
+                "personality_insights": career_test.get_personality_insights(answers, plan_type, profile=profile)
+            })
+            self._put(fingerprint, key, payload)
+
+        cached = json.loads(payload)
+        return cached["results"], cached["personality_insights"]
+
+    def stats(self):
+        """Return hit, miss, eviction and invalidation counters along with the current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "fingerprint": self._fingerprint
+            }
+
+    def clear(self):
+        """Drop every cached entry in this process and in the shared directory"""
+        with self._lock:
+            self._entries.clear()
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _get(self, fingerprint, key):
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._switch_fingerprint(fingerprint)
+
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+
+        payload = self._read_shared(fingerprint, key)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+            self._remember(key, payload)
+        return payload
+
+    def _put(self, fingerprint, key, payload):
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                return
+            self._remember(key, payload)
+            self._writes += 1
+            sweep = self._writes % SWEEP_INTERVAL == 0
+        self._write_shared(fingerprint, key, payload)
+        if sweep:
+            self._sweep_shared(fingerprint)
+
+    def _remember(self, key, payload):
+        # Caller must hold the lock
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _switch_fingerprint(self, fingerprint):
+        # Caller must hold the lock
+        if self._fingerprint is not None:
+            self.invalidations += 1
+        self._entries.clear()
+        self._fingerprint = fingerprint
+        self._remove_stale_shared(fingerprint)
+
+    def _shared_path(self, fingerprint, key):
+        return os.path.join(self.directory, fingerprint, f"{key}.json")
+
+    def _read_shared(self, fingerprint, key):
+        if not self.directory:
+            return None
+        path = self._shared_path(fingerprint, key)
+        try:
+            with open(path, "r") as f:
+                payload = f.read()
+            # Refresh the modification time so the sweeper keeps recently used entries
+            os.utime(path)
+            return payload
+        except OSError:
+            return None
+
+    def _write_shared(self, fingerprint, key, payload):
+        if not self.directory:
+            return
+        path = self._shared_path(fingerprint, key)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so other workers never read a partial entry
+            with open(temp_path, "w") as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing career result cache entry: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _sweep_shared(self, fingerprint):
+        """Delete the least recently used shared entries once the directory exceeds max_files"""
+        directory = os.path.join(self.directory, fingerprint)
+        try:
+            entries = [entry for entry in os.scandir(directory) if entry.name.endswith(".json")]
+        except OSError:
+            return
+        if len(entries) <= self.max_files:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        # Trim to 90% of the limit so the sweep is not repeated on every interval
+        for entry in entries[:len(entries) - int(self.max_files * 0.9)]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _remove_stale_shared(self, fingerprint):
+        """Delete shared entries written for other versions of the career data"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name != fingerprint:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+# Shared cache used when career tests are submitted
+career_result_cache = CareerResultCache()
@@ -0,0 +1,109 @@
+# career_history.py
+# Career test history listings for CareerMate
+
+import datetime
+
+from career_test import summarize_top_matches, load_json_column
+from pagination import encode_keyset_cursor, decode_keyset_cursor, apply_keyset, order_descending
+
+# Number of past tests shown per history page
+HISTORY_PAGE_SIZE = 10
+MAX_HISTORY_PAGE_SIZE = 50
+
+# Keyset ordering of the history (newest first) and the only columns it reads
+HISTORY_SORT = ("created_at", "id")
+HISTORY_COLUMNS = "id, created_at, plan_type, top_matches"
+
+
+def parse_history_timestamp(value):
+    """Convert a created_at value returned by Supabase into a datetime object"""
+    try:
+        if isinstance(value, str):
+            return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return value or datetime.datetime.now()
+    except (ValueError, TypeError):
+        return datetime.datetime.now()
+
+
+def backfill_top_matches(client, rows):
+    """
+    Fill in the top_matches summary of rows saved before the column existed
+
+    The full results of those rows are read with a single query, summarized,
+    and written back so the next visit only reads the summary column.
+
+    Args:
+        client: Supabase client
+        rows: History rows; rows without a summary are updated in place
+    """
+    legacy_ids = [row["id"] for row in rows if row.get("top_matches") is None]
+    if not legacy_ids:
+        return
+
+    response = client.table("CareerTestResults").select("id, results").in_("id", legacy_ids).execute()
+    summaries = {
+        row["id"]: summarize_top_matches(load_json_column(row.get("results"), []))
+        for row in (response.data or [])
+    }
+
+    for row in rows:
+        if row["id"] in summaries:
+            row["top_matches"] = summaries[row["id"]]
+            try:
+                client.table("CareerTestResults").update({"top_matches": summaries[row["id"]]}).eq("id", row["id"]).execute()
+            except Exception as e:
+                print(f"Error saving top matches summary for {row['id']}: {str(e)}")
+
+
+def history_entry(row, match_limit):
+    """
+    Convert a raw history row into the entry rendered by career_test_history.html
+
+    Args:
+        row: Row with the HISTORY_COLUMNS
+        match_limit: Number of top matches shown for the current plan
+
+    Returns:
+        Dictionary with id, created_at, top_matches and plan_type
+    """
+    return {
+        "id": row.get("id"),
+        "created_at": parse_history_timestamp(row.get("created_at")),
+        "top_matches": load_json_column(row.get("top_matches"), [])[:match_limit],
+        "plan_type": row.get("plan_type") or "free"
+    }
+
+
+def fetch_history_page(client, user_id, cursor=None, limit=HISTORY_PAGE_SIZE, match_limit=3):
+    """
+    Load one keyset-paginated page of a user's test history, newest first
+
+    Only the small summary columns are selected, so the cost of a page does
+    not depend on how many tests the user has taken or how large their
+    results are.
+
+    Args:
+        client: Supabase client
+        user_id: ID of the current user
+        cursor: Cursor returned with the previous page, or None for the first page
+        limit: Number of tests per page
+        match_limit: Number of top matches shown per test
+
+    Returns:
+        Tuple of (history entries, cursor for the next page or None)
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    query = client.table("CareerTestResults").select(HISTORY_COLUMNS).filter("user_id", "eq", user_id)
+    if cursor:
+        apply_keyset(query, HISTORY_SORT, decode_keyset_cursor(cursor, HISTORY_SORT))
+    order_descending(query, HISTORY_SORT)
+
+    # Fetch one extra row to find out whether another page exists
+    rows = query.limit(limit + 1).execute().data or []
+    next_cursor = encode_keyset_cursor(rows[limit - 1], HISTORY_SORT) if len(rows) > limit else None
+    rows = rows[:limit]
+
+    backfill_top_matches(client, rows)
+    return [history_entry(row, match_limit) for row in rows], next_cursor
@@ -0,0 +1,177 @@
+# career_progress.py
+# Progress tracking time series over a user's career test history
+
+import datetime
+import hashlib
+import json
+
+from career_history import backfill_top_matches
+from career_test import career_match_engine, aggregate_answers, summarize_top_matches, MATCH_COMPONENTS
+
+# Most recent tests returned in a progress series
+MAX_PROGRESS_POINTS = 200
+
+
+def progress_layout(engine=career_match_engine):
+    """
+    Return the order in which dimension scores are stored in a progress point
+
+    Every point stores its trait, skill and value scores as one flat array in
+    engine slot order, so the dimension names are kept here once instead of
+    in every row. The layout key changes whenever the question bank does.
+
+    Args:
+        engine: CareerMatchEngine the scores are computed with
+
+    Returns:
+        Tuple of (layout key, dictionary of section to list of (slot, name))
+    """
+    sections = {section: [] for section in MATCH_COMPONENTS}
+    for slot, (section, name) in enumerate(engine.dimensions):
+        if section in sections:
+            sections[section].append((slot, name))
+
+    names = [[name for slot, name in sections[section]] for section in MATCH_COMPONENTS]
+    key = hashlib.sha256(json.dumps(names).encode("utf-8")).hexdigest()[:12]
+    return key, sections
+
+
+PROGRESS_LAYOUT, PROGRESS_SECTIONS = progress_layout()
+
+
+def progress_point(result_id, user_id, answers, results, created_at, profile=None):
+    """
+    Build the progress row stored for one test result
+
+    Args:
+        result_id: ID of the CareerTestResults row
+        user_id: ID of the user who took the test
+        answers: Dictionary of question IDs and their scores
+        results: Career match results or their top_matches summary, best first
+        created_at: Timestamp of the test
+        profile: Optional AnswerProfile from aggregate_answers(answers)
+
+    Returns:
+        Dictionary for the CareerTestProgress table
+    """
+    if profile is None:
+        profile = aggregate_answers(answers)
+
+    # Scores are stored as whole percentages, with None for unanswered dimensions
+    scores = []
+    for section in MATCH_COMPONENTS:
+        for slot, name in PROGRESS_SECTIONS[section]:
+            value = profile.vector[slot]
+            scores.append(round(value * 100) if value is not None else None)
+
+    return {
+        "id": result_id,
+        "user_id": user_id,
+        "created_at": str(created_at),
+        "layout": PROGRESS_LAYOUT,
+        "scores": scores,
+        "top_matches": [[match["title"], match["match_percentage"]] for match in summarize_top_matches(results)]
+    }
+
+
+def record_progress(client, points):
+    """
+    Append progress points; saving a point again replaces it
+
+    Args:
+        client: Supabase client
+        points: Progress row or list of rows from progress_point()
+    """
+    client.table("CareerTestProgress").upsert(points).execute()
+
+
+def fetch_progress_series(client, user_id, limit=MAX_PROGRESS_POINTS):
+    """
+    Read a user's progress as compact column arrays for charting
+
+    Only the small CareerTestProgress rows are read; the full results of past
+    tests are never loaded. Points stored with an older question layout are
+    left out until backfill_progress.py --rebuild recomputes them.
+
+    Args:
+        client: Supabase client
+        user_id: ID of the user
+        limit: Most recent tests to include
+
+    Returns:
+        Dictionary with the dimension names of each section, and one array
+        entry per test (oldest first) for timestamps, section scores and
+        top match percentages
+    """
+    response = client.table("CareerTestProgress").select("created_at, layout, scores, top_matches") \
+        .eq("user_id", user_id).order("created_at", desc=True).limit(limit).execute()
+    rows = [row for row in reversed(response.data or []) if row.get("layout") == PROGRESS_LAYOUT]
+
+    series = {
+        "dimensions": {section: [name for slot, name in PROGRESS_SECTIONS[section]] for section in MATCH_COMPONENTS},
+        "timestamps": [],
+        "top_titles": [],
+        "top_matches": []
+    }
+    for section in MATCH_COMPONENTS:
+        series[section] = []
+
+    for row in rows:
+        scores = row.get("scores") or []
+        top_matches = row.get("top_matches") or []
+        series["timestamps"].append(row.get("created_at"))
+
+        offset = 0
+        for section in MATCH_COMPONENTS:
+            size = len(PROGRESS_SECTIONS[section])
+            series[section].append(scores[offset:offset + size])
+            offset += size
+
+        series["top_titles"].append(top_matches[0][0] if top_matches else None)
+        series["top_matches"].append([percentage for title, percentage in top_matches])
+
+    return series
+
+
+def parse_answers(value):
+    """Load the answers column of a stored test result"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return {}
+    return value or {}
+
+
+def backfill_progress(client, pages, rebuild=False):
+    """
+    Create progress points for stored test results, one page at a time
+
+    Args:
+        client: Supabase client
+        pages: Iterable of CareerTestResults row lists with id, user_id,
+            answers, top_matches and created_at
+        rebuild: Recompute points that already exist with the current layout
+
+    Yields:
+        Tuple of (rows read, points written) for each page
+    """
+    for rows in pages:
+        read = len(rows)
+        if not rebuild:
+            # One lookup per page finds the results that are already tracked
+            existing = client.table("CareerTestProgress").select("id, layout").in_("id", [row["id"] for row in rows]).execute()
+            current = {row["id"] for row in (existing.data or []) if row.get("layout") == PROGRESS_LAYOUT}
+            rows = [row for row in rows if row["id"] not in current]
+
+        # Results saved before the top_matches column existed are summarized once
+        backfill_top_matches(client, rows)
+
+        points = [
+            progress_point(row["id"], row["user_id"], parse_answers(row.get("answers")),
+                           row.get("top_matches") or [], row.get("created_at") or datetime.datetime.now())
+            for row in rows
+        ]
+        if points:
+            record_progress(client, points)
+        yield read, len(points)
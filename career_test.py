@@ -4,8 +4,12 @@
 import os
 import json
 import datetime
+import hashlib
 import uuid
 import random
+import heapq
+from collections import deque
+from multiprocessing import Pool
 from flask import session
 
 # Career test questions organized by category
@@ -556,161 +560,298 @@ def get_test_questions(plan_type="free"):
     return limited_questions
 
 
-def calculate_career_matches(answers, plan_type="free"):
+# Question categories, the profile section each one scores, and the question key naming the dimension
+QUESTION_DIMENSIONS = {
+    "personality": ("traits", "trait"),
+    "interests": ("interests", "field"),
+    "skills": ("skills", "skill"),
+    "values": ("values", "value")
+}
+
+# Profile sections that contribute to the match percentage, with their weights
+MATCH_COMPONENTS = ("traits", "skills", "values")
+MATCH_WEIGHTS = {"traits": 0.4, "skills": 0.4, "values": 0.2}
+
+
+class AnswerProfile:
     """
-    Calculate career matches based on test answers
+    A test submission folded into one average score per dimension
 
-    Args:
-        answers: Dictionary of question IDs and their scores (1-5)
-        plan_type: "free" or "premium"
+    Built once per submission by CareerMatchEngine.aggregate() and consumed by
+    both calculate_career_matches and get_personality_insights, so answers are
+    parsed and averaged a single time.
+    """
 
-    Returns:
-        List of career matches with scores and insights, limited by plan type
+    def __init__(self, dimensions, vector, answered_slots):
+        self.dimensions = dimensions
+        self.vector = vector
+        self.answered_slots = answered_slots
+
+    def section_scores(self, section):
+        """
+        Return the average scores of one profile section
+
+        Args:
+            section: "traits", "interests", "skills" or "values"
+
+        Returns:
+            Dictionary of dimension names to scores, in the order they were first answered
+        """
+        scores = {}
+        for slot in self.answered_slots:
+            slot_section, name = self.dimensions[slot]
+            if slot_section == section:
+                scores[name] = self.vector[slot]
+        return scores
+
+
+class CareerMatchEngine:
+    """
+    Career matching compiled from question and profile data
+
+    Every (section, name) dimension measured by a question gets a dense slot
+    index. Answers are folded into a vector of per-slot averages, and each
+    career profile is compiled into per-section lists of (slot, weight) pairs
+    restricted to the dimensions a question can actually score. Scoring a
+    submission is then a single pass over these lists, with no searching
+    through the question or profile dictionaries. Strengths, gaps and
+    education paths are only assembled for the careers that are returned.
+
+    The arithmetic is done in the same order as the original dictionary-based
+    implementation, so results are identical down to rounding.
     """
-    # Initialize trait scores
-    trait_scores = {}
-
-    # Process answers to calculate trait scores
-    for question_id, score in answers.items():
-        # Normalize score to 0-1 range
-        normalized_score = (int(score) - 1) / 4.0
-
-        # Find the question and its associated trait
-        for category in CAREER_TEST_QUESTIONS:
-            for question in CAREER_TEST_QUESTIONS[category]:
-                if question["id"] == question_id:
-                    trait_type = None
-                    trait_name = None
-
-                    if category == "personality":
-                        trait_type = "traits"
-                        trait_name = question["trait"]
-                    elif category == "interests":
-                        trait_type = "interests"
-                        trait_name = question["field"]
-                    elif category == "skills":
-                        trait_type = "skills"
-                        trait_name = question["skill"]
-                    elif category == "values":
-                        trait_type = "values"
-                        trait_name = question["value"]
-
-                    if trait_type and trait_name:
-                        if trait_type not in trait_scores:
-                            trait_scores[trait_type] = {}
-
-                        if trait_name not in trait_scores[trait_type]:
-                            trait_scores[trait_type][trait_name] = []
-
-                        trait_scores[trait_type][trait_name].append(normalized_score)
-
-    # Average the scores for each trait
-    for trait_type in trait_scores:
-        for trait_name in trait_scores[trait_type]:
-            scores = trait_scores[trait_type][trait_name]
-            trait_scores[trait_type][trait_name] = sum(scores) / len(scores)
-
-    # Calculate match scores for each career
-    career_matches = []
-
-    for career_id, career in CAREER_PROFILES.items():
-        # Initialize match components
-        trait_match = 0
-        trait_count = 0
-        skill_match = 0
-        skill_count = 0
-        value_match = 0
-        value_count = 0
-
-        # Calculate trait match
-        if "traits" in trait_scores and "traits" in career:
-            for trait, career_value in career["traits"].items():
-                if trait in trait_scores["traits"]:
-                    trait_match += (1 - abs(career_value - trait_scores["traits"][trait])) * career_value
-                    trait_count += career_value
-
-        # Calculate skill match
-        if "skills" in trait_scores and "skills" in career:
-            for skill, career_value in career["skills"].items():
-                if skill in trait_scores["skills"]:
-                    skill_match += (1 - abs(career_value - trait_scores["skills"][skill])) * career_value
-                    skill_count += career_value
-
-        # Calculate value match
-        if "values" in trait_scores and "values" in career:
-            for value, career_value in career["values"].items():
-                if value in trait_scores["values"]:
-                    value_match += (1 - abs(career_value - trait_scores["values"][value])) * career_value
-                    value_count += career_value
-
-        # Calculate overall match percentage
-        trait_score = trait_match / trait_count if trait_count > 0 else 0
-        skill_score = skill_match / skill_count if skill_count > 0 else 0
-        value_score = value_match / value_count if value_count > 0 else 0
-
-        # Weight the components (can be adjusted)
-        overall_match = (trait_score * 0.4) + (skill_score * 0.4) + (value_score * 0.2)
-        match_percentage = round(overall_match * 100)
-
-        # Identify strengths and gaps
+
+    def __init__(self, questions, profiles):
+        self.dimensions = []
+        self.dimension_slots = {}
+        self.question_index = {}
+        self.question_slots = {}
+
+        for category, category_questions in questions.items():
+            section, name_key = QUESTION_DIMENSIONS[category]
+            for question in category_questions:
+                self.question_index.setdefault(question["id"], (category, section, question[name_key]))
+                slot = self._dimension_slot(section, question[name_key])
+                self.question_slots.setdefault(question["id"], []).append(slot)
+
+        self.careers = [self._compile_profile(career_id, career) for career_id, career in profiles.items()]
+
+        # Version of the data the engine was compiled from, used to key cached results
+        source = json.dumps({"questions": questions, "profiles": profiles, "weights": MATCH_WEIGHTS}, sort_keys=True)
+        self.fingerprint = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+    def _dimension_slot(self, section, name):
+        key = (section, name)
+        if key not in self.dimension_slots:
+            self.dimension_slots[key] = len(self.dimensions)
+            self.dimensions.append(key)
+        return self.dimension_slots[key]
+
+    def _compile_profile(self, career_id, career):
+        components = []
+        for section in MATCH_COMPONENTS:
+            entries = []
+            for name, weight in career.get(section, {}).items():
+                slot = self.dimension_slots.get((section, name))
+                if slot is None:
+                    # No question measures this dimension, so it can never match
+                    continue
+                if section == "skills":
+                    improvement = career.get("skill_gaps", {}).get(name, "Develop this skill through relevant courses and practice")
+                else:
+                    improvement = "Focus on developing this area"
+                entries.append((slot, weight, name, improvement))
+            components.append((section, entries))
+        return career_id, career, components
+
+    def aggregate(self, answers):
+        """
+        Fold answers into average normalized scores per dimension slot
+
+        Args:
+            answers: Dictionary of question IDs and their scores (1-5); scores
+                that are not numbers are skipped
+
+        Returns:
+            AnswerProfile shared by career matching and personality insights
+        """
+        totals = [0] * len(self.dimensions)
+        counts = [0] * len(self.dimensions)
+        answered_slots = []
+        skipped = []
+
+        for question_id, score in answers.items():
+            # Normalize score to 0-1 range; legacy rows may hold blanks or text
+            try:
+                normalized_score = (int(score) - 1) / 4.0
+            except (TypeError, ValueError):
+                skipped.append(question_id)
+                continue
+            for slot in self.question_slots.get(question_id, ()):
+                if not counts[slot]:
+                    answered_slots.append(slot)
+                totals[slot] += normalized_score
+                counts[slot] += 1
+
+        if skipped:
+            print(f"Skipping non-numeric answers to {', '.join(map(str, skipped))}")
+
+        vector = [total / count if count else None for total, count in zip(totals, counts)]
+        return AnswerProfile(self.dimensions, vector, answered_slots)
+
+    def score(self, profile):
+        """
+        Compute the component scores of every career profile
+
+        Args:
+            profile: AnswerProfile returned by aggregate()
+
+        Returns:
+            List of (overall, traits, skills, values) score tuples in profile order
+        """
+        vector = profile.vector
+        scores = []
+
+        for career_id, career, components in self.careers:
+            component_scores = []
+            for section, entries in components:
+                section_match = 0
+                section_count = 0
+                for slot, weight, name, improvement in entries:
+                    user_value = vector[slot]
+                    if user_value is None:
+                        continue
+                    section_match += (1 - abs(weight - user_value)) * weight
+                    section_count += weight
+                component_scores.append(section_match / section_count if section_count > 0 else 0)
+
+            trait_score, skill_score, value_score = component_scores
+
+            # Weight the components (can be adjusted through MATCH_WEIGHTS)
+            overall_match = (trait_score * MATCH_WEIGHTS["traits"]) + (skill_score * MATCH_WEIGHTS["skills"]) + (value_score * MATCH_WEIGHTS["values"])
+            scores.append((overall_match, trait_score, skill_score, value_score))
+
+        return scores
+
+    def describe(self, index, profile, scores):
+        """
+        Build the full match entry, with strengths, gaps and education paths, for one career
+
+        Args:
+            index: Position of the career in profile order
+            profile: AnswerProfile returned by aggregate()
+            scores: Score tuple for the career from score()
+
+        Returns:
+            Career match dictionary
+        """
+        career_id, career, components = self.careers[index]
+        overall_match, trait_score, skill_score, value_score = scores
+        vector = profile.vector
         strengths = []
         gaps = []
 
-        # Find top strengths
-        for trait_type in ["traits", "skills", "values"]:
-            if trait_type in trait_scores and trait_type in career:
-                for item, career_value in career[trait_type].items():
-                    if item in trait_scores[trait_type]:
-                        user_value = trait_scores[trait_type][item]
-                        if user_value >= 0.7 and career_value >= 0.7:
-                            strengths.append({
-                                "type": trait_type,
-                                "name": item,
-                                "score": user_value
-                            })
-
-        # Find top gaps
-        for trait_type in ["traits", "skills", "values"]:
-            if trait_type in trait_scores and trait_type in career:
-                for item, career_value in career[trait_type].items():
-                    if item in trait_scores[trait_type]:
-                        user_value = trait_scores[trait_type][item]
-                        if user_value < 0.6 and career_value >= 0.7:
-                            gaps.append({
-                                "type": trait_type,
-                                "name": item,
-                                "score": user_value,
-                                "target": career_value,
-                                "improvement": career["skill_gaps"].get(item,
-                                                                        "Develop this skill through relevant courses and practice")
-                                if trait_type == "skills" else "Focus on developing this area"
-                            })
-
-        # Sort strengths and gaps
-        strengths = sorted(strengths, key=lambda x: x["score"], reverse=True)[:3]
-        gaps = sorted(gaps, key=lambda x: x["target"] - x["score"], reverse=True)[:3]
-
-        # Add career match to results
-        career_matches.append({
+        for section, entries in components:
+            for slot, weight, name, improvement in entries:
+                if weight < 0.7:
+                    continue
+                user_value = vector[slot]
+                if user_value is None:
+                    continue
+                if user_value >= 0.7:
+                    strengths.append({"type": section, "name": name, "score": user_value})
+                elif user_value < 0.6:
+                    gaps.append({
+                        "type": section,
+                        "name": name,
+                        "score": user_value,
+                        "target": weight,
+                        "improvement": improvement
+                    })
+
+        return {
             "id": career_id,
             "title": career["title"],
             "category": career["category"],
-            "match_percentage": match_percentage,
+            "match_percentage": round(overall_match * 100),
             "trait_score": round(trait_score * 100),
             "skill_score": round(skill_score * 100),
             "value_score": round(value_score * 100),
-            "strengths": strengths,
-            "gaps": gaps,
+            "strengths": sorted(strengths, key=lambda x: x["score"], reverse=True)[:3],
+            "gaps": sorted(gaps, key=lambda x: x["target"] - x["score"], reverse=True)[:3],
             "education_paths": career["education_paths"]
-        })
+        }
 
-    # Sort career matches by match percentage
-    career_matches = sorted(career_matches, key=lambda x: x["match_percentage"], reverse=True)
+    def top_matches(self, profile, limit):
+        """
+        Return the best matching careers without sorting or describing the whole catalogue
+
+        Ties on match percentage keep profile order, exactly like a stable
+        descending sort truncated to the limit.
+
+        Args:
+            profile: AnswerProfile returned by aggregate()
+            limit: Number of careers to return
+
+        Returns:
+            List of career match dictionaries, best first
+        """
+        scores = self.score(profile)
+        winners = heapq.nlargest(limit, range(len(scores)), key=lambda index: round(scores[index][0] * 100))
+        return [self.describe(index, profile, scores[index]) for index in winners]
+
+    def match(self, profile):
+        """
+        Score and describe every career profile against aggregated answers
+
+        Args:
+            profile: AnswerProfile returned by aggregate()
+
+        Returns:
+            List of career matches in profile order, with component scores, strengths and gaps
+        """
+        return [self.describe(index, profile, scores) for index, scores in enumerate(self.score(profile))]
+
+
+# Matching engine compiled from the question bank and career profiles at import time
+career_match_engine = CareerMatchEngine(CAREER_TEST_QUESTIONS, CAREER_PROFILES)
+
+# Question ID -> (category, profile section, dimension name) for every question in the bank
+QUESTION_INDEX = career_match_engine.question_index
+
+
+def aggregate_answers(answers):
+    """
+    Parse a submission's answers once for matching and personality insights
+
+    Args:
+        answers: Dictionary of question IDs and their scores (1-5)
+
+    Returns:
+        AnswerProfile to pass to calculate_career_matches and get_personality_insights
+    """
+    return career_match_engine.aggregate(answers)
 
-    # Limit results based on plan type
+
+def calculate_career_matches(answers, plan_type="free", profile=None):
+    """
+    Calculate career matches based on test answers
+
+    Args:
+        answers: Dictionary of question IDs and their scores (1-5)
+        plan_type: "free" or "premium"
+        profile: Optional AnswerProfile from aggregate_answers(answers), to avoid parsing the answers again
+
+    Returns:
+        List of career matches with scores and insights, limited by plan type
+    """
+    if profile is None:
+        profile = aggregate_answers(answers)
+
+    # Select the best matches by match percentage, limited by plan type
     if plan_type == "free":
         # Free plan gets limited career matches (top 2)
-        career_matches = career_matches[:2]
+        career_matches = career_match_engine.top_matches(profile, 2)
 
         # For free plan, simplify the career matches
         for match in career_matches:
@@ -725,11 +866,34 @@ def calculate_career_matches(answers, plan_type="free"):
             match["education_paths"] = match["education_paths"][:1] if match["education_paths"] else []
     else:
         # Premium plan gets more detailed matches (top 10)
-        career_matches = career_matches[:10]
+        career_matches = career_match_engine.top_matches(profile, 10)
 
     return career_matches
 
 
+# Number of top matches kept in the history summary of each saved result
+TOP_MATCH_SUMMARY_SIZE = 3
+
+
+def summarize_top_matches(results):
+    """
+    Build the compact summary of a result shown on the test history page
+
+    Args:
+        results: Career match results, best first
+
+    Returns:
+        List of the top matches with only their title and match percentage
+    """
+    return [
+        {
+            "title": match.get("title", match.get("category_title", "Unknown")),
+            "match_percentage": match.get("match_percentage", 0)
+        }
+        for match in (results or [])[:TOP_MATCH_SUMMARY_SIZE]
+    ]
+
+
 def save_test_results(user_id, answers, results, personality_insights=None, plan_type="free"):
     """
     Save test results to the database
@@ -754,6 +918,7 @@ def save_test_results(user_id, answers, results, personality_insights=None, plan
         "answers": answers,
         "results": results,
         "personality_insights": personality_insights,
+        "top_matches": summarize_top_matches(results),
         "plan_type": plan_type,
         "created_at": str(datetime.datetime.now())
     }
@@ -761,7 +926,75 @@ def save_test_results(user_id, answers, results, personality_insights=None, plan
     return result_id, result
 
 
-def generate_pdf_report(user_data, test_results, personality_insights):
+# Directory generated reports are written to and served from
+REPORTS_DIR = os.path.join(os.getcwd(), "static", "reports")
+
+# Bump whenever the report layout changes, so cached reports are regenerated
+REPORT_TEMPLATE_VERSION = 1
+
+
+def report_cache_key(result_id, user_data, test_results, personality_insights):
+    """
+    Hash everything a report is rendered from into a stable cache key
+
+    Args:
+        result_id: ID of the test result the report is for
+        user_data: Dictionary with user information (name, email, etc.)
+        test_results: Career match results
+        personality_insights: Personality insights from the test
+
+    Returns:
+        Hex digest naming the report file
+    """
+    source = json.dumps([REPORT_TEMPLATE_VERSION, result_id, user_data, test_results, personality_insights], sort_keys=True)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def cached_report_path(report_key):
+    """Return the path a report with the given cache key is stored at"""
+    return os.path.join(REPORTS_DIR, f"career_report_{report_key}.txt")
+
+
+def render_report(user_data, test_results, personality_insights):
+    """
+    Render a career test report section by section
+
+    Args:
+        user_data: Dictionary with user information (name, email, etc.)
+        test_results: Career match results
+        personality_insights: Personality insights from the test
+
+    Yields:
+        Chunks of report text, ready to be written to a file or streamed to a response
+    """
+    from datetime import datetime
+
+    yield (
+        f"CAREER FIT TEST REPORT\n"
+        f"======================\n\n"
+        f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n"
+        f"For: {user_data.get('username', 'User')}\n"
+        f"Email: {user_data.get('email', 'N/A')}\n\n"
+    )
+
+    yield (
+        f"TOP CAREER MATCHES\n"
+        f"=================\n\n"
+    )
+    for i, match in enumerate(test_results[:5], 1):
+        title = match.get("title", match.get("category_title", "Unknown"))
+        percentage = match.get("match_percentage", 0)
+        yield f"{i}. {title}: {percentage}% Match\n"
+
+    yield (
+        f"\nPERSONALITY INSIGHTS\n"
+        f"===================\n\n"
+    )
+    for insight in personality_insights:
+        yield f"{insight.get('trait', 'Unknown')}: {insight.get('score', 0)}\n"
+
+
+def generate_pdf_report(user_data, test_results, personality_insights, report_key=None):
     """
     Generate a PDF report of career test results for premium users
 
@@ -769,6 +1002,7 @@ def generate_pdf_report(user_data, test_results, personality_insights):
         user_data: Dictionary with user information (name, email, etc.)
         test_results: Career match results
         personality_insights: Personality insights from the test
+        report_key: Optional report_cache_key() naming the file; a random name is used otherwise
 
     Returns:
         Path to the generated PDF file or None if there's an error
@@ -780,132 +1014,99 @@ def generate_pdf_report(user_data, test_results, personality_insights):
         # For demonstration purposes, we'll create a simple text file instead of a PDF
         # In a real implementation, this would generate and save a PDF file
 
-        import os
-        from datetime import datetime
-
         # Create a directory for reports if it doesn't exist
-        reports_dir = os.path.join(os.getcwd(), "static", "reports")
-        os.makedirs(reports_dir, exist_ok=True)
+        os.makedirs(REPORTS_DIR, exist_ok=True)
 
-        # Generate a unique filename
-        report_id = str(uuid.uuid4())
-        report_path = os.path.join(reports_dir, f"career_report_{report_id}.txt")
+        # Name the file after its content, or generate a unique filename
+        report_path = cached_report_path(report_key or str(uuid.uuid4()))
+
+        # Write to a temporary file first so a cached report is never served half-written
+        temp_path = f"{report_path}.{uuid.uuid4().hex}.tmp"
 
         # Write the report content to a text file
-        with open(report_path, "w") as f:
-            f.write(f"CAREER FIT TEST REPORT\n")
-            f.write(f"======================\n\n")
-            f.write(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n")
-            f.write(f"For: {user_data.get('username', 'User')}\n")
-            f.write(f"Email: {user_data.get('email', 'N/A')}\n\n")
-
-            f.write(f"TOP CAREER MATCHES\n")
-            f.write(f"=================\n\n")
-            for i, match in enumerate(test_results[:5], 1):
-                title = match.get("title", match.get("category_title", "Unknown"))
-                percentage = match.get("match_percentage", 0)
-                f.write(f"{i}. {title}: {percentage}% Match\n")
-
-            f.write(f"\nPERSONALITY INSIGHTS\n")
-            f.write(f"===================\n\n")
-            for trait, score in personality_insights.items():
-                f.write(f"{trait}: {score}\n")
+        with open(temp_path, "w") as f:
+            f.writelines(render_report(user_data, test_results, personality_insights))
 
+        os.replace(temp_path, report_path)
         return report_path
     except Exception as e:
         print(f"Error generating report: {str(e)}")
         return None
 
 
-def get_personality_insights(answers, plan_type="free"):
+# Personality trait descriptions by score level
+TRAIT_DESCRIPTIONS = {
+    "analytical": {
+        "high": "You have a strong analytical mind and enjoy solving complex problems. You excel at logical thinking and data analysis.",
+        "medium": "You have a balanced approach to analysis and can think logically when needed.",
+        "low": "You may prefer intuitive approaches over detailed analysis. Consider developing analytical skills for certain career paths."
+    },
+    "collaborative": {
+        "high": "You thrive in team environments and enjoy working with others. Your collaborative nature is an asset in many workplaces.",
+        "medium": "You can work well in teams but also value some independence in your work.",
+        "low": "You tend to prefer working independently. Consider developing teamwork skills for collaborative environments."
+    },
+    "innovative": {
+        "high": "You have a creative and innovative mindset. You enjoy finding new solutions and thinking outside the box.",
+        "medium": "You balance innovative thinking with practical approaches.",
+        "low": "You tend to prefer established methods. Consider developing creative thinking for innovation-driven fields."
+    },
+    "supportive": {
+        "high": "You have a strong desire to help others and provide support. This trait is valuable in service-oriented careers.",
+        "medium": "You can be supportive when needed while maintaining focus on your own objectives.",
+        "low": "You may focus more on tasks than on supporting others. Consider developing this trait for people-oriented roles."
+    },
+    "structured": {
+        "high": "You prefer order, structure, and clear processes. You excel in environments with established procedures.",
+        "medium": "You can adapt to both structured and flexible environments.",
+        "low": "You prefer flexibility over rigid structure. Consider developing organizational skills for certain roles."
+    },
+    "leadership": {
+        "high": "You have strong leadership qualities and enjoy guiding others. You're comfortable taking charge of situations.",
+        "medium": "You can take leadership roles when needed but don't always seek them out.",
+        "low": "You may prefer supporting roles over leadership positions. Consider developing leadership skills if interested in management."
+    },
+    "detail_oriented": {
+        "high": "You have a keen eye for detail and thoroughness in your work. This trait is valuable in many technical and analytical roles.",
+        "medium": "You can pay attention to details when needed while maintaining a broader perspective.",
+        "low": "You may focus more on the big picture than on details. Consider developing attention to detail for certain roles."
+    },
+    "creative": {
+        "high": "You have a strong creative streak and enjoy artistic or innovative tasks. This trait is valuable in design and creative fields.",
+        "medium": "You have some creative abilities while also valuing practical approaches.",
+        "low": "You may prefer logical over creative tasks. Consider exploring creative activities if interested in design fields."
+    },
+    "outgoing": {
+        "high": "You're comfortable in social situations and enjoy interacting with others. This trait is valuable in client-facing roles.",
+        "medium": "You can be outgoing in certain situations while also valuing quiet time.",
+        "low": "You may prefer quieter, less social environments. Consider developing communication skills for people-oriented roles."
+    }
+}
+
+
+def get_personality_insights(answers, plan_type="free", profile=None):
     """
     Generate personality insights based on test answers
 
     Args:
         answers: Dictionary of question IDs and their scores
         plan_type: "free" or "premium"
+        profile: Optional AnswerProfile from aggregate_answers(answers), to avoid parsing the answers again
 
     Returns:
         Dictionary of personality insights, limited by plan type
     """
-    # Initialize trait scores
-    trait_scores = {}
-
-    # Process personality questions
-    for question_id, score in answers.items():
-        # Only process personality questions
-        if question_id.startswith('p'):
-            # Normalize score to 0-1 range
-            normalized_score = (int(score) - 1) / 4.0
-
-            # Find the question and its associated trait
-            for question in CAREER_TEST_QUESTIONS["personality"]:
-                if question["id"] == question_id:
-                    trait = question["trait"]
-
-                    if trait not in trait_scores:
-                        trait_scores[trait] = []
-
-                    trait_scores[trait].append(normalized_score)
-
-    # Average the scores for each trait
-    for trait in trait_scores:
-        trait_scores[trait] = sum(trait_scores[trait]) / len(trait_scores[trait])
-
-    # Define trait descriptions
-    trait_descriptions = {
-        "analytical": {
-            "high": "You have a strong analytical mind and enjoy solving complex problems. You excel at logical thinking and data analysis.",
-            "medium": "You have a balanced approach to analysis and can think logically when needed.",
-            "low": "You may prefer intuitive approaches over detailed analysis. Consider developing analytical skills for certain career paths."
-        },
-        "collaborative": {
-            "high": "You thrive in team environments and enjoy working with others. Your collaborative nature is an asset in many workplaces.",
-            "medium": "You can work well in teams but also value some independence in your work.",
-            "low": "You tend to prefer working independently. Consider developing teamwork skills for collaborative environments."
-        },
-        "innovative": {
-            "high": "You have a creative and innovative mindset. You enjoy finding new solutions and thinking outside the box.",
-            "medium": "You balance innovative thinking with practical approaches.",
-            "low": "You tend to prefer established methods. Consider developing creative thinking for innovation-driven fields."
-        },
-        "supportive": {
-            "high": "You have a strong desire to help others and provide support. This trait is valuable in service-oriented careers.",
-            "medium": "You can be supportive when needed while maintaining focus on your own objectives.",
-            "low": "You may focus more on tasks than on supporting others. Consider developing this trait for people-oriented roles."
-        },
-        "structured": {
-            "high": "You prefer order, structure, and clear processes. You excel in environments with established procedures.",
-            "medium": "You can adapt to both structured and flexible environments.",
-            "low": "You prefer flexibility over rigid structure. Consider developing organizational skills for certain roles."
-        },
-        "leadership": {
-            "high": "You have strong leadership qualities and enjoy guiding others. You're comfortable taking charge of situations.",
-            "medium": "You can take leadership roles when needed but don't always seek them out.",
-            "low": "You may prefer supporting roles over leadership positions. Consider developing leadership skills if interested in management."
-        },
-        "detail_oriented": {
-            "high": "You have a keen eye for detail and thoroughness in your work. This trait is valuable in many technical and analytical roles.",
-            "medium": "You can pay attention to details when needed while maintaining a broader perspective.",
-            "low": "You may focus more on the big picture than on details. Consider developing attention to detail for certain roles."
-        },
-        "creative": {
-            "high": "You have a strong creative streak and enjoy artistic or innovative tasks. This trait is valuable in design and creative fields.",
-            "medium": "You have some creative abilities while also valuing practical approaches.",
-            "low": "You may prefer logical over creative tasks. Consider exploring creative activities if interested in design fields."
-        },
-        "outgoing": {
-            "high": "You're comfortable in social situations and enjoy interacting with others. This trait is valuable in client-facing roles.",
-            "medium": "You can be outgoing in certain situations while also valuing quiet time.",
-            "low": "You may prefer quieter, less social environments. Consider developing communication skills for people-oriented roles."
-        }
-    }
+    if profile is None:
+        profile = aggregate_answers(answers)
+
+    # Average score for each personality trait
+    trait_scores = profile.section_scores("traits")
 
     # Generate insights
     insights = []
 
     for trait, score in trait_scores.items():
-        if trait in trait_descriptions:
+        if trait in TRAIT_DESCRIPTIONS:
             if score >= 0.7:
                 level = "high"
             elif score >= 0.4:
@@ -917,7 +1118,7 @@ def get_personality_insights(answers, plan_type="free"):
                 "trait": trait,
                 "score": round(score * 100),
                 "level": level,
-                "description": trait_descriptions[trait][level]
+                "description": TRAIT_DESCRIPTIONS[trait][level]
             })
 
     # Sort insights by score
@@ -928,4 +1129,133 @@ def get_personality_insights(answers, plan_type="free"):
         # Free plan gets limited insights (top 3)
         insights = insights[:3]
 
-    return insights
\ No newline at end of file
+    return insights
+
+
+# Answer sets handed to each worker process at a time when batch scoring
+BATCH_SCORE_CHUNK_SIZE = 500
+
+# Chunks submitted per worker process before the oldest result must be consumed
+BATCH_SCORE_PENDING_CHUNKS_PER_PROCESS = 2
+
+
+def load_json_column(value, default):
+    """
+    Decode a JSON column of a CareerTestResults row
+
+    Older rows store results and insights as JSON strings, newer ones as
+    decoded values. A missing or unparseable value yields the default, so
+    one corrupt row does not abort a history page or an export.
+
+    Args:
+        value: Column value as returned by Supabase
+        default: Value returned for None or invalid JSON
+
+    Returns:
+        Decoded value
+    """
+    if value is None:
+        return default
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return default
+    return value
+
+
+def score_answer_set(record, plan_type="free"):
+    """
+    Score one stored or submitted answer set
+
+    Args:
+        record: Dictionary with "answers" (a dict or the JSON string stored in
+            CareerTestResults), plus optional "id" and "plan_type"
+        plan_type: Plan used when the record does not carry its own
+
+    Returns:
+        Dictionary with the record id, plan type, career matches and personality insights
+    """
+    answers = record["answers"]
+    if isinstance(answers, str):
+        answers = json.loads(answers)
+    record_plan = record.get("plan_type") or plan_type
+
+    profile = aggregate_answers(answers)
+    return {
+        "id": record.get("id"),
+        "plan_type": record_plan,
+        "results": calculate_career_matches(answers, record_plan, profile=profile),
+        "personality_insights": get_personality_insights(answers, record_plan, profile=profile)
+    }
+
+
+def _score_answer_set_chunk(chunk):
+    records, plan_type = chunk
+    return [score_answer_set(record, plan_type) for record in records]
+
+
+def _chunk_answer_sets(records, plan_type, chunk_size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk, plan_type
+            chunk = []
+    if chunk:
+        yield chunk, plan_type
+
+
+def score_answer_sets(records, plan_type="free", processes=None, chunk_size=BATCH_SCORE_CHUNK_SIZE):
+    """
+    Score many answer sets across a process pool, yielding results in input order
+
+    Records are read lazily and sent to the workers in chunks, so arbitrarily
+    large inputs (such as a full export of CareerTestResults) are streamed
+    rather than loaded into memory. At most processes *
+    BATCH_SCORE_PENDING_CHUNKS_PER_PROCESS chunks are submitted ahead of the
+    caller, so a slow consumer holds back reading instead of letting scored
+    chunks pile up in the parent process.
+
+    Args:
+        records: Iterable of records accepted by score_answer_set
+        plan_type: Plan used for records that do not carry their own
+        processes: Worker processes (defaults to the CPU count; 1 scores in this process)
+        chunk_size: Records sent to a worker at a time
+
+    Yields:
+        One score_answer_set result per record, in the same order as the input
+    """
+    chunks = _chunk_answer_sets(records, plan_type, chunk_size)
+
+    if processes == 1:
+        for chunk in chunks:
+            yield from _score_answer_set_chunk(chunk)
+        return
+
+    max_pending = (processes or os.cpu_count() or 1) * BATCH_SCORE_PENDING_CHUNKS_PER_PROCESS
+    with Pool(processes) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(_score_answer_set_chunk, (chunk,)))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def read_answer_sets_jsonl(path):
+    """
+    Read answer set records from a JSONL file, one JSON object per line
+
+    Args:
+        path: Path to the JSONL file
+
+    Yields:
+        Record dictionaries, skipping blank lines
+    """
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
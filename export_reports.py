@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Script to export the career test reports of a cohort as a single zip archive.
+Select students by user ID (or a file of user IDs, one per line) and/or by the
+date range their tests were taken in.
+"""
+
+import argparse
+import datetime
+import os
+
+from dotenv import load_dotenv
+
+from report_export import stream_report_zip, parse_export_range, REPORT_EXPORT_BATCH_SIZE, REPORT_EXPORT_PROCESSES
+from supabase_client import create_client
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export CareerMate career test reports as a zip archive')
+    parser.add_argument('output', help='Path of the zip archive to write')
+    parser.add_argument('--user', action='append', dest='user_ids', default=[], help='User ID to export (repeatable)')
+    parser.add_argument('--users-file', help='File with one user ID per line')
+    parser.add_argument('--start', help='Only export tests taken on or after this date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Only export tests taken before this date (YYYY-MM-DD)')
+    parser.add_argument('--processes', type=int, default=REPORT_EXPORT_PROCESSES, help='Worker processes rendering reports')
+    parser.add_argument('--batch-size', type=int, default=REPORT_EXPORT_BATCH_SIZE, help='Results read and rendered per page')
+    args = parser.parse_args()
+
+    user_ids = list(args.user_ids)
+    if args.users_file:
+        with open(args.users_file, 'r') as f:
+            user_ids.extend(line.strip() for line in f if line.strip())
+
+    if not user_ids and not args.start and not args.end:
+        parser.error("select users with --user/--users-file or a date range with --start/--end")
+    try:
+        start, end = parse_export_range(args.start, args.end)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Load Supabase credentials from the .env file
+    load_dotenv()
+    client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+    start_time = datetime.datetime.now()
+    print(f"Exporting reports at {start_time.strftime('%Y-%m-%d %H:%M:%S')}...")
+
+    written = 0
+    with open(args.output, 'wb') as f:
+        for chunk in stream_report_zip(client, user_ids, start, end, args.processes, args.batch_size):
+            f.write(chunk)
+            written += len(chunk)
+
+    time_taken = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"Wrote {written} bytes to {args.output} in {time_taken:.2f} seconds")
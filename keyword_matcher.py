@@ -0,0 +1,73 @@
+# keyword_matcher.py
+# Whole-word keyword matching for news classification
+
+import re
+
+# Words are runs of letters and digits; everything else is a boundary
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Separators allowed between the words of a multi-word keyword ("e-learning", "higher  education")
+WORD_SEPARATOR = r"[^a-z0-9]+"
+
+
+def keyword_words(keyword):
+    """Split a keyword into the words it must match, e.g. "e-learning" -> ("e", "learning")"""
+    return tuple(WORD_PATTERN.findall(keyword.lower()))
+
+
+def plural_forms(word):
+    """Return the plural spellings folded onto a keyword word, e.g. university -> universities"""
+    forms = [word + "s", word + "es"]
+    if word.endswith("y"):
+        forms.append(word[:-1] + "ies")
+    return forms
+
+
+def keyword_pattern(words):
+    """Regular expression source matching a keyword's words, each also in its plural forms"""
+    alternatives = []
+    for word in words:
+        forms = sorted({word, *plural_forms(word)}, key=len, reverse=True)
+        alternatives.append("(?:" + "|".join(map(re.escape, forms)) + ")")
+    return WORD_SEPARATOR.join(alternatives)
+
+
+class KeywordMatcher:
+    """
+    Find which keyword groups occur in a text, matching whole words only
+
+    Keywords only match on word boundaries, so "law" matches "law" and
+    "laws" but not "lawn" or "lawmakers", and "education" does not match
+    "educational". Multi-word keywords ("higher education", "e-learning")
+    match across any run of separators, and plural words are folded onto
+    their singular keyword ("universities" matches "university").
+
+    Every group's keywords are compiled into one word-boundary alternation,
+    so a text costs one regex search per group, stopping at its first hit.
+    """
+
+    def __init__(self, groups):
+        """
+        Args:
+            groups: Dictionary mapping a group name to its list of keywords
+        """
+        self.patterns = []
+        for group, keywords in groups.items():
+            alternatives = sorted({keyword_pattern(words) for words in map(keyword_words, keywords) if words},
+                                  key=len, reverse=True)
+            if alternatives:
+                pattern = re.compile(r"(?<![a-z0-9])(?:" + "|".join(alternatives) + r")(?![a-z0-9])")
+                self.patterns.append((group, pattern))
+
+    def groups(self, text):
+        """
+        Return the groups with at least one keyword in the text
+
+        Args:
+            text: Text to search (any case)
+
+        Returns:
+            Set of group names
+        """
+        text = text.lower()
+        return {group for group, pattern in self.patterns if pattern.search(text)}
@@ -0,0 +1,209 @@
+# news_archive.py
+# Append-only, day-partitioned archive of education news for CareerMate
+
+import datetime
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; appends are then not locked against other processes
+    fcntl = None
+
+logger = logging.getLogger("news_archive")
+
+# Archive settings, overridable from the environment
+NEWS_ARCHIVE_DIR = os.getenv("NEWS_ARCHIVE_DIR", os.path.join(os.path.dirname(__file__), "news_archive"))
+NEWS_ARCHIVE_RETENTION_DAYS = int(os.getenv("NEWS_ARCHIVE_RETENTION_DAYS", 365))
+
+# Longest date range one archive query may cover, which bounds the days it reads
+MAX_ARCHIVE_RANGE_DAYS = 31
+
+# An article is skipped when its key was archived under any day this close to
+# its own, since a re-fetched story's published_at can move across midnight
+# (relative dates like "3 hours ago", or the fetch time when no date is given)
+ARCHIVE_DEDUP_WINDOW_DAYS = 7
+
+# Days whose article keys are kept in memory; covers a whole dedup window
+ARCHIVE_KEY_CACHE_DAYS = 2 * ARCHIVE_DEDUP_WINDOW_DAYS + 2
+
+
+def article_key(article):
+    """Identify an article across refreshes by its URL, or its title without one"""
+    return article.get("url") or article.get("title")
+
+
+def parse_archive_day(value):
+    """Parse a YYYY-MM-DD day, raising ValueError for anything else"""
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+class NewsArchive:
+    """
+    News articles stored as one JSON line per article in a file per UTC day
+
+    The day files are the time index: a date range query opens only the files
+    of the days it covers, and appending never rewrites existing data. Each
+    article is archived once, under the day it was first seen published; later
+    copies within ARCHIVE_DEDUP_WINDOW_DAYS of that day are skipped, so the
+    first published_at is the one kept.
+    """
+
+    def __init__(self, directory=NEWS_ARCHIVE_DIR, retention_days=NEWS_ARCHIVE_RETENTION_DAYS):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.lock = threading.Lock()
+        self._keys = OrderedDict()
+
+    def _day_path(self, day):
+        return os.path.join(self.directory, f"{day.isoformat()}.jsonl")
+
+    def _read_day(self, day):
+        articles = []
+        try:
+            with open(self._day_path(day), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        articles.append(json.loads(line))
+                    except ValueError:
+                        # A line cut short by a crash mid-append; the rest of the file is intact
+                        continue
+        except FileNotFoundError:
+            pass
+        return articles
+
+    def _day_keys(self, day):
+        if day in self._keys:
+            self._keys.move_to_end(day)
+            return self._keys[day]
+
+        keys = {article_key(article) for article in self._read_day(day)}
+        self._keys[day] = keys
+        while len(self._keys) > ARCHIVE_KEY_CACHE_DAYS:
+            self._keys.popitem(last=False)
+        return keys
+
+    def _is_archived(self, key, day, today):
+        # Days after today have no files yet, apart from the article's own
+        last = max(min(day + datetime.timedelta(days=ARCHIVE_DEDUP_WINDOW_DAYS), today), day)
+        window_day = day - datetime.timedelta(days=ARCHIVE_DEDUP_WINDOW_DAYS)
+        while window_day <= last:
+            if key in self._day_keys(window_day):
+                return True
+            window_day += datetime.timedelta(days=1)
+        return False
+
+    def append(self, articles):
+        """
+        Archive articles that are not archived yet
+
+        Args:
+            articles: Articles with a published_at UTC timestamp
+
+        Returns:
+            Number of articles written
+        """
+        cutoff = self._retention_cutoff()
+        by_day = {}
+        for article in articles:
+            published_at = article.get("published_at")
+            if published_at:
+                day = datetime.date.fromisoformat(published_at[:10])
+                # Articles already past the retention period would be pruned straight away
+                if day >= cutoff:
+                    by_day.setdefault(day, []).append(article)
+
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        written = 0
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            batch_keys = set()
+            for day, day_articles in sorted(by_day.items()):
+                lines = []
+                for article in day_articles:
+                    key = article_key(article)
+                    if not key or key in batch_keys or self._is_archived(key, day, today):
+                        continue
+                    batch_keys.add(key)
+                    self._day_keys(day).add(key)
+                    lines.append(json.dumps(article, ensure_ascii=False) + "\n")
+                if not lines:
+                    continue
+
+                with open(self._day_path(day), "a", encoding="utf-8") as f:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_EX)
+                    f.write("".join(lines))
+                written += len(lines)
+
+        self.prune()
+        return written
+
+    def days(self):
+        """Return the archived days, oldest first"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        days = []
+        for name in names:
+            if name.endswith(".jsonl"):
+                try:
+                    days.append(parse_archive_day(name[:-6]))
+                except ValueError:
+                    continue
+        return sorted(days)
+
+    def _retention_cutoff(self):
+        return datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=self.retention_days)
+
+    def prune(self):
+        """Delete day files older than the retention period"""
+        cutoff = self._retention_cutoff()
+        for day in self.days():
+            if day >= cutoff:
+                break
+            try:
+                os.remove(self._day_path(day))
+            except OSError as e:
+                logger.error(f"Error removing archived news for {day}: {str(e)}")
+
+    def query(self, start, end, category=None):
+        """
+        Return the archived articles published between two days, newest first
+
+        Args:
+            start: First day (datetime.date), inclusive
+            end: Last day (datetime.date), inclusive
+            category: Optional category the articles must have
+
+        Returns:
+            List of articles
+
+        Raises:
+            ValueError: If the range is reversed or longer than MAX_ARCHIVE_RANGE_DAYS
+        """
+        if end < start:
+            raise ValueError("The end date must not be before the start date")
+        if (end - start).days >= MAX_ARCHIVE_RANGE_DAYS:
+            raise ValueError(f"Archive searches are limited to {MAX_ARCHIVE_RANGE_DAYS} days")
+
+        articles = []
+        day = end
+        while day >= start:
+            day_articles = self._read_day(day)
+            if category:
+                day_articles = [article for article in day_articles if category in article.get("categories", [])]
+            # Articles whose source gave no usable date go after the dated ones
+            day_articles.sort(key=lambda article: (not article.get("published_at_inferred", False),
+                                                   article["published_at"]), reverse=True)
+            articles.extend(day_articles)
+            day -= datetime.timedelta(days=1)
+        return articles
+
+
+news_archive = NewsArchive()
@@ -0,0 +1,241 @@
+# news_dedup.py
+# Duplicate and near-duplicate detection for news articles from several sources
+
+import hashlib
+import logging
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from keyword_matcher import WORD_PATTERN
+
+logger = logging.getLogger("news_dedup")
+
+# Jaccard similarity of the word bigrams of title and description at which
+# two articles count as the same story (1.0 only drops identical texts)
+NEWS_DEDUP_THRESHOLD = float(os.getenv("NEWS_DEDUP_THRESHOLD", 0.7))
+
+# Articles with fewer word bigrams than this only merge with an identical text:
+# in a short title one changed word ("Class 10" / "Class 12") is another story
+NEWS_DEDUP_MIN_SHINGLES = int(os.getenv("NEWS_DEDUP_MIN_SHINGLES", 8))
+
+# Min-hashes per article signature
+MINHASH_PERMUTATIONS = 64
+
+# Share of pairs at the threshold that must become candidates when choosing bands
+MINHASH_CANDIDATE_RECALL = 0.995
+
+# Query parameters that only track where a reader came from
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "ocid", "ito"}
+
+# Placeholder descriptions the news scrapers wrote before they flagged them
+# with description_generated; such articles may still be in the live feed
+GENERATED_DESCRIPTION_PATTERN = re.compile(r"Latest education news (?:about .+ )?from .+\. Click to read more\.$")
+
+
+def canonical_url(url):
+    """
+    Normalize an article URL so the same page is recognized under different links
+
+    The scheme and host case, a leading "www.", the fragment, tracking
+    parameters (utm_* and TRACKING_PARAMS), the order of the remaining
+    parameters and a trailing slash are ignored.
+
+    Args:
+        url: Article URL
+
+    Returns:
+        Canonical URL string, or the input unchanged if it is not an http(s) URL
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except (AttributeError, ValueError):
+        return url
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return url
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS)
+    return urlunsplit(("https", host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+
+@lru_cache(maxsize=65536)
+def _word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# One random 64-bit mask per min-hash; XOR with a mask reorders the word hashes
+MINHASH_MASKS = [_word_hash(f"minhash-{i}") for i in range(MINHASH_PERMUTATIONS)]
+
+
+def description_is_generated(article):
+    """Whether an article's description is a scraper placeholder rather than text from its source"""
+    if article.get("description_generated"):
+        return True
+    return bool(GENERATED_DESCRIPTION_PATTERN.match(article.get("description") or ""))
+
+
+def article_shingles(article):
+    """
+    Return the word bigrams of an article's title and description
+
+    Placeholder descriptions are left out, since they say the same about
+    every article of a source and would make different stories look alike.
+    Bigrams keep word order, so "Class 10 results" and "Class 12 results"
+    share less than their word sets do.
+
+    Returns:
+        Set of "word word" strings, or the single word of a one-word text
+    """
+    text = article.get("title") or ""
+    if not description_is_generated(article):
+        text = f"{text} {article.get('description') or ''}"
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < 2:
+        return frozenset(words)
+    return frozenset(f"{first} {second}" for first, second in zip(words, words[1:]))
+
+
+def minhash(shingles):
+    """
+    Compute the MinHash signature of a shingle set
+
+    The share of positions at which two signatures agree estimates the
+    Jaccard similarity of the sets.
+
+    Args:
+        shingles: Non-empty set of strings
+
+    Returns:
+        Tuple of MINHASH_PERMUTATIONS ints
+    """
+    hashes = [_word_hash(shingle) for shingle in shingles]
+    return tuple(min(map(mask.__xor__, hashes)) for mask in MINHASH_MASKS)
+
+
+def minhash_bands(threshold, permutations=MINHASH_PERMUTATIONS, recall=MINHASH_CANDIDATE_RECALL):
+    """
+    Choose how many min-hashes each LSH band holds for a similarity threshold
+
+    A pair with similarity s shares a band of r rows with probability s ** r
+    in each of the bands, so it becomes a candidate with probability
+    1 - (1 - s ** r) ** bands. The widest bands that still make pairs at the
+    threshold candidates with the given recall are chosen, which keeps
+    dissimilar pairs from being compared.
+
+    Returns:
+        Number of rows per band
+    """
+    rows = 1
+    for candidate in range(2, permutations + 1):
+        if 1 - (1 - threshold ** candidate) ** (permutations // candidate) < recall:
+            break
+        rows = candidate
+    return rows
+
+
+class NewsDeduplicator:
+    """
+    Drop repeated and near-duplicate articles in a single pass
+
+    An article is a duplicate if its canonical URL was already kept (a set
+    lookup), or if the word bigrams of its title and description have a
+    Jaccard similarity of at least threshold with a kept article's. Texts
+    with fewer than min_shingles bigrams only match identical ones. MinHash
+    signatures split into LSH bands index the kept articles, so only those
+    sharing a band are compared and the pass stays roughly linear in the
+    number of articles. Candidates are confirmed on their exact bigram sets.
+
+    The first article seen wins, so callers pass the preferred copies first.
+    Every dropped article is recorded in decisions and counted in stats.
+    """
+
+    def __init__(self, threshold=NEWS_DEDUP_THRESHOLD, min_shingles=NEWS_DEDUP_MIN_SHINGLES):
+        """
+        Args:
+            threshold: Jaccard similarity treated as the same story (0-1)
+            min_shingles: Bigrams a text needs before near matches count
+        """
+        self.threshold = min(max(threshold, 0.01), 1.0)
+        self.min_shingles = min_shingles
+        rows = minhash_bands(self.threshold)
+        self.bands = [(start, start + rows) for start in range(0, MINHASH_PERMUTATIONS - rows + 1, rows)]
+        self.band_index = [{} for _ in self.bands]
+        self.urls = set()
+        self.kept = []
+        self.decisions = []
+        self.stats = Counter()
+
+    def add(self, article):
+        """
+        Keep an article unless it duplicates one already kept
+
+        Args:
+            article: Article with url, title and description
+
+        Returns:
+            True if the article was kept, False if it was dropped
+        """
+        url = canonical_url(article.get("url") or "")
+        if url and url in self.urls:
+            self._drop(article, "duplicate-url", url=url)
+            return False
+
+        shingles = article_shingles(article)
+        keys = []
+        if shingles:
+            signature = minhash(shingles)
+            keys = [signature[start:end] for start, end in self.bands]
+
+            compared = set()
+            for index, key in zip(self.band_index, keys):
+                for position in index.get(key, ()):
+                    if position in compared:
+                        continue
+                    compared.add(position)
+                    kept_shingles, kept_article = self.kept[position]
+                    similarity = len(shingles & kept_shingles) / len(shingles | kept_shingles)
+                    short = min(len(shingles), len(kept_shingles)) < self.min_shingles
+                    if similarity >= (1.0 if short else self.threshold):
+                        self._drop(article, "near-duplicate", duplicate_of=kept_article, similarity=similarity)
+                        return False
+
+        position = len(self.kept)
+        self.kept.append((shingles, article))
+        for index, key in zip(self.band_index, keys):
+            index.setdefault(key, []).append(position)
+        if url:
+            self.urls.add(url)
+        self.stats["kept"] += 1
+        return True
+
+    def _drop(self, article, reason, duplicate_of=None, similarity=None, url=None):
+        self.stats[reason] += 1
+        decision = {"reason": reason, "title": article.get("title"), "url": article.get("url")}
+        if duplicate_of is not None:
+            decision["duplicate_of"] = duplicate_of.get("title")
+            decision["similarity"] = round(similarity, 2)
+        self.decisions.append(decision)
+
+        if reason == "near-duplicate":
+            logger.info(f"Dropped near-duplicate '{decision['title']}' "
+                        f"({decision['similarity']:.0%} similar to '{decision['duplicate_of']}')")
+        else:
+            logger.info(f"Dropped repeated URL {url} ('{decision['title']}')")
+
+    def filter(self, articles):
+        """
+        Return the articles that are kept, in their original order
+
+        Args:
+            articles: Articles to deduplicate against everything added so far
+
+        Returns:
+            List of kept articles
+        """
+        return [article for article in articles if self.add(article)]
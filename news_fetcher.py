@@ -6,15 +6,31 @@ that will be displayed on the news.html page.
 """
 
 import os
+import re
 import json
+import heapq
 import time
+import hashlib
+import socket
+import uuid
 import datetime
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 from bs4 import BeautifulSoup
-import schedule
 import threading
-import random
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+
+from keyword_matcher import KeywordMatcher
+from news_archive import news_archive
+from news_dedup import NewsDeduplicator, canonical_url
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; leases are then written atomically but without a cross-process lock
+    fcntl = None
 
 # Configure logging
 logging.basicConfig(
@@ -44,18 +60,374 @@ CATEGORIES = {
     'career': ['career', 'job', 'employment', 'skill', 'professional', 'workforce', 'internship']
 }
 
+# Keywords that make an article education-related even without a category
+EDUCATION_KEYWORDS = [
+    'education', 'educational', 'university', 'college', 'school', 'student', 'academic', 
+    'learning', 'teaching', 'degree', 'course', 'study', 'research', 
+    'professor', 'teacher', 'faculty', 'campus', 'scholarship', 'career',
+    'graduate', 'undergraduate', 'phd', 'masters', 'bachelor', 'curriculum',
+    'exam', 'admission', 'enrollment', 'classroom', 'lecture', 'seminar',
+    'education technology', 'edtech', 'online learning', 'e-learning',
+    'higher education', 'vocational training', 'skill development'
+]
+
+# Group name of EDUCATION_KEYWORDS hits in the keyword matcher
+EDUCATION_KEYWORD_GROUP = 'education'
+
+# Every category and education keyword compiled into one matcher at import time
+news_keyword_matcher = KeywordMatcher(dict(CATEGORIES, **{EDUCATION_KEYWORD_GROUP: EDUCATION_KEYWORDS}))
+
+# Articles kept in the live news feed
+NEWS_MAX_ARTICLES = int(os.getenv('NEWS_MAX_ARTICLES', 50))
+
+# Default and maximum number of articles on one /news page
+NEWS_PAGE_SIZE = 12
+MAX_NEWS_PAGE_SIZE = 50
+
+# Longest search text accepted by /news
+MAX_NEWS_QUERY_LENGTH = 100
+
 def classify_news(title, description):
     """Classify news into categories based on keywords in title and description"""
-    text = (title + ' ' + description).lower()
-    article_categories = []
+    groups = news_keyword_matcher.groups(title + ' ' + description)
+    return [category for category in CATEGORIES if category in groups]
+
+# Fetch settings, overridable from the environment. Every source request gets
+# NEWS_SOURCE_TIMEOUT seconds per connect/read, and a refresh keeps whatever has
+# arrived once NEWS_REFRESH_DEADLINE seconds have passed.
+NEWS_SOURCE_TIMEOUT = float(os.getenv('NEWS_SOURCE_TIMEOUT', 10))
+NEWS_REFRESH_DEADLINE = float(os.getenv('NEWS_REFRESH_DEADLINE', 30))
+NEWS_FETCH_WORKERS = int(os.getenv('NEWS_FETCH_WORKERS', 12))
+
+# Source endpoints (overridable to point the fetcher at a mirror or a local stub)
+NEWS_API_URL = os.getenv('NEWS_API_URL', 'https://newsapi.org/v2/everything')
+GOOGLE_NEWS_URL = os.getenv('GOOGLE_NEWS_URL', 'https://news.google.com')
+
+# On-disk cache of validators and parsed articles per fetched URL
+NEWS_HTTP_CACHE_FILE = os.getenv('NEWS_HTTP_CACHE_FILE', os.path.join(os.path.dirname(__file__), 'news_cache', 'http_cache.json'))
+
+# Bump whenever the parsers or classify_news change, so cached articles are parsed again
+NEWS_PARSER_VERSION = 5
+
+# Seconds between checks of the news data file for changes made by another process
+NEWS_SNAPSHOT_CHECK_INTERVAL = float(os.getenv('NEWS_SNAPSHOT_CHECK_INTERVAL', 1))
+
+# Only the process holding the updater lease refreshes the news; the lease expires
+# NEWS_LEASE_TTL seconds after its last renewal, so keep it well above
+# NEWS_LEASE_CHECK_INTERVAL plus NEWS_REFRESH_DEADLINE.
+NEWS_UPDATE_INTERVAL = float(os.getenv('NEWS_UPDATE_INTERVAL', 60 * 60))
+NEWS_LEASE_FILE = os.getenv('NEWS_LEASE_FILE', os.path.join(os.path.dirname(__file__), 'news_cache', 'updater.lease'))
+NEWS_LEASE_TTL = float(os.getenv('NEWS_LEASE_TTL', 3 * 60))
+NEWS_LEASE_CHECK_INTERVAL = float(os.getenv('NEWS_LEASE_CHECK_INTERVAL', 60))
+
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Education-related Google News queries, each fetched as its own request
+GOOGLE_NEWS_QUERIES = [
+    "higher education career",
+    "university degree programs",
+    "college admissions",
+    "education technology career",
+    "scholarship opportunities",
+    "student career development",
+    "vocational training programs",
+    "online learning degrees",
+    "education job market"
+]
+
+# This is a simplified example. In a real implementation, you would
+# create specific scrapers for each education website.
+EDUCATION_SITES = [
+    {
+        'name': 'Inside Higher Ed',
+        'url': 'https://www.insidehighered.com/',
+        'article_selector': 'article.views-row',
+        'title_selector': 'h2 a',
+        'description_selector': 'div.field-summary',
+        'link_selector': 'h2 a',
+        'date_selector': 'div.field-date'
+    },
+    {
+        'name': 'Education Week',
+        'url': 'https://www.edweek.org/',
+        'article_selector': 'article.promo',
+        'title_selector': 'h3 a',
+        'description_selector': 'p.description',
+        'link_selector': 'h3 a',
+        'date_selector': 'span.date-display-single'
+    }
+]
+
+def write_json_atomic(path, data, **kwargs):
+    """Write JSON to a temporary file and rename it over path, so readers never see a partial file"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **kwargs)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+class HttpCache:
+    """
+    Validators and parsed articles of every fetched URL, kept in one small JSON file
+    
+    Each entry holds the ETag, Last-Modified and SHA-256 body hash of the last
+    200 response together with the articles parsed from it. Requests are sent
+    conditionally; a 304, or a 200 whose body hash is unchanged, reuses the
+    stored articles without parsing the page again.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = None
+        self.dirty = False
+        self.reset_stats()
+    
+    def reset_stats(self):
+        self.stats = {'not_modified': 0, 'unchanged': 0, 'parsed': 0, 'bytes': 0}
+    
+    def _key(self, url):
+        # URLs are hashed so query parameters such as API keys are not written to disk
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+    
+    def _load(self):
+        if self.entries is not None:
+            return
+        self.entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('parser_version') == NEWS_PARSER_VERSION:
+                self.entries = data.get('entries', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable HTTP cache {self.path}: {str(e)}")
+    
+    def get(self, url):
+        with self.lock:
+            self._load()
+            return self.entries.get(self._key(url))
+    
+    def put(self, url, entry):
+        with self.lock:
+            self._load()
+            self.entries[self._key(url)] = entry
+            self.dirty = True
+    
+    def record(self, outcome, size):
+        with self.lock:
+            self.stats[outcome] += 1
+            self.stats['bytes'] += size
+    
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            try:
+                write_json_atomic(self.path, {'parser_version': NEWS_PARSER_VERSION, 'entries': self.entries})
+                self.dirty = False
+            except Exception as e:
+                logger.error(f"Error saving HTTP cache: {str(e)}")
+
+news_http_cache = HttpCache(NEWS_HTTP_CACHE_FILE)
+
+def create_http_session(pool_size=NEWS_FETCH_WORKERS):
+    """Create a keep-alive session whose connection pools fit every concurrent fetch"""
+    http_session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    http_session.mount('http://', adapter)
+    http_session.mount('https://', adapter)
+    return http_session
+
+# Shared by all fetches, so repeated requests to a host reuse open connections
+http_session = create_http_session()
+
+def fetch_cached(name, url, parse, params=None, headers=None, timeout=None):
+    """
+    Fetch a URL conditionally and parse it only when its content changed
+    
+    Args:
+        name: Source name used in log messages
+        url: URL to fetch
+        parse: Function turning the requests response into a list of articles
+        params: Optional query parameters
+        headers: Optional request headers
+        timeout: Seconds allowed per connect/read (defaults to NEWS_SOURCE_TIMEOUT)
+    
+    Returns:
+        List of articles (copies, safe to modify)
+    """
+    request_url = requests.Request('GET', url, params=params).prepare().url
+    entry = news_http_cache.get(request_url)
+    
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            request_headers['If-Modified-Since'] = entry['last_modified']
+    
+    response = http_session.get(request_url, headers=request_headers, timeout=timeout or NEWS_SOURCE_TIMEOUT)
+    
+    if response.status_code == 304 and entry:
+        news_http_cache.record('not_modified', 0)
+        return [dict(article) for article in entry['articles']]
+    
+    if response.status_code != 200:
+        logger.error(f"Error fetching from {name}: Status code {response.status_code}")
+        return []
+    
+    body_hash = hashlib.sha256(response.content).hexdigest()
+    if entry and entry.get('body_hash') == body_hash:
+        news_http_cache.record('unchanged', len(response.content))
+        articles = entry['articles']
+    else:
+        news_http_cache.record('parsed', len(response.content))
+        articles = parse(response)
+    
+    news_http_cache.put(request_url, {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'body_hash': body_hash,
+        'articles': articles
+    })
+    return [dict(article) for article in articles]
+
+# Date formats seen in the sources, tried in order; naive times are taken as UTC
+PUBLISHED_DATE_FORMATS = [
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%b. %d, %Y",
+    "%B %d, %Y %I:%M %p",
+    "%d %B %Y",
+    "%Y-%m-%d",
+    "%m/%d/%Y"
+]
+
+RELATIVE_DATE_PATTERN = re.compile(r'(\d+)\s*(minute|min|hour|hr|day|week)s?\s+ago', re.IGNORECASE)
+RELATIVE_DATE_UNITS = {'minute': 'minutes', 'min': 'minutes', 'hour': 'hours', 'hr': 'hours', 'day': 'days', 'week': 'weeks'}
+
+def parse_published_time(value, fetched_at):
+    """
+    Normalize a source's publication date to a timezone-aware UTC datetime
+    
+    Args:
+        value: Date as published by the source (ISO 8601, a written date or "3 hours ago")
+        fetched_at: UTC datetime the page was fetched, for relative dates
+    
+    Returns:
+        UTC datetime, or None if the date cannot be understood
+    """
+    if not value:
+        return None
+    text = value.strip()
+    lowered = text.lower()
+    
+    if lowered in ('just now', 'now'):
+        return fetched_at
+    if lowered == 'yesterday':
+        return fetched_at - datetime.timedelta(days=1)
+    relative = RELATIVE_DATE_PATTERN.search(text)
+    if relative:
+        amount, unit = int(relative.group(1)), RELATIVE_DATE_UNITS[relative.group(2).lower()]
+        return fetched_at - datetime.timedelta(**{unit: amount})
     
-    for category, keywords in CATEGORIES.items():
-        for keyword in keywords:
-            if keyword.lower() in text:
-                article_categories.append(category)
+    try:
+        parsed = datetime.datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        parsed = None
+        for date_format in PUBLISHED_DATE_FORMATS:
+            try:
+                parsed = datetime.datetime.strptime(text, date_format)
                 break
+            except ValueError:
+                continue
+    if parsed is None:
+        return None
     
-    return article_categories
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+def format_utc(moment):
+    """Format a UTC datetime as the sortable published_at string stored with articles"""
+    return moment.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def published_at_fields(value, fetched_at):
+    """
+    Return the published_at field for a source date, falling back to the fetch time
+    
+    When the source gives no date, or one that cannot be understood, the
+    article is also marked with published_at_inferred, so feeds and the
+    archive can rank it after articles with a real publication date.
+    """
+    published = parse_published_time(value, fetched_at)
+    if published is None:
+        return {'published_at': format_utc(fetched_at), 'published_at_inferred': True}
+    return {'published_at': format_utc(published)}
+
+def article_published_at(article):
+    """Sort key for articles; those stored before published_at existed fall back to when they were added"""
+    if 'published_at' not in article:
+        added = article.get('added_timestamp') or time.time()
+        article['published_at'] = format_utc(datetime.datetime.fromtimestamp(added, datetime.timezone.utc))
+    return article['published_at']
+
+def article_recency(article):
+    """Newest-first sort key that ranks articles with an inferred publication time after dated ones"""
+    return (not article.get('published_at_inferred', False), article_published_at(article))
+
+def parse_news_api(response):
+    """Turn a News API response into articles"""
+    data = response.json()
+    
+    if data.get('status') != 'ok':
+        logger.error(f"News API error: {data.get('message', 'Unknown error')}")
+        return []
+    
+    articles = []
+    fetched_at = datetime.datetime.now(datetime.timezone.utc)
+    for article in data.get('articles', []):
+        # Skip articles without title or description
+        if not article.get('title') or not article.get('description'):
+            continue
+            
+        # Format the date
+        published_date = article.get('publishedAt')
+        if published_date:
+            try:
+                date_obj = datetime.datetime.strptime(published_date, "%Y-%m-%dT%H:%M:%SZ")
+                formatted_date = date_obj.strftime("%B %d, %Y")
+            except ValueError:
+                formatted_date = published_date
+        else:
+            formatted_date = "Unknown date"
+        
+        # Classify the article
+        categories = classify_news(article.get('title', ''), article.get('description', ''))
+        
+        articles.append({
+            'title': article.get('title'),
+            'description': article.get('description'),
+            'url': article.get('url'),
+            'image_url': article.get('urlToImage'),
+            'source': article.get('source', {}).get('name', 'Unknown source'),
+            'published_date': formatted_date,
+            **published_at_fields(article.get('publishedAt'), fetched_at),
+            'categories': categories
+        })
+    
+    return articles
 
 def fetch_from_news_api():
     """Fetch education news from News API"""
@@ -70,276 +442,274 @@ def fetch_from_news_api():
             "AND (career OR degree OR student OR graduate OR admission OR scholarship OR course OR curriculum OR "
             "\"skill development\" OR \"vocational training\" OR \"job market\" OR \"employment\" OR \"internship\")"
         )
-        url = f"https://newsapi.org/v2/everything?q={query}&sortBy=publishedAt&apiKey={NEWS_API_KEY}&language=en&pageSize=20"
-        response = requests.get(url)
-        data = response.json()
-        
-        if data.get('status') != 'ok':
-            logger.error(f"News API error: {data.get('message', 'Unknown error')}")
-            return []
-        
-        articles = []
-        for article in data.get('articles', []):
-            # Skip articles without title or description
-            if not article.get('title') or not article.get('description'):
+        params = {
+            'q': query,
+            'sortBy': 'publishedAt',
+            'apiKey': NEWS_API_KEY,
+            'language': 'en',
+            'pageSize': 20
+        }
+        return fetch_cached("News API", NEWS_API_URL, parse_news_api, params=params)
+    except Exception as e:
+        logger.error(f"Error fetching from News API: {str(e)}")
+        return []
+
+def parse_google_news(response, query):
+    """Turn a Google News search results page into articles"""
+    articles = []
+    fetched_at = datetime.datetime.now(datetime.timezone.utc)
+    soup = BeautifulSoup(response.text, 'html.parser')
+    
+    # Find article elements
+    article_elements = soup.select('article')
+    
+    for article in article_elements[:5]:  # Limit to 5 articles per query
+        try:
+            # Extract title and link
+            title_element = article.select_one('h3 a')
+            if not title_element:
                 continue
                 
-            # Format the date
-            published_date = article.get('publishedAt')
-            if published_date:
-                try:
-                    date_obj = datetime.datetime.strptime(published_date, "%Y-%m-%dT%H:%M:%SZ")
-                    formatted_date = date_obj.strftime("%B %d, %Y")
-                except ValueError:
-                    formatted_date = published_date
+            title = title_element.text
+            
+            # Google News uses relative URLs
+            relative_url = title_element.get('href', '')
+            if relative_url:
+                article_url = f"{GOOGLE_NEWS_URL}{relative_url.replace('./', '/')}"
             else:
-                formatted_date = "Unknown date"
+                continue
+            
+            # Extract source and time
+            source_time = article.select_one('div[class*="TVFRme"]')
+            source = "Unknown source"
+            published_time = "Recent"
+            published_value = None
+            
+            if source_time:
+                source_element = source_time.select_one('a')
+                time_element = source_time.select_one('time')
+                
+                if source_element:
+                    source = source_element.text
+                
+                if time_element:
+                    published_time = time_element.text
+                    # The datetime attribute is exact; the text is often relative ("3 hours ago")
+                    published_value = time_element.get('datetime') or time_element.text
+            
+            # We don't get descriptions from Google News easily, so create a placeholder
+            description = f"Latest education news about {query} from {source}. Click to read more."
             
             # Classify the article
-            categories = classify_news(article.get('title', ''), article.get('description', ''))
+            categories = classify_news(title, description)
             
             articles.append({
-                'title': article.get('title'),
-                'description': article.get('description'),
-                'url': article.get('url'),
-                'image_url': article.get('urlToImage'),
-                'source': article.get('source', {}).get('name', 'Unknown source'),
-                'published_date': formatted_date,
-                'categories': categories
+                'title': title,
+                'description': description,
+                'url': article_url,
+                'image_url': None,  # Google News doesn't provide images in the listing
+                'source': source,
+                'published_date': published_time,
+                **published_at_fields(published_value, fetched_at),
+                'categories': categories,
+                'description_generated': True,  # The description above is a placeholder
+                'query': query  # Store the query used to find this article
             })
-        
-        return articles
-    except Exception as e:
-        logger.error(f"Error fetching from News API: {str(e)}")
-        return []
+        except Exception as e:
+            logger.error(f"Error processing Google News article for query '{query}': {str(e)}")
+            continue
+    
+    return articles
 
-def fetch_from_google_news():
-    """Fetch education news by scraping Google News"""
+def fetch_google_news_query(query):
+    """Fetch education news for one query by scraping Google News"""
+    encoded_query = requests.utils.quote(query)
+    url = f"{GOOGLE_NEWS_URL}/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
+    
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        # Use more specific education-related queries
-        education_queries = [
-            "higher education career",
-            "university degree programs",
-            "college admissions",
-            "education technology career",
-            "scholarship opportunities",
-            "student career development",
-            "vocational training programs",
-            "online learning degrees",
-            "education job market"
-        ]
-        
-        all_articles = []
-        
-        # Fetch articles for each query
-        for query in education_queries:
-            encoded_query = requests.utils.quote(query)
-            url = f"https://news.google.com/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
-            
-            try:
-                response = requests.get(url, headers=headers)
-                
-                if response.status_code != 200:
-                    logger.error(f"Google News error for query '{query}': Status code {response.status_code}")
-                    continue
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Find article elements
-                article_elements = soup.select('article')
-                
-                for article in article_elements[:5]:  # Limit to 5 articles per query
-                    try:
-                        # Extract title and link
-                        title_element = article.select_one('h3 a')
-                        if not title_element:
-                            continue
-                            
-                        title = title_element.text
-                        
-                        # Google News uses relative URLs
-                        relative_url = title_element.get('href', '')
-                        if relative_url:
-                            article_url = f"https://news.google.com{relative_url.replace('./', '/')}"
-                        else:
-                            continue
-                        
-                        # Extract source and time
-                        source_time = article.select_one('div[class*="TVFRme"]')
-                        source = "Unknown source"
-                        published_time = "Recent"
-                        
-                        if source_time:
-                            source_element = source_time.select_one('a')
-                            time_element = source_time.select_one('time')
-                            
-                            if source_element:
-                                source = source_element.text
-                            
-                            if time_element:
-                                published_time = time_element.text
-                        
-                        # We don't get descriptions from Google News easily, so create a placeholder
-                        description = f"Latest education news about {query} from {source}. Click to read more."
-                        
-                        # Classify the article
-                        categories = classify_news(title, description)
-                        
-                        # Check if this article is already in our list (by URL)
-                        if not any(a.get('url') == article_url for a in all_articles):
-                            all_articles.append({
-                                'title': title,
-                                'description': description,
-                                'url': article_url,
-                                'image_url': None,  # Google News doesn't provide images in the listing
-                                'source': source,
-                                'published_date': published_time,
-                                'categories': categories,
-                                'query': query  # Store the query used to find this article
-                            })
-                    except Exception as e:
-                        logger.error(f"Error processing Google News article for query '{query}': {str(e)}")
-                        continue
-            except Exception as e:
-                logger.error(f"Error fetching from Google News for query '{query}': {str(e)}")
-                continue
-        
-        return all_articles
+        return fetch_cached(f"Google News for query '{query}'", url,
+                            lambda response: parse_google_news(response, query), headers=BROWSER_HEADERS)
     except Exception as e:
-        logger.error(f"Error in Google News fetcher: {str(e)}")
+        logger.error(f"Error fetching from Google News for query '{query}': {str(e)}")
         return []
 
-def fetch_from_education_websites():
-    """Fetch news from education-focused websites"""
-    # This is a simplified example. In a real implementation, you would
-    # create specific scrapers for each education website.
-    education_sites = [
-        {
-            'name': 'Inside Higher Ed',
-            'url': 'https://www.insidehighered.com/',
-            'article_selector': 'article.views-row',
-            'title_selector': 'h2 a',
-            'description_selector': 'div.field-summary',
-            'link_selector': 'h2 a',
-            'date_selector': 'div.field-date'
-        },
-        {
-            'name': 'Education Week',
-            'url': 'https://www.edweek.org/',
-            'article_selector': 'article.promo',
-            'title_selector': 'h3 a',
-            'description_selector': 'p.description',
-            'link_selector': 'h3 a',
-            'date_selector': 'span.date-display-single'
-        }
-    ]
-    
+def merge_google_news(query_articles):
+    """Combine per-query Google News results in query order, dropping repeated URLs"""
     all_articles = []
+    seen_urls = set()
+    
+    for articles in query_articles:
+        for article in articles or []:
+            # Check if this article is already in our list (by canonical URL)
+            url = canonical_url(article['url'])
+            if url not in seen_urls:
+                seen_urls.add(url)
+                all_articles.append(article)
     
-    for site in education_sites:
+    return all_articles
+
+def parse_education_site(response, site):
+    """Turn an education website's front page into articles"""
+    articles = []
+    fetched_at = datetime.datetime.now(datetime.timezone.utc)
+    soup = BeautifulSoup(response.text, 'html.parser')
+    
+    for article in soup.select(site['article_selector'])[:5]:  # Limit to 5 articles per site
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(site['url'], headers=headers, timeout=10)
+            title_element = article.select_one(site['title_selector'])
+            description_element = article.select_one(site['description_selector'])
+            link_element = article.select_one(site['link_selector'])
+            date_element = article.select_one(site['date_selector'])
             
-            if response.status_code != 200:
-                logger.error(f"Error fetching from {site['name']}: Status code {response.status_code}")
+            if not title_element or not link_element:
                 continue
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = soup.select(site['article_selector'])
+            title = title_element.text.strip()
+            
+            # Handle relative URLs
+            link = link_element.get('href', '')
+            if link and not link.startswith(('http://', 'https://')):
+                link = site['url'].rstrip('/') + '/' + link.lstrip('/')
+            
+            description = description_element.text.strip() if description_element else f"Latest education news from {site['name']}. Click to read more."
+            published_date = date_element.text.strip() if date_element else "Recent"
             
-            for article in articles[:5]:  # Limit to 5 articles per site
-                try:
-                    title_element = article.select_one(site['title_selector'])
-                    description_element = article.select_one(site['description_selector'])
-                    link_element = article.select_one(site['link_selector'])
-                    date_element = article.select_one(site['date_selector'])
-                    
-                    if not title_element or not link_element:
-                        continue
-                    
-                    title = title_element.text.strip()
-                    
-                    # Handle relative URLs
-                    link = link_element.get('href', '')
-                    if link and not link.startswith(('http://', 'https://')):
-                        link = site['url'].rstrip('/') + '/' + link.lstrip('/')
-                    
-                    description = description_element.text.strip() if description_element else f"Latest education news from {site['name']}. Click to read more."
-                    published_date = date_element.text.strip() if date_element else "Recent"
-                    
-                    # Classify the article
-                    categories = classify_news(title, description)
-                    
-                    all_articles.append({
-                        'title': title,
-                        'description': description,
-                        'url': link,
-                        'image_url': None,
-                        'source': site['name'],
-                        'published_date': published_date,
-                        'categories': categories
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing article from {site['name']}: {str(e)}")
-                    continue
+            # Classify the article
+            categories = classify_news(title, description)
+            
+            articles.append({
+                'title': title,
+                'description': description,
+                'url': link,
+                'image_url': None,
+                'source': site['name'],
+                'published_date': published_date,
+                **published_at_fields((date_element.get('datetime') or date_element.text) if date_element else None, fetched_at),
+                'categories': categories
+            })
+            if not description_element:
+                # A placeholder, so deduplication compares the title alone
+                articles[-1]['description_generated'] = True
         except Exception as e:
-            logger.error(f"Error fetching from {site['name']}: {str(e)}")
+            logger.error(f"Error processing article from {site['name']}: {str(e)}")
             continue
     
-    return all_articles
+    return articles
 
-def is_education_related(article):
-    """Check if an article is education-related based on its title and description"""
-    education_keywords = [
-        'education', 'university', 'college', 'school', 'student', 'academic', 
-        'learning', 'teaching', 'degree', 'course', 'study', 'research', 
-        'professor', 'teacher', 'faculty', 'campus', 'scholarship', 'career',
-        'graduate', 'undergraduate', 'phd', 'masters', 'bachelor', 'curriculum',
-        'exam', 'admission', 'enrollment', 'classroom', 'lecture', 'seminar',
-        'education technology', 'edtech', 'online learning', 'e-learning',
-        'higher education', 'vocational training', 'skill development'
-    ]
+def fetch_education_site(site):
+    """Fetch news from one education-focused website"""
+    try:
+        return fetch_cached(site['name'], site['url'], lambda response: parse_education_site(response, site),
+                            headers=BROWSER_HEADERS, timeout=site.get('timeout'))
+    except Exception as e:
+        logger.error(f"Error fetching from {site['name']}: {str(e)}")
+        return []
+
+def run_fetch_jobs(jobs, deadline=NEWS_REFRESH_DEADLINE, workers=NEWS_FETCH_WORKERS):
+    """
+    Run source fetches concurrently and collect whatever finishes before the deadline
     
-    text = (article.get('title', '') + ' ' + article.get('description', '')).lower()
+    Args:
+        jobs: List of (name, function, args) tuples; each function returns a list of articles
+        deadline: Seconds to wait for all jobs before keeping the partial results
+        workers: Maximum number of concurrent requests
     
-    for keyword in education_keywords:
-        if keyword.lower() in text:
-            return True
+    Returns:
+        List with the articles of each job, in job order (an empty list for
+        jobs that failed or missed the deadline)
+    """
+    results = [[] for _ in jobs]
+    if not jobs:
+        return results
     
-    # If the article already has categories, check if any are education-related
-    categories = article.get('categories', [])
-    education_categories = ['higher-education', 'technology', 'policy', 'career']
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs))), thread_name_prefix="news-fetch")
+    futures = {executor.submit(function, *args): index for index, (name, function, args) in enumerate(jobs)}
     
-    for category in categories:
-        if category in education_categories:
-            return True
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            index = futures[future]
+            try:
+                results[index] = future.result() or []
+            except Exception as e:
+                logger.error(f"Error fetching from {jobs[index][0]}: {str(e)}")
+    except FuturesTimeoutError:
+        pending = [jobs[index][0] for future, index in futures.items() if not future.done()]
+        logger.warning(f"News refresh deadline of {deadline:g}s reached; keeping partial results without: {', '.join(pending)}")
+    finally:
+        # Jobs still running are abandoned; their requests end within NEWS_SOURCE_TIMEOUT
+        executor.shutdown(wait=False, cancel_futures=True)
+        news_http_cache.save()
     
-    return False
+    return results
+
+def fetch_from_google_news():
+    """Fetch education news by scraping Google News, one concurrent request per query"""
+    jobs = [(f"Google News ({query})", fetch_google_news_query, (query,)) for query in GOOGLE_NEWS_QUERIES]
+    return merge_google_news(run_fetch_jobs(jobs))
+
+def fetch_from_education_websites():
+    """Fetch news from education-focused websites concurrently"""
+    jobs = [(site['name'], fetch_education_site, (site,)) for site in EDUCATION_SITES]
+    return [article for articles in run_fetch_jobs(jobs) for article in articles]
+
+def fetch_all_sources(deadline=NEWS_REFRESH_DEADLINE, workers=NEWS_FETCH_WORKERS):
+    """
+    Fetch News API, every Google News query and every education website at once
+    
+    All requests share one pool, so a refresh takes about as long as the
+    slowest single request (bounded by the deadline) instead of their sum.
+    
+    Args:
+        deadline: Seconds to wait before keeping the partial results
+        workers: Maximum number of concurrent requests
+    
+    Returns:
+        Tuple of (News API articles, Google News articles, education website articles)
+    """
+    jobs = [("News API", fetch_from_news_api, ())]
+    jobs += [(f"Google News ({query})", fetch_google_news_query, (query,)) for query in GOOGLE_NEWS_QUERIES]
+    jobs += [(site['name'], fetch_education_site, (site,)) for site in EDUCATION_SITES]
+    
+    results = run_fetch_jobs(jobs, deadline, workers)
+    google_end = 1 + len(GOOGLE_NEWS_QUERIES)
+    
+    news_api_articles = results[0]
+    google_news_articles = merge_google_news(results[1:google_end])
+    education_website_articles = [article for articles in results[google_end:] for article in articles]
+    return news_api_articles, google_news_articles, education_website_articles
+
+def is_education_related(article):
+    """Check if an article is education-related based on its title and description"""
+    # Every category is education-related, and classify_news already found those
+    if any(category in CATEGORIES for category in article.get('categories', [])):
+        return True
+    
+    text = article.get('title', '') + ' ' + article.get('description', '')
+    return EDUCATION_KEYWORD_GROUP in news_keyword_matcher.groups(text)
 
 def update_news_data():
     """Fetch news from all sources and update the news data file"""
     current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.info(f"Starting news update at {current_time}...")
     
-    # Fetch news from different sources
-    news_api_articles = fetch_from_news_api()
-    google_news_articles = fetch_from_google_news()
-    education_website_articles = fetch_from_education_websites()
+    # Fetch news from all sources concurrently, parsing only pages that changed
+    news_http_cache.reset_stats()
+    news_api_articles, google_news_articles, education_website_articles = fetch_all_sources()
+    stats = news_http_cache.stats
+    logger.info(f"HTTP cache: {stats['not_modified']} not modified, {stats['unchanged']} unchanged, "
+                f"{stats['parsed']} parsed, {stats['bytes'] / 1024:.1f} KiB downloaded")
     
     # Log the number of articles fetched from each source
     logger.info(f"Fetched {len(news_api_articles)} articles from News API")
     logger.info(f"Fetched {len(google_news_articles)} articles from Google News")
     logger.info(f"Fetched {len(education_website_articles)} articles from education websites")
     
-    # Combine all articles
-    all_articles = news_api_articles + google_news_articles + education_website_articles
+    # Order each source by publication time, then merge them into one newest-first stream
+    sources = [
+        sorted(articles, key=article_recency, reverse=True)
+        for articles in (news_api_articles, google_news_articles, education_website_articles)
+    ]
+    all_articles = list(heapq.merge(*sources, key=article_recency, reverse=True))
     
     # Filter to keep only education-related articles
     education_articles = [article for article in all_articles if is_education_related(article)]
@@ -356,57 +726,59 @@ def update_news_data():
     
     # Process existing articles to keep those less than 24 hours old
     kept_existing_articles = []
-    seen_titles = set()
-    
-    # Add titles of new articles to seen_titles to avoid duplicates
-    for article in education_articles:
-        seen_titles.add(article['title'])
-    
-    # Keep existing articles that are less than 24 hours old and not duplicates
     for article in existing_articles:
-        # Skip if title is already in new articles
-        if article['title'] in seen_titles:
-            continue
-        
         # Check if article has timestamp and is less than 24 hours old
         if 'added_timestamp' in article:
             article_time = article['added_timestamp']
             age_hours = (current_timestamp - article_time) / 3600
             
             if age_hours < 24:  # Keep if less than 24 hours old
-                seen_titles.add(article['title'])
                 kept_existing_articles.append(article)
         else:
             # Add timestamp to articles that don't have one
             article['added_timestamp'] = current_timestamp
-            seen_titles.add(article['title'])
             kept_existing_articles.append(article)
     
-    # Combine new and kept existing articles
-    combined_articles = education_articles + kept_existing_articles
+    # Drop repeated URLs and near-duplicate stories. Articles already in the feed
+    # win over copies found again, so a story keeps its first added_timestamp and
+    # its 24-hour expiry is not restarted by every refresh that sees it.
+    deduplicator = NewsDeduplicator()
+    kept_existing_articles = deduplicator.filter(kept_existing_articles)
+    education_articles = deduplicator.filter(education_articles)
+    logger.info(f"Deduplication kept {deduplicator.stats['kept']} articles, dropped "
+                f"{deduplicator.stats['duplicate-url']} repeated URLs and "
+                f"{deduplicator.stats['near-duplicate']} near-duplicates")
     
-    # Sort by date (most recent first) - using added_timestamp as a fallback
-    # This is a simplified approach since we have different date formats
-    random.shuffle(combined_articles)  # For now, just shuffle them
+    # Merge new and kept existing articles by publication time, newest first
+    kept_existing_articles.sort(key=article_recency, reverse=True)
+    combined_articles = list(heapq.merge(education_articles, kept_existing_articles, key=article_recency, reverse=True))
     
-    # Limit to 50 articles (increased from 30 to accommodate keeping older articles)
-    combined_articles = combined_articles[:50]
+    # Limit the feed size (NEWS_MAX_ARTICLES, 50 by default)
+    combined_articles = combined_articles[:NEWS_MAX_ARTICLES]
     
-    # Create the news data object
+    # Create the news data object, with the category index /news pages through
     news_data = {
         'last_updated': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        'articles': combined_articles
+        'articles': combined_articles,
+        'category_index': build_category_index(combined_articles)
     }
     
-    # Save to file
+    # Save to file atomically, so readers never see a partially written file
     try:
-        with open(NEWS_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(news_data, f, ensure_ascii=False, indent=2)
+        write_json_atomic(NEWS_DATA_FILE, news_data, ensure_ascii=False, indent=2)
+        news_snapshot.replace(news_data)
         end_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         logger.info(f"News data updated successfully at {end_time} with {len(combined_articles)} articles")
-        logger.info(f"Next update scheduled in 1 hour")
+        logger.info(f"Next update scheduled in {NEWS_UPDATE_INTERVAL / 3600:g} hour(s)")
     except Exception as e:
         logger.error(f"Error saving news data: {str(e)}")
+    
+    # Everything fetched goes to the archive, including articles beyond the live feed's cap
+    try:
+        archived = news_archive.append(education_articles)
+        logger.info(f"Archived {archived} new articles")
+    except Exception as e:
+        logger.error(f"Error archiving news: {str(e)}")
 
 def load_news_data():
     """Load news data from file"""
@@ -421,24 +793,280 @@ def load_news_data():
         logger.error(f"Error loading news data: {str(e)}")
         return {'last_updated': None, 'articles': []}
 
-def run_scheduler():
-    """Run the scheduler in a separate thread"""
-    # Update news immediately on startup
-    update_news_data()
+def build_category_index(articles):
+    """
+    Map every category to the positions of its articles in the feed, in feed order
+    
+    Built once when the feed is written, so a filtered /news page is a slice
+    of one of these lists instead of a scan over every article.
+    """
+    index = {category: [] for category in CATEGORIES}
+    for position, article in enumerate(articles):
+        for category in article.get('categories', []):
+            if category in index:
+                index[category].append(position)
+    return index
+
+def news_search_terms(query):
+    """Split search text into the lowercase terms every matching article must contain"""
+    return (query or '').casefold().split()
+
+def article_matches_terms(article, terms):
+    """Whether every term occurs in the article's title or description"""
+    text = f"{article.get('title') or ''} {article.get('description') or ''}".casefold()
+    return all(term in text for term in terms)
+
+def news_page(news_data, category=None, page=1, page_size=NEWS_PAGE_SIZE, query=None):
+    """
+    Slice one page of the feed, optionally restricted to a category and a search
+    
+    The search runs over the whole feed before it is paged, so every match is
+    reachable through the page links; without one a page is a slice of the
+    category index. The feed holds at most NEWS_MAX_ARTICLES articles, so
+    scanning it for a search stays cheap.
+    
+    Args:
+        news_data: News data from the snapshot, with its category_index
+        category: Category to show, or None for all articles
+        page: 1-based page number; out of range pages are clamped
+        page_size: Articles per page
+        query: Search text; articles must contain each of its words in their
+            title or description
+    
+    Returns:
+        Dictionary with the page's articles, the page number, page count,
+        total matching articles and the article count of every category
+        (counting search matches only when searching)
+    """
+    articles = news_data.get('articles', [])
+    index = news_data.get('category_index') or build_category_index(articles)
+    positions = index.get(category) if category else None
+    
+    terms = news_search_terms(query)
+    if terms:
+        matches = {position for position, article in enumerate(articles) if article_matches_terms(article, terms)}
+        positions = [position for position in (positions if positions is not None else range(len(articles)))
+                     if position in matches]
+        category_counts = {name: sum(position in matches for position in entries) for name, entries in index.items()}
+    else:
+        category_counts = {name: len(entries) for name, entries in index.items()}
+    
+    total = len(positions) if positions is not None else len(articles)
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, page), pages)
+    start = (page - 1) * page_size
     
-    # Schedule regular updates every hour
-    schedule.every(1).hour.do(update_news_data)
+    if positions is None:
+        page_articles = articles[start:start + page_size]
+    else:
+        page_articles = [articles[position] for position in positions[start:start + page_size]]
+    
+    return {
+        'articles': page_articles,
+        'page': page,
+        'pages': pages,
+        'total': total,
+        'category_counts': category_counts
+    }
+
+class NewsSnapshot:
+    """
+    Parsed news data kept in memory and reloaded only when the data file changes
+    
+    The file is stat()ed at most once every check_interval seconds and read
+    again only when its inode, mtime or size differs from the loaded copy, so
+    most requests touch neither the disk nor the JSON parser. The returned
+    data is shared between requests and must not be modified.
+    """
+    
+    def __init__(self, path, check_interval=NEWS_SNAPSHOT_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.data = None
+        self.signature = None
+        self.checked_at = 0
+    
+    def _signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    
+    def get(self):
+        """Return the current news data"""
+        if self.data is not None and time.monotonic() - self.checked_at < self.check_interval:
+            return self.data
+        
+        with self.lock:
+            if self.data is not None and time.monotonic() - self.checked_at < self.check_interval:
+                return self.data
+            
+            signature = self._signature()
+            if self.data is None or signature != self.signature:
+                if signature is None:
+                    logger.warning(f"News data file not found at {self.path}")
+                    self.data = {'last_updated': None, 'articles': []}
+                else:
+                    try:
+                        with open(self.path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                        # Files written before the index existed get it built once here
+                        if 'category_index' not in data:
+                            data['category_index'] = build_category_index(data.get('articles', []))
+                        self.data = data
+                    except Exception as e:
+                        # Keep serving the previous snapshot if there is one
+                        logger.error(f"Error loading news data: {str(e)}")
+                        if self.data is None:
+                            self.data = {'last_updated': None, 'articles': []}
+                self.signature = signature
+            
+            self.checked_at = time.monotonic()
+            return self.data
+    
+    def replace(self, data):
+        """Install data this process has just written to the file, without reading it back"""
+        with self.lock:
+            self.data = data
+            self.signature = self._signature()
+            self.checked_at = time.monotonic()
+
+news_snapshot = NewsSnapshot(NEWS_DATA_FILE)
+
+def _pid_alive(pid):
+    """Check whether a process on this host is still running"""
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, TypeError, ValueError, OSError):
+        # Exists but belongs to someone else, or cannot be checked: rely on the expiry
+        return True
+    return True
+
+class LeaderLease:
+    """
+    File-based lease electing the one process on a node that refreshes the news
+    
+    The lease file records the owner, its host and PID, when the lease expires
+    and when the news was last refreshed. It is only read and rewritten while
+    holding an exclusive flock on a sibling .lock file, so two processes can
+    never both take it. The holder renews it on every check; anyone else may
+    take it over once it has expired, or straight away when its owner is a
+    process on this host that no longer exists.
+    """
+    
+    def __init__(self, path, ttl=NEWS_LEASE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.host = socket.gethostname()
+        self.owner = f"{self.host}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+    
+    @contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+    
+    def _is_stale(self, lease, now):
+        if lease.get('expires_at', 0) < now:
+            return True
+        # A leader on this host that has exited can be replaced without waiting for expiry
+        return lease.get('host') == self.host and not _pid_alive(lease.get('pid'))
+    
+    def acquire(self):
+        """
+        Take the lease if it is free or stale, or renew it if this process holds it
+        
+        Returns:
+            True if this process is the leader until the lease's new expiry
+        """
+        now = time.time()
+        with self._locked():
+            lease = self._read()
+            if lease and lease.get('owner') != self.owner:
+                if not self._is_stale(lease, now):
+                    if self.is_leader:
+                        logger.warning(f"Lost the news updater lease to {lease.get('owner')}")
+                    self.is_leader = False
+                    return False
+                logger.warning(f"Taking over stale news updater lease from {lease.get('owner')}")
+            
+            lease.update({'owner': self.owner, 'host': self.host, 'pid': os.getpid(), 'expires_at': now + self.ttl})
+            write_json_atomic(self.path, lease)
+        
+        if not self.is_leader:
+            logger.info(f"Process {os.getpid()} is now the news updater leader")
+        self.is_leader = True
+        return True
+    
+    def refresh_due(self, interval=NEWS_UPDATE_INTERVAL):
+        """Whether the last refresh, by any leader, is at least interval seconds old"""
+        return time.time() - self._read().get('last_refresh', 0) >= interval
+    
+    def mark_refreshed(self):
+        """Record a completed refresh, if this process still holds the lease"""
+        with self._locked():
+            lease = self._read()
+            if lease.get('owner') == self.owner:
+                lease['last_refresh'] = time.time()
+                write_json_atomic(self.path, lease)
+    
+    def release(self):
+        """Give up the lease so another process can take over without waiting"""
+        with self._locked():
+            if self._read().get('owner') == self.owner:
+                os.remove(self.path)
+        self.is_leader = False
+
+def run_scheduler(lease=None):
+    """
+    Run the scheduler in a separate thread
+    
+    Every process runs this loop, but only the lease holder fetches news; the
+    others keep serving the data file it writes and take over if it stops
+    renewing the lease.
+    """
+    lease = lease or LeaderLease(NEWS_LEASE_FILE)
     
     while True:
-        schedule.run_pending()
-        time.sleep(60)
+        try:
+            if lease.acquire() and lease.refresh_due():
+                update_news_data()
+                lease.mark_refreshed()
+        except Exception as e:
+            logger.error(f"Error in news updater: {str(e)}")
+        time.sleep(NEWS_LEASE_CHECK_INTERVAL)
+
+_updater_thread = None
+_updater_lock = threading.Lock()
 
 def start_news_updater():
-    """Start the news updater in a background thread"""
-    thread = threading.Thread(target=run_scheduler, daemon=True)
-    thread.start()
+    """Start the news updater in a background thread (once per process)"""
+    global _updater_thread
+    with _updater_lock:
+        if _updater_thread is not None and _updater_thread.is_alive():
+            return _updater_thread
+        _updater_thread = threading.Thread(target=run_scheduler, name="news-updater", daemon=True)
+        _updater_thread.start()
     logger.info("News updater started in background thread")
-    return thread
+    return _updater_thread
 
 if __name__ == "__main__":
     # When run directly, update the news once
@@ -0,0 +1,58 @@
+# pagination.py
+# Keyset pagination helpers for Supabase (PostgREST) queries
+
+import base64
+import json
+
+
+def encode_keyset_cursor(row, columns):
+    """Build an opaque keyset cursor from the sort columns of a raw row"""
+    values = [row.get(column) for column in columns]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_keyset_cursor(cursor, columns):
+    """
+    Decode a keyset cursor produced by encode_keyset_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the columns
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _quote_filter_value(value):
+    # PostgREST accepts double-quoted values containing reserved characters
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def apply_keyset(query, columns, values):
+    """
+    Restrict a query sorted descending on columns to rows after the cursor values
+
+    The row comparison (a, b, c) < (x, y, z) is expanded into the PostgREST
+    filter a < x OR (a = x AND b < y) OR (a = x AND b = y AND c < z).
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        parts = [f"{columns[j]}.eq.{_quote_filter_value(values[j])}" for j in range(i)]
+        parts.append(f"{column}.lt.{_quote_filter_value(values[i])}")
+        clauses.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+
+    # postgrest-py 0.10 has no or_() helper, so add the query parameter directly
+    query.params = query.params.add("or", f"({','.join(clauses)})")
+    return query
+
+
+def order_descending(query, columns):
+    """Sort a query descending on several columns with a single order parameter"""
+    # A single order parameter keeps the tie-breaking columns in one clause
+    query.params = query.params.add("order", ",".join(f"{column}.desc" for column in columns))
+    return query
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Script to recompute the ReviewAggregates table from the Reviews table.
+Run this after deploying setup_reviews_tables.sql, or whenever the incremental
+aggregates are suspected to have drifted from the reviews.
+"""
+
+import argparse
+import datetime
+import os
+
+from dotenv import load_dotenv
+
+from reviews import rebuild_review_aggregates, summarize_aggregate, AGGREGATE_REBUILD_BATCH_SIZE
+from supabase_client import create_client
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Rebuild CareerMate review aggregates')
+    parser.add_argument('--batch-size', type=int, default=AGGREGATE_REBUILD_BATCH_SIZE, help='Reviews read per request')
+    args = parser.parse_args()
+
+    # Load Supabase credentials from the .env file
+    load_dotenv()
+    client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+    start_time = datetime.datetime.now()
+    print(f"Rebuilding review aggregates at {start_time.strftime('%Y-%m-%d %H:%M:%S')}...")
+
+    aggregates = rebuild_review_aggregates(client, batch_size=args.batch_size)
+
+    for degree_path, aggregate in sorted(aggregates.items()):
+        summary = summarize_aggregate(aggregate)
+        print(f"{degree_path}: {summary['count']} reviews, average {summary['average']}, {summary['total_likes']} likes")
+
+    time_taken = (datetime.datetime.now() - start_time).total_seconds()
+    print(f"\nRebuilt {len(aggregates)} aggregates in {time_taken:.2f} seconds")
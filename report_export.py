@@ -0,0 +1,220 @@
+# report_export.py
+# Bulk export of career test reports for institutions
+
+import datetime
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+
+from career_test import render_report, load_json_column
+
+# Export settings, overridable from the environment
+REPORT_EXPORT_BATCH_SIZE = int(os.getenv("REPORT_EXPORT_BATCH_SIZE", 200))
+REPORT_EXPORT_PROCESSES = int(os.getenv("REPORT_EXPORT_PROCESSES", os.cpu_count() or 1))
+
+# User IDs sent per results query; each UUID adds ~40 bytes to the request URL,
+# so a whole cohort in one in_() filter would exceed PostgREST and proxy limits
+REPORT_EXPORT_USER_CHUNK_SIZE = 200
+
+# Columns read for each exported result
+EXPORT_COLUMNS = "id, user_id, results, personality_insights, plan_type, created_at"
+
+
+def parse_export_range(start=None, end=None):
+    """
+    Validate an export date range given as YYYY-MM-DD strings
+
+    Args:
+        start: Optional first day, inclusive
+        end: Optional day the range stops before
+
+    Returns:
+        Tuple of (start, end) as ISO date strings or None
+
+    Raises:
+        ValueError: If a date is malformed or the range is empty
+    """
+    days = []
+    for label, value in (("start", start), ("end", end)):
+        if not value:
+            days.append(None)
+            continue
+        try:
+            days.append(datetime.datetime.strptime(value, "%Y-%m-%d").date())
+        except ValueError:
+            raise ValueError(f"Invalid {label} date '{value}', expected YYYY-MM-DD")
+
+    if days[0] and days[1] and days[1] <= days[0]:
+        raise ValueError("The end date must be after the start date")
+    return tuple(day.isoformat() if day else None for day in days)
+
+
+def iter_career_test_results(client, columns, batch_size, user_ids=None, start=None, end=None,
+                             user_chunk_size=REPORT_EXPORT_USER_CHUNK_SIZE):
+    """
+    Yield CareerTestResults rows page by page, using keyset pagination on id
+
+    A cohort of user IDs is split into chunks of user_chunk_size, and each
+    chunk is paged through on its own, so no request carries more than one
+    chunk of IDs.
+
+    Args:
+        client: Supabase client
+        columns: Columns to select
+        batch_size: Rows read per request
+        user_ids: Optional list of user IDs to restrict the rows to
+        start: Optional ISO timestamp; only results created at or after it are read
+        end: Optional ISO timestamp; only results created before it are read
+        user_chunk_size: User IDs sent per request
+
+    Yields:
+        Lists of result rows, one list per page
+    """
+    if not user_ids:
+        yield from _iter_result_pages(client, columns, batch_size, None, start, end)
+        return
+
+    user_ids = sorted(set(user_ids))
+    for offset in range(0, len(user_ids), user_chunk_size):
+        yield from _iter_result_pages(client, columns, batch_size, user_ids[offset:offset + user_chunk_size], start, end)
+
+
+def _iter_result_pages(client, columns, batch_size, user_ids, start, end):
+    last_id = None
+    while True:
+        query = client.table("CareerTestResults").select(columns).order("id").limit(batch_size)
+        if user_ids:
+            query = query.in_("user_id", user_ids)
+        if start:
+            query = query.gte("created_at", start)
+        if end:
+            query = query.lt("created_at", end)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.execute().data or []
+
+        if rows:
+            yield rows
+
+        if len(rows) < batch_size:
+            break
+        last_id = rows[-1]["id"]
+
+
+def fetch_report_users(client, user_ids):
+    """
+    Look up the name and email printed on each user's reports with a single query
+
+    Args:
+        client: Supabase client
+        user_ids: Iterable of user IDs
+
+    Returns:
+        Dictionary mapping user ID to report user data
+    """
+    user_ids = sorted({user_id for user_id in user_ids if user_id})
+    if not user_ids:
+        return {}
+
+    response = client.table("Users").select("id, username, email").in_("id", user_ids).execute()
+    return {
+        row["id"]: {"user_id": row["id"], "username": row.get("username") or "User", "email": row.get("email") or ""}
+        for row in (response.data or [])
+    }
+
+
+def _safe_name(value):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(value)).strip("_") or "user"
+
+
+def render_export_report(item):
+    """
+    Render one exported report; runs in a worker process
+
+    Args:
+        item: Tuple of (result row, report user data)
+
+    Returns:
+        Tuple of (archive member name, report bytes)
+    """
+    row, user_data = item
+    results = load_json_column(row.get("results"), [])
+    personality_insights = load_json_column(row.get("personality_insights"), [])
+
+    created = str(row.get("created_at") or "")[:10] or "undated"
+    name = f"{_safe_name(user_data.get('username'))}_{row['user_id']}/career_report_{created}_{row['id']}.txt"
+    content = "".join(render_report(user_data, results, personality_insights))
+    return name, content.encode("utf-8")
+
+
+class _ZipStream:
+    """Write-only file object that hands zipfile's output back to the caller in chunks"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_report_zip(client, user_ids=None, start=None, end=None,
+                      processes=REPORT_EXPORT_PROCESSES, batch_size=REPORT_EXPORT_BATCH_SIZE):
+    """
+    Render the reports for a cohort and stream them out as one zip archive
+
+    Results are read one page at a time, each page is rendered across a pool
+    of worker processes, and every report is compressed into the archive and
+    yielded before the next page is read. Report contents are never held
+    beyond their page; the only state that grows with the export is zipfile's
+    central directory entry (a few hundred bytes) per report.
+
+    Workers are started with "spawn", since forking a web worker would copy
+    locks held by its background threads (news updater, report jobs).
+
+    Args:
+        client: Supabase client
+        user_ids: Optional list of user IDs to export
+        start: Optional ISO timestamp; only results created at or after it are exported
+        end: Optional ISO timestamp; only results created before it are exported
+        processes: Worker processes rendering reports (1 renders in this process)
+        batch_size: Results read and rendered per page
+
+    Yields:
+        Chunks of the zip archive as bytes
+    """
+    stream = _ZipStream()
+    exported_at = time.localtime()[:6]
+    pool = multiprocessing.get_context("spawn").Pool(processes) if processes > 1 else None
+    try:
+        with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for rows in iter_career_test_results(client, EXPORT_COLUMNS, batch_size, user_ids, start, end):
+                users = fetch_report_users(client, (row["user_id"] for row in rows))
+                items = [
+                    (row, users.get(row["user_id"], {"user_id": row["user_id"], "username": "User", "email": ""}))
+                    for row in rows
+                ]
+
+                rendered = pool.imap(render_export_report, items, chunksize=8) if pool else map(render_export_report, items)
+                for name, content in rendered:
+                    member = zipfile.ZipInfo(name, date_time=exported_at)
+                    member.compress_type = zipfile.ZIP_DEFLATED
+                    archive.writestr(member, content)
+                    yield stream.drain()
+
+        # Closing the archive writes the central directory
+        yield stream.drain()
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
@@ -0,0 +1,370 @@
+# report_jobs.py
+# Background generation of career test reports for CareerMate
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from career_test import generate_pdf_report, REPORTS_DIR
+
+# Report queue settings, overridable from the environment
+REPORT_JOBS_DB = os.getenv("REPORT_JOBS_DB", os.path.join(os.path.dirname(__file__), "report_jobs.db"))
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", 2))
+REPORT_JOB_TIMEOUT = float(os.getenv("REPORT_JOB_TIMEOUT", 300))
+REPORT_JOB_RETENTION = float(os.getenv("REPORT_JOB_RETENTION", 24 * 60 * 60))
+
+# Limits on the cached report files, enforced by sweep_reports()
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+REPORT_CACHE_MAX_AGE = float(os.getenv("REPORT_CACHE_MAX_AGE", 7 * 24 * 60 * 60))
+REPORT_SWEEP_INTERVAL = float(os.getenv("REPORT_SWEEP_INTERVAL", 10 * 60))
+
+# How uncached report downloads are delivered: "queue" renders them to disk in the
+# background, "stream" renders them straight into the response without touching disk
+REPORT_DELIVERY_MODE = os.getenv("REPORT_DELIVERY_MODE", "queue")
+
+# Seconds an idle worker waits before checking the spool for jobs queued by other processes
+REPORT_POLL_INTERVAL = 1.0
+
+# Job states; queued and running jobs are "active" and absorb duplicate requests
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_jobs (
+    job_id TEXT PRIMARY KEY,
+    result_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT,
+    report_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_report_jobs_active_result
+    ON report_jobs (result_id) WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_report_jobs_status_created
+    ON report_jobs (status, created_at);
+"""
+
+
+def render_report_payload(payload):
+    """Render a queued report payload through generate_pdf_report"""
+    return generate_pdf_report(
+        payload["user_data"],
+        payload["results"],
+        payload["personality_insights"],
+        report_key=payload.get("report_key")
+    )
+
+
+def sweep_reports(directory=REPORTS_DIR, max_bytes=REPORT_CACHE_MAX_BYTES, max_age=REPORT_CACHE_MAX_AGE):
+    """
+    Keep the report directory bounded by age and total size
+
+    Reports older than max_age are deleted first. If the remaining reports
+    still exceed max_bytes, the oldest are deleted until they fit. Deleted
+    reports are simply rendered again on their next download.
+
+    Args:
+        directory: Directory holding generated reports
+        max_bytes: Total size allowed for the directory
+        max_age: Seconds a report is kept after it was generated
+
+    Returns:
+        Number of files deleted
+    """
+    now = time.time()
+    reports = []
+    deleted = 0
+
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return 0
+
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if not entry.is_file():
+            continue
+        # Temporary files belong to a report being written, unless they were abandoned long ago
+        if entry.name.endswith(".tmp") and now - stat.st_mtime < REPORT_JOB_TIMEOUT:
+            continue
+        if now - stat.st_mtime > max_age or entry.name.endswith(".tmp"):
+            deleted += _remove_report(entry.path)
+        else:
+            reports.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_bytes = sum(size for _, size, _ in reports)
+    if total_bytes > max_bytes:
+        for _, size, path in sorted(reports):
+            if total_bytes <= max_bytes:
+                break
+            deleted += _remove_report(path)
+            total_bytes -= size
+
+    return deleted
+
+
+def _remove_report(path):
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0
+
+
+class ReportJobQueue:
+    """
+    Report generation queue spooled to a local SQLite database
+
+    Jobs are written to SQLite, so every gunicorn worker on the machine shares
+    one queue, and jobs survive a worker restart. Each process that enqueues a
+    job starts a small pool of worker threads that claim queued jobs one at a
+    time inside an immediate transaction, so a job is only ever claimed once.
+    While a job renders, its worker renews the claim every third of the
+    timeout, so only a job whose worker died stops being renewed and is put
+    back in the queue once the timeout passes.
+
+    At most one queued or running job exists per result_id. A request for a
+    result that already has an active job gets that job back instead of a new one.
+    """
+
+    def __init__(self, db_path=REPORT_JOBS_DB, workers=REPORT_WORKERS, render=render_report_payload,
+                 timeout=REPORT_JOB_TIMEOUT, retention=REPORT_JOB_RETENTION):
+        self.db_path = db_path
+        self.workers = workers
+        self.render = render
+        self.timeout = timeout
+        self.retention = retention
+        self._threads = []
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+        self._initialized = False
+        self._last_sweep = 0
+
+    def enqueue(self, result_id, user_id, user_data, results, personality_insights, report_key=None):
+        """
+        Queue a report for a test result, or return the job already working on it
+
+        Args:
+            result_id: ID of the CareerTestResults row the report is for
+            user_id: ID of the user who owns the result
+            user_data: Dictionary with user information (username, email, etc.)
+            results: Career match results
+            personality_insights: Personality insights from the test
+            report_key: Optional report_cache_key() the report file is named after
+
+        Returns:
+            Job dictionary (see get())
+        """
+        self.start()
+
+        now = time.time()
+        job_id = str(uuid.uuid4())
+        payload = json.dumps({
+            "user_data": user_data,
+            "results": results,
+            "personality_insights": personality_insights,
+            "report_key": report_key
+        })
+
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            existing = connection.execute(
+                "SELECT * FROM report_jobs WHERE result_id = ? AND status IN (?, ?)",
+                (result_id, JOB_QUEUED, JOB_RUNNING)
+            ).fetchone()
+            if existing is not None:
+                return self._job(existing)
+
+            connection.execute(
+                "INSERT INTO report_jobs (job_id, result_id, user_id, status, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, result_id, user_id, JOB_QUEUED, payload, now, now)
+            )
+
+        with self._wakeup:
+            self._wakeup.notify()
+
+        return self.get(job_id)
+
+    def get(self, job_id):
+        """
+        Look up a job
+
+        Args:
+            job_id: ID returned by enqueue()
+
+        Returns:
+            Dictionary with job_id, result_id, user_id, status, report_path and
+            error, or None if the job does not exist
+        """
+        row = self._connection().execute("SELECT * FROM report_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._job(row) if row is not None else None
+
+    def start(self):
+        """Start the worker threads for this process, if they are not running yet"""
+        with self._start_lock:
+            if self._threads:
+                return
+            self._stopping = False
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"report-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        """Stop the worker threads after their current job"""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def run_pending(self):
+        """Process queued jobs on the calling thread until the queue is empty; returns the number processed"""
+        processed = 0
+        while self._run_next():
+            processed += 1
+        return processed
+
+    def _work(self):
+        while not self._stopping:
+            try:
+                worked = self._run_next()
+            except Exception as e:
+                print(f"Error processing report job: {str(e)}")
+                worked = False
+
+            if not worked:
+                self._maybe_sweep()
+
+                # Sleep until a job is queued in this process, or poll for jobs queued by others
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(REPORT_POLL_INTERVAL)
+
+    def _maybe_sweep(self):
+        with self._start_lock:
+            if time.time() - self._last_sweep < REPORT_SWEEP_INTERVAL:
+                return
+            self._last_sweep = time.time()
+        try:
+            sweep_reports()
+        except Exception as e:
+            print(f"Error sweeping cached reports: {str(e)}")
+
+    def _run_next(self):
+        job = self._claim()
+        if job is None:
+            return False
+
+        rendered = threading.Event()
+        heartbeat = threading.Thread(target=self._renew_claim, args=(job["job_id"], rendered),
+                                     name=f"report-heartbeat-{job['job_id']}", daemon=True)
+        heartbeat.start()
+        try:
+            report_path = self.render(json.loads(job["payload"]))
+            if report_path:
+                self._finish(job["job_id"], JOB_DONE, report_path=report_path)
+            else:
+                self._finish(job["job_id"], JOB_FAILED, error="Report generation returned no file")
+        except Exception as e:
+            print(f"Error generating report for job {job['job_id']}: {str(e)}")
+            self._finish(job["job_id"], JOB_FAILED, error=str(e))
+        finally:
+            rendered.set()
+            heartbeat.join()
+        return True
+
+    def _renew_claim(self, job_id, rendered):
+        # Touch the running job well before the timeout, so a slow render is not handed to another worker
+        while not rendered.wait(self.timeout / 3):
+            try:
+                connection = self._connection()
+                with connection:
+                    connection.execute(
+                        "UPDATE report_jobs SET updated_at = ? WHERE job_id = ? AND status = ?",
+                        (time.time(), job_id, JOB_RUNNING)
+                    )
+            except Exception as e:
+                print(f"Error renewing report job {job_id}: {str(e)}")
+
+    def _claim(self):
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+
+            # Requeue jobs whose worker died, and forget finished jobs past retention
+            connection.execute(
+                "UPDATE report_jobs SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (JOB_QUEUED, now, JOB_RUNNING, now - self.timeout)
+            )
+            connection.execute(
+                "DELETE FROM report_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JOB_DONE, JOB_FAILED, now - self.retention)
+            )
+
+            row = connection.execute(
+                "SELECT * FROM report_jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (JOB_QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            connection.execute(
+                "UPDATE report_jobs SET status = ?, updated_at = ? WHERE job_id = ?",
+                (JOB_RUNNING, now, row["job_id"])
+            )
+            return dict(row)
+
+    def _finish(self, job_id, status, report_path=None, error=None):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "UPDATE report_jobs SET status = ?, report_path = ?, error = ?, payload = NULL, updated_at = ? WHERE job_id = ?",
+                (status, report_path, error, time.time(), job_id)
+            )
+
+    def _connection(self):
+        # SQLite connections cannot be shared between threads, so keep one per thread
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            if not self._initialized:
+                connection.executescript(SCHEMA)
+                self._initialized = True
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _job(row):
+        return {
+            "job_id": row["job_id"],
+            "result_id": row["result_id"],
+            "user_id": row["user_id"],
+            "status": row["status"],
+            "report_path": row["report_path"],
+            "error": row["error"]
+        }
+
+
+# Shared queue used by the report download routes
+report_queue = ReportJobQueue()
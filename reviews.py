@@ -0,0 +1,528 @@
+# reviews.py
+# Review loading and hydration for CareerMate degree pages
+
+import datetime
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from pagination import encode_keyset_cursor, decode_keyset_cursor, apply_keyset, order_descending
+
+# Review cache limits, overridable from the environment. The cache lives in
+# one process and writes only invalidate the process that handled them, so it
+# is turned off when gunicorn is told to run several workers (WEB_CONCURRENCY)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+REVIEW_CACHE_TTL = float(os.getenv("REVIEW_CACHE_TTL", 300)) if WEB_CONCURRENCY <= 1 else 0
+REVIEW_CACHE_MAX_ENTRIES = int(os.getenv("REVIEW_CACHE_MAX_ENTRIES", 256))
+REVIEW_CACHE_MAX_BYTES = int(os.getenv("REVIEW_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
+# Number of reviews embedded in a degree page and returned per API page
+REVIEW_PAGE_SIZE = 20
+MAX_REVIEW_PAGE_SIZE = 100
+
+# Keyset orderings for review listings; every column is sorted descending
+REVIEW_SORTS = {
+    "recent": ("created_at", "review_id"),
+    "likes": ("likes", "created_at", "review_id")
+}
+DEFAULT_REVIEW_SORT = "recent"
+
+# Rows read per request when rebuilding ReviewAggregates
+AGGREGATE_REBUILD_BATCH_SIZE = 1000
+
+
+class ReviewCache:
+    """
+    In-process TTL + LRU cache of per-degree-path review views
+
+    Entries are keyed by (degree_path, view), where the view is a sort name
+    for the first review page or "summary" for the rating aggregate. Review
+    pages hold reviews with author usernames attached but without the
+    per-user like state, so one entry serves every visitor of a degree page. The cache is bounded both by entry
+    count and by an estimate of the serialized size of the cached pages.
+
+    Each degree path has a generation that invalidate() bumps. A reader takes
+    the generation before querying and passes it to put(), so a page read
+    before a concurrent write is never stored after that write invalidated
+    the path.
+
+    Invalidation only reaches this process: the app must run as a single
+    worker (the Procfile's gunicorn default), and a ttl of 0 disables the
+    cache, which is what REVIEW_CACHE_TTL defaults to under WEB_CONCURRENCY > 1.
+    """
+
+    def __init__(self, ttl=REVIEW_CACHE_TTL, max_entries=REVIEW_CACHE_MAX_ENTRIES, max_bytes=REVIEW_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (degree_path, view) -> (expires_at, size, page)
+        self._path_keys = {}  # degree_path -> set of keys, for invalidation
+        self._review_keys = {}  # review_id -> set of keys, for patching likes
+        self._generations = {}  # degree_path -> invalidation count
+        self._epoch = 0  # bumped by clear()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, degree_path, view=DEFAULT_REVIEW_SORT):
+        """Return the cached view for a degree path, or None on a miss"""
+        key = (degree_path, view)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def generation(self, degree_path):
+        """Return the invalidation generation to pass to put() for a read starting now"""
+        with self._lock:
+            return self._epoch, self._generations.get(degree_path, 0)
+
+    def put(self, degree_path, page, view=DEFAULT_REVIEW_SORT, generation=None):
+        """
+        Store a view for a degree path, evicting least recently used entries
+
+        Args:
+            degree_path: Degree path the view belongs to
+            page: View to cache
+            view: Sort name or "summary"
+            generation: Value of generation() taken before the view was read;
+                the view is not stored if the path was invalidated since
+        """
+        if self.ttl <= 0:
+            return
+        size = len(json.dumps(page, default=str))
+        if size > self.max_bytes:
+            return
+
+        key = (degree_path, view)
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(degree_path, 0)):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, page)
+            self._bytes += size
+            self._path_keys.setdefault(degree_path, set()).add(key)
+            for review in page.get("reviews", ()):
+                self._review_keys.setdefault(review["review_id"], set()).add(key)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, degree_path):
+        """Drop every cached view for a degree path"""
+        with self._lock:
+            self._generations[degree_path] = self._generations.get(degree_path, 0) + 1
+            for key in list(self._path_keys.get(degree_path, ())):
+                self._remove(key)
+
+    def patch_review(self, review_id, **fields):
+        """Update fields of a cached review in place, e.g. its like count"""
+        patched = False
+        with self._lock:
+            for key in self._review_keys.get(review_id, ()):
+                # A page read before this change must not be stored over the patched one
+                self._generations[key[0]] = self._generations.get(key[0], 0) + 1
+                for review in self._entries[key][2]["reviews"]:
+                    if review["review_id"] == review_id:
+                        review.update(fields)
+                        patched = True
+        return patched
+
+    def stats(self):
+        """Return hit, miss and eviction counters along with the current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._path_keys.clear()
+            self._review_keys.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        # Caller must hold the lock
+        _, size, page = self._entries.pop(key)
+        self._bytes -= size
+        self._discard(self._path_keys, key[0], key)
+        for review in page.get("reviews", ()):
+            self._discard(self._review_keys, review["review_id"], key)
+
+    @staticmethod
+    def _discard(index, name, key):
+        keys = index.get(name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[name]
+
+
+# Shared cache used by the degree pages and the review write paths
+review_cache = ReviewCache()
+
+
+def parse_review_timestamp(value):
+    """Convert a timestamp string returned by Supabase into a datetime object"""
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value
+
+
+def fetch_usernames(client, user_ids):
+    """
+    Look up usernames for a set of user IDs with a single query
+
+    Args:
+        client: Supabase client
+        user_ids: Iterable of user IDs
+
+    Returns:
+        Dictionary mapping user ID to username
+    """
+    user_ids = sorted({user_id for user_id in user_ids if user_id})
+    if not user_ids:
+        return {}
+
+    response = client.table("Users").select("id, username").in_("id", user_ids).execute()
+    return {row["id"]: row.get("username") for row in (response.data or [])}
+
+
+def fetch_liked_review_ids(client, user_id, review_ids):
+    """
+    Find which of the given reviews the user has liked, with a single query
+
+    Args:
+        client: Supabase client
+        user_id: ID of the current user (None for anonymous visitors)
+        review_ids: Iterable of review IDs
+
+    Returns:
+        Set of review IDs liked by the user
+    """
+    review_ids = list(review_ids)
+    if not user_id or not review_ids:
+        return set()
+
+    response = client.table("ReviewLikes").select("review_id").filter("user_id", "eq", user_id).in_("review_id", review_ids).execute()
+    return {row["review_id"] for row in (response.data or [])}
+
+
+def attach_usernames(client, rows):
+    """
+    Attach author usernames to review rows with a single Users query
+
+    Args:
+        client: Supabase client
+        rows: Review rows as returned from the Reviews table
+
+    Returns:
+        List of review dictionaries with username and parsed created_at
+    """
+    if not rows:
+        return []
+
+    usernames = fetch_usernames(client, (review["user_id"] for review in rows))
+
+    reviews = []
+    for review in rows:
+        reviews.append({
+            **review,
+            "username": usernames.get(review["user_id"]) or "Anonymous",
+            "created_at": parse_review_timestamp(review["created_at"])
+        })
+
+    return reviews
+
+
+def mark_liked_reviews(client, reviews, user_id=None):
+    """
+    Return per-request copies of reviews with the current user's like state
+
+    Args:
+        client: Supabase client
+        reviews: Review dictionaries, possibly shared through the cache
+        user_id: ID of the current user
+
+    Returns:
+        New list of review dictionaries with user_liked set
+    """
+    liked_ids = fetch_liked_review_ids(client, user_id, (review["review_id"] for review in reviews))
+    return [{**review, "user_liked": review["review_id"] in liked_ids} for review in reviews]
+
+
+def encode_review_cursor(row, sort=DEFAULT_REVIEW_SORT):
+    """Build an opaque keyset cursor from the sort columns of a raw review row"""
+    return encode_keyset_cursor(row, REVIEW_SORTS[sort])
+
+
+def decode_review_cursor(cursor, sort=DEFAULT_REVIEW_SORT):
+    """
+    Decode a keyset cursor produced by encode_review_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the sort
+    """
+    return decode_keyset_cursor(cursor, REVIEW_SORTS[sort])
+
+
+def apply_review_keyset(query, sort, values):
+    """Restrict a descending review query to rows after the cursor values"""
+    return apply_keyset(query, REVIEW_SORTS[sort], values)
+
+
+def fetch_review_page(client, degree_path, user_id=None, sort=DEFAULT_REVIEW_SORT, cursor=None, limit=REVIEW_PAGE_SIZE, cache=None):
+    """
+    Load one keyset-paginated page of reviews for a degree path
+
+    Costs three round trips on a cache miss and a single ReviewLikes query for
+    the current user on a cache hit. Only the first page at the default page
+    size is cached, since that is what every degree page view embeds.
+
+    Args:
+        client: Supabase client
+        degree_path: Degree path such as "graduates/mba"
+        user_id: ID of the current user
+        sort: Key of REVIEW_SORTS, "recent" or "likes"
+        cursor: Cursor returned with the previous page, or None for the first page
+        limit: Number of reviews per page
+        cache: Optional ReviewCache holding first pages by degree path
+
+    Returns:
+        Tuple of (hydrated review dictionaries, cursor for the next page or None)
+
+    Raises:
+        ValueError: If the sort or cursor is invalid
+    """
+    if sort not in REVIEW_SORTS:
+        raise ValueError(f"Unknown sort '{sort}'")
+
+    cacheable = cache is not None and cursor is None and limit == REVIEW_PAGE_SIZE
+    page = cache.get(degree_path, sort) if cacheable else None
+
+    if page is None:
+        generation = cache.generation(degree_path) if cacheable else None
+        query = client.table("Reviews").select("*").filter("degree_path", "eq", degree_path)
+        if cursor:
+            apply_review_keyset(query, sort, decode_review_cursor(cursor, sort))
+        order_descending(query, REVIEW_SORTS[sort])
+
+        # Fetch one extra row to find out whether another page exists
+        rows = query.limit(limit + 1).execute().data or []
+        next_cursor = encode_review_cursor(rows[limit - 1], sort) if len(rows) > limit else None
+
+        page = {"reviews": attach_usernames(client, rows[:limit]), "next_cursor": next_cursor}
+        if cacheable:
+            cache.put(degree_path, page, sort, generation)
+
+    return mark_liked_reviews(client, page["reviews"], user_id), page["next_cursor"]
+
+
+def serialize_review(review, user_id=None):
+    """Convert a hydrated review into a JSON-friendly dictionary for the reviews API"""
+    created_at = review["created_at"]
+    return {
+        "review_id": review["review_id"],
+        "username": review["username"],
+        "current_status": review.get("current_status"),
+        "rating": review.get("rating"),
+        "review_text": review.get("review_text"),
+        "pros": review.get("pros"),
+        "cons": review.get("cons"),
+        "likes": review.get("likes", 0),
+        "user_liked": review.get("user_liked", False),
+        "is_owner": bool(user_id) and review.get("user_id") == user_id,
+        "created_at": created_at.isoformat() if isinstance(created_at, datetime.datetime) else created_at,
+        "created_at_display": created_at.strftime('%B %d, %Y') if isinstance(created_at, datetime.datetime) else created_at
+    }
+
+
+def toggle_review_like(client, review_id, user_id):
+    """
+    Like or unlike a review in a single round trip
+
+    Calls the toggle_review_like database function (see setup_reviews_tables.sql),
+    which changes the ReviewLikes row and the Reviews.likes counter in one
+    transaction, so concurrent clicks never lose an update.
+
+    Args:
+        client: Supabase client
+        review_id: ID of the review to toggle
+        user_id: ID of the current user
+
+    Returns:
+        Dictionary with the new "liked" state and "likes" count, or None if the review does not exist
+    """
+    response = client.rpc("toggle_review_like", {"p_review_id": review_id, "p_user_id": user_id}).execute()
+    if not response.data:
+        return None
+    return response.data[0]
+
+
+def delete_review(client, review_id, user_id):
+    """
+    Delete a user's own review and its likes in a single round trip
+
+    Calls the delete_review database function (see setup_reviews_tables.sql),
+    which locks the review, deletes it and subtracts its rating and current
+    likes from the degree path's aggregate in one transaction, so a like
+    toggled at the same time cannot leave total_likes out of step.
+
+    Args:
+        client: Supabase client
+        review_id: ID of the review to delete
+        user_id: ID of the current user, who must own the review
+
+    Returns:
+        Degree path of the deleted review, or None if the review does not exist or belongs to another user
+    """
+    response = client.rpc("delete_review", {"p_review_id": review_id, "p_user_id": user_id}).execute()
+    if not response.data:
+        return None
+    return response.data[0]["degree_path"]
+
+
+def empty_aggregate(degree_path):
+    """Return a ReviewAggregates row for a degree path with no reviews"""
+    aggregate = {"degree_path": degree_path, "review_count": 0, "rating_sum": 0, "total_likes": 0}
+    for rating in range(1, 6):
+        aggregate[f"rating_{rating}"] = 0
+    return aggregate
+
+
+def summarize_aggregate(row):
+    """
+    Turn a ReviewAggregates row into the summary shown on degree pages
+
+    Args:
+        row: ReviewAggregates row, or None if the degree path has no aggregate yet
+
+    Returns:
+        Dictionary with count, average rating, 1-5 histogram and total likes
+    """
+    row = row or {}
+    count = row.get("review_count") or 0
+    return {
+        "count": count,
+        "average": round(row.get("rating_sum", 0) / count, 1) if count else None,
+        "histogram": [row.get(f"rating_{rating}") or 0 for rating in range(1, 6)],
+        "total_likes": row.get("total_likes") or 0
+    }
+
+
+def fetch_review_summary(client, degree_path, cache=None):
+    """
+    Load the precomputed review summary for a degree path in a single query
+
+    Args:
+        client: Supabase client
+        degree_path: Degree path such as "graduates/mba"
+        cache: Optional ReviewCache; the summary is cached under the "summary" view
+
+    Returns:
+        Summary dictionary as built by summarize_aggregate
+    """
+    cached = cache.get(degree_path, "summary") if cache is not None else None
+    if cached is not None:
+        return cached["summary"]
+
+    generation = cache.generation(degree_path) if cache is not None else None
+    response = client.table("ReviewAggregates").select("*").filter("degree_path", "eq", degree_path).execute()
+    summary = summarize_aggregate(response.data[0] if response.data else None)
+
+    if cache is not None:
+        cache.put(degree_path, {"summary": summary}, "summary", generation)
+    return summary
+
+
+def apply_review_aggregate_delta(client, degree_path, rating, count_delta, likes_delta=0):
+    """
+    Incrementally update a degree path's ReviewAggregates row
+
+    Args:
+        client: Supabase client
+        degree_path: Degree path of the added or removed review
+        rating: Rating of the review (1-5)
+        count_delta: 1 when a review was added, -1 when it was removed
+        likes_delta: Change in total likes, e.g. minus the likes of a deleted review
+    """
+    client.rpc("apply_review_aggregate_delta", {
+        "p_degree_path": degree_path,
+        "p_rating": rating,
+        "p_count_delta": count_delta,
+        "p_likes_delta": likes_delta
+    }).execute()
+
+
+def rebuild_review_aggregates(client, batch_size=AGGREGATE_REBUILD_BATCH_SIZE):
+    """
+    Recompute every ReviewAggregates row from the Reviews table
+
+    Reviews are read in batches of batch_size, so memory use depends on the
+    number of degree paths rather than the number of reviews.
+
+    Args:
+        client: Supabase client
+        batch_size: Number of reviews read per request
+
+    Returns:
+        Dictionary mapping degree path to its rebuilt aggregate row
+    """
+    aggregates = {}
+    start = 0
+    while True:
+        response = client.table("Reviews").select("review_id, degree_path, rating, likes").order("review_id").range(start, start + batch_size).execute()
+        rows = response.data or []
+
+        for review in rows:
+            degree_path = review["degree_path"]
+            if degree_path not in aggregates:
+                aggregates[degree_path] = empty_aggregate(degree_path)
+            aggregate = aggregates[degree_path]
+            rating = review.get("rating") or 0
+            aggregate["review_count"] += 1
+            aggregate["rating_sum"] += rating
+            if 1 <= rating <= 5:
+                aggregate[f"rating_{rating}"] += 1
+            aggregate["total_likes"] += review.get("likes") or 0
+
+        if len(rows) < batch_size:
+            break
+        start += batch_size
+
+    # Reset aggregates of degree paths whose reviews have all been deleted
+    existing = client.table("ReviewAggregates").select("degree_path").execute()
+    for row in existing.data or []:
+        if row["degree_path"] not in aggregates:
+            aggregates[row["degree_path"]] = empty_aggregate(row["degree_path"])
+
+    updated_at = str(datetime.datetime.now())
+    for aggregate in aggregates.values():
+        aggregate["updated_at"] = updated_at
+
+    if aggregates:
+        client.table("ReviewAggregates").upsert(list(aggregates.values())).execute()
+
+    return aggregates
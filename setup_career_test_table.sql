@@ -5,6 +5,7 @@ CREATE TABLE IF NOT EXISTS "CareerTestResults" (
     "answers" JSONB NOT NULL,
     "results" JSONB NOT NULL,
     "personality_insights" JSONB,
+    "top_matches" JSONB,
     "plan_type" TEXT NOT NULL DEFAULT 'free',
     "created_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -13,6 +14,13 @@ CREATE TABLE IF NOT EXISTS "CareerTestResults" (
 CREATE INDEX IF NOT EXISTS "idx_career_test_results_user_id" ON "CareerTestResults" ("user_id");
 CREATE INDEX IF NOT EXISTS "idx_career_test_results_created_at" ON "CareerTestResults" ("created_at");
 
+-- Compact summary of the top matches, written at save time so the history page
+-- never reads the full results (legacy rows are filled in on first view)
+ALTER TABLE "CareerTestResults" ADD COLUMN IF NOT EXISTS "top_matches" JSONB;
+
+-- Index for the keyset-paginated history of a user, newest first
+CREATE INDEX IF NOT EXISTS "idx_career_test_results_user_history" ON "CareerTestResults" ("user_id", "created_at" DESC, "id" DESC);
+
 -- Add RLS (Row Level Security) policies
 ALTER TABLE "CareerTestResults" ENABLE ROW LEVEL SECURITY;
 
@@ -24,4 +32,33 @@ USING (auth.uid() = user_id);
 -- Policy to allow users to insert their own test results
 CREATE POLICY "Users can insert their own test results" 
 ON "CareerTestResults" FOR INSERT 
-WITH CHECK (auth.uid() = user_id);
\ No newline at end of file
+WITH CHECK (auth.uid() = user_id);
+
+-- Progress tracking time series: one small row per test result, appended when
+-- the result is saved. Scores are whole percentages in the dimension order of
+-- the layout key (see career_progress.py), so charts never read the full results.
+CREATE TABLE IF NOT EXISTS "CareerTestProgress" (
+    "id" UUID PRIMARY KEY REFERENCES "CareerTestResults"("id") ON DELETE CASCADE,
+    "user_id" UUID NOT NULL REFERENCES "Users"("id") ON DELETE CASCADE,
+    "created_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    "layout" TEXT NOT NULL,
+    "scores" JSONB NOT NULL,
+    "top_matches" JSONB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS "idx_career_test_progress_user_created_at" ON "CareerTestProgress" ("user_id", "created_at" DESC);
+
+ALTER TABLE "CareerTestProgress" ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own test progress"
+ON "CareerTestProgress" FOR SELECT
+USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can insert their own test progress"
+ON "CareerTestProgress" FOR INSERT
+WITH CHECK (auth.uid() = user_id);
+
+-- Saving a point again (upsert) updates the existing row
+CREATE POLICY "Users can update their own test progress"
+ON "CareerTestProgress" FOR UPDATE
+USING (auth.uid() = user_id);
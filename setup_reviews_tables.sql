@@ -0,0 +1,151 @@
+-- Create Reviews table
+CREATE TABLE IF NOT EXISTS "Reviews" (
+    "review_id" UUID PRIMARY KEY,
+    "user_id" UUID NOT NULL REFERENCES "Users"("id") ON DELETE CASCADE,
+    "degree_path" TEXT NOT NULL,
+    "rating" INTEGER NOT NULL CHECK ("rating" BETWEEN 1 AND 5),
+    "review_text" TEXT NOT NULL,
+    "pros" TEXT,
+    "cons" TEXT,
+    "current_status" TEXT,
+    "likes" INTEGER NOT NULL DEFAULT 0,
+    "created_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    "updated_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Create index for faster queries
+CREATE INDEX IF NOT EXISTS "idx_reviews_degree_path_created_at" ON "Reviews" ("degree_path", "created_at" DESC);
+
+-- Create ReviewLikes table
+CREATE TABLE IF NOT EXISTS "ReviewLikes" (
+    "like_id" UUID PRIMARY KEY,
+    "user_id" UUID NOT NULL REFERENCES "Users"("id") ON DELETE CASCADE,
+    "review_id" UUID NOT NULL REFERENCES "Reviews"("review_id") ON DELETE CASCADE,
+    "created_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- A user can like a review at most once
+CREATE UNIQUE INDEX IF NOT EXISTS "idx_review_likes_user_review" ON "ReviewLikes" ("user_id", "review_id");
+CREATE INDEX IF NOT EXISTS "idx_review_likes_review_id" ON "ReviewLikes" ("review_id");
+
+-- Create ReviewAggregates table holding per-degree summary statistics
+CREATE TABLE IF NOT EXISTS "ReviewAggregates" (
+    "degree_path" TEXT PRIMARY KEY,
+    "review_count" INTEGER NOT NULL DEFAULT 0,
+    "rating_sum" INTEGER NOT NULL DEFAULT 0,
+    "rating_1" INTEGER NOT NULL DEFAULT 0,
+    "rating_2" INTEGER NOT NULL DEFAULT 0,
+    "rating_3" INTEGER NOT NULL DEFAULT 0,
+    "rating_4" INTEGER NOT NULL DEFAULT 0,
+    "rating_5" INTEGER NOT NULL DEFAULT 0,
+    "total_likes" INTEGER NOT NULL DEFAULT 0,
+    "updated_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Apply an incremental change to a degree path's aggregate.
+-- p_count_delta is +1 when a review is added and -1 when it is removed.
+CREATE OR REPLACE FUNCTION apply_review_aggregate_delta(
+    p_degree_path TEXT,
+    p_rating INTEGER,
+    p_count_delta INTEGER,
+    p_likes_delta INTEGER DEFAULT 0
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO "ReviewAggregates" AS agg (
+        "degree_path", "review_count", "rating_sum",
+        "rating_1", "rating_2", "rating_3", "rating_4", "rating_5",
+        "total_likes", "updated_at"
+    )
+    VALUES (
+        p_degree_path,
+        GREATEST(p_count_delta, 0),
+        GREATEST(p_count_delta, 0) * COALESCE(p_rating, 0),
+        CASE WHEN p_rating = 1 THEN GREATEST(p_count_delta, 0) ELSE 0 END,
+        CASE WHEN p_rating = 2 THEN GREATEST(p_count_delta, 0) ELSE 0 END,
+        CASE WHEN p_rating = 3 THEN GREATEST(p_count_delta, 0) ELSE 0 END,
+        CASE WHEN p_rating = 4 THEN GREATEST(p_count_delta, 0) ELSE 0 END,
+        CASE WHEN p_rating = 5 THEN GREATEST(p_count_delta, 0) ELSE 0 END,
+        GREATEST(p_likes_delta, 0),
+        NOW()
+    )
+    ON CONFLICT ("degree_path") DO UPDATE SET
+        "review_count" = GREATEST(agg."review_count" + p_count_delta, 0),
+        "rating_sum" = GREATEST(agg."rating_sum" + p_count_delta * COALESCE(p_rating, 0), 0),
+        "rating_1" = GREATEST(agg."rating_1" + CASE WHEN p_rating = 1 THEN p_count_delta ELSE 0 END, 0),
+        "rating_2" = GREATEST(agg."rating_2" + CASE WHEN p_rating = 2 THEN p_count_delta ELSE 0 END, 0),
+        "rating_3" = GREATEST(agg."rating_3" + CASE WHEN p_rating = 3 THEN p_count_delta ELSE 0 END, 0),
+        "rating_4" = GREATEST(agg."rating_4" + CASE WHEN p_rating = 4 THEN p_count_delta ELSE 0 END, 0),
+        "rating_5" = GREATEST(agg."rating_5" + CASE WHEN p_rating = 5 THEN p_count_delta ELSE 0 END, 0),
+        "total_likes" = GREATEST(agg."total_likes" + p_likes_delta, 0),
+        "updated_at" = NOW();
+END;
+$$;
+
+-- Toggle a user's like on a review and return the new state in one round trip.
+-- The review row is locked first, so concurrent toggles on the same review are
+-- serialized and the likes counter always matches the ReviewLikes rows.
+CREATE OR REPLACE FUNCTION toggle_review_like(p_review_id UUID, p_user_id UUID)
+RETURNS TABLE ("liked" BOOLEAN, "likes" INTEGER)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_degree_path TEXT;
+BEGIN
+    SELECT "degree_path" INTO v_degree_path FROM "Reviews" WHERE "review_id" = p_review_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM "ReviewLikes" WHERE "review_id" = p_review_id AND "user_id" = p_user_id;
+
+    IF FOUND THEN
+        liked := FALSE;
+        UPDATE "Reviews" SET "likes" = GREATEST("likes" - 1, 0)
+        WHERE "review_id" = p_review_id
+        RETURNING "Reviews"."likes" INTO likes;
+        PERFORM apply_review_aggregate_delta(v_degree_path, NULL, 0, -1);
+    ELSE
+        INSERT INTO "ReviewLikes" ("like_id", "user_id", "review_id", "created_at")
+        VALUES (gen_random_uuid(), p_user_id, p_review_id, NOW());
+        liked := TRUE;
+        UPDATE "Reviews" SET "likes" = "likes" + 1
+        WHERE "review_id" = p_review_id
+        RETURNING "Reviews"."likes" INTO likes;
+        PERFORM apply_review_aggregate_delta(v_degree_path, NULL, 0, 1);
+    END IF;
+
+    RETURN NEXT;
+END;
+$$;
+
+-- Delete a user's own review and remove it from its degree path's aggregate
+-- in one transaction. The review row is locked before its likes are read, so
+-- a like toggled concurrently is either counted in the removed total or waits
+-- and then finds the review gone. Returns the deleted review's degree path,
+-- or no row if the review does not exist or belongs to another user.
+CREATE OR REPLACE FUNCTION delete_review(p_review_id UUID, p_user_id UUID)
+RETURNS TABLE ("degree_path" TEXT)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_rating INTEGER;
+    v_likes INTEGER;
+BEGIN
+    SELECT "degree_path", "rating", "likes" INTO degree_path, v_rating, v_likes
+    FROM "Reviews" WHERE "review_id" = p_review_id AND "user_id" = p_user_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM "ReviewLikes" WHERE "review_id" = p_review_id;
+    DELETE FROM "Reviews" WHERE "review_id" = p_review_id;
+    PERFORM apply_review_aggregate_delta(degree_path, v_rating, -1, -v_likes);
+
+    RETURN NEXT;
+END;
+$$;
@@ -2,17 +2,20 @@
 
 document.addEventListener('DOMContentLoaded', function() {
     // Star rating functionality for displaying existing reviews
-    const starRatings = document.querySelectorAll('.star-rating');
-    starRatings.forEach(function(ratingContainer) {
-        const stars = ratingContainer.querySelectorAll('.star');
-        const ratingValue = parseInt(ratingContainer.dataset.rating);
-        
-        stars.forEach(function(star, index) {
-            if (index < ratingValue) {
-                star.classList.add('filled');
-            }
+    function fillStarRatings(root) {
+        const starRatings = root.querySelectorAll('.star-rating');
+        starRatings.forEach(function(ratingContainer) {
+            const stars = ratingContainer.querySelectorAll('.star');
+            const ratingValue = parseInt(ratingContainer.dataset.rating);
+
+            stars.forEach(function(star, index) {
+                if (index < ratingValue) {
+                    star.classList.add('filled');
+                }
+            });
         });
-    });
+    }
+    fillStarRatings(document);
 
     // Star rating functionality for the review form
     const ratingInputs = document.querySelectorAll('.rating-input input');
@@ -22,15 +25,56 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
-    // Like button functionality
-    const likeButtons = document.querySelectorAll('.like-button');
-    likeButtons.forEach(function(button) {
-        button.addEventListener('click', function() {
-            const reviewId = this.dataset.reviewId;
-            const likeCount = this.querySelector('.like-count');
-            
-            // Send AJAX request to like the review
-            fetch('/like-review/' + reviewId, {
+    // Like button functionality (delegated so lazy-loaded reviews work too)
+    document.addEventListener('click', function(event) {
+        const button = event.target.closest('.like-button');
+        if (!button) {
+            return;
+        }
+
+        const reviewId = button.dataset.reviewId;
+        const likeCount = button.querySelector('.like-count');
+
+        // Send AJAX request to like the review
+        fetch('/like-review/' + reviewId, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-Requested-With': 'XMLHttpRequest'
+            },
+            credentials: 'same-origin'
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Update like count
+                likeCount.textContent = data.likes;
+
+                // Toggle liked class
+                if (data.liked) {
+                    button.classList.add('liked');
+                } else {
+                    button.classList.remove('liked');
+                }
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+        });
+    });
+
+    // Delete button functionality (delegated so lazy-loaded reviews work too)
+    document.addEventListener('click', function(event) {
+        const button = event.target.closest('.delete-button');
+        if (!button) {
+            return;
+        }
+
+        if (confirm('Are you sure you want to delete this review? This action cannot be undone.')) {
+            const reviewId = button.dataset.reviewId;
+
+            // Send AJAX request to delete the review
+            fetch('/delete-review/' + reviewId, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -41,75 +85,161 @@ document.addEventListener('DOMContentLoaded', function() {
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    // Update like count
-                    likeCount.textContent = data.likes;
-                    
-                    // Toggle liked class
-                    if (data.liked) {
-                        button.classList.add('liked');
-                    } else {
-                        button.classList.remove('liked');
+                    // Remove the review card from the DOM
+                    const reviewCard = button.closest('.review-card');
+                    reviewCard.remove();
+
+                    // If no reviews left, show the "no reviews" message
+                    const reviewsSection = document.querySelector('.reviews-section');
+                    const reviewCards = reviewsSection.querySelectorAll('.review-card');
+                    if (reviewCards.length === 0 && !reviewsSection.querySelector('.reviews-load-more')) {
+                        const noReviewsMessage = document.createElement('p');
+                        noReviewsMessage.textContent = 'No reviews yet. Be the first to share your experience!';
+                        reviewsSection.insertBefore(noReviewsMessage, reviewsSection.querySelector('.write-review-section'));
                     }
+                } else {
+                    alert('Error deleting review: ' + data.message);
                 }
             })
             .catch(error => {
                 console.error('Error:', error);
+                alert('An error occurred while deleting your review. Please try again.');
             });
-        });
+        }
     });
 
-    // Delete button functionality
-    const deleteButtons = document.querySelectorAll('.delete-button');
-    deleteButtons.forEach(function(button) {
-        button.addEventListener('click', function() {
-            if (confirm('Are you sure you want to delete this review? This action cannot be undone.')) {
-                const reviewId = this.dataset.reviewId;
-                
-                // Send AJAX request to delete the review
-                fetch('/delete-review/' + reviewId, {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'X-Requested-With': 'XMLHttpRequest'
-                    },
-                    credentials: 'same-origin'
-                })
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success) {
-                        // Remove the review card from the DOM
-                        const reviewCard = button.closest('.review-card');
-                        reviewCard.remove();
-                        
-                        // If no reviews left, show the "no reviews" message
-                        const reviewsSection = document.querySelector('.reviews-section');
-                        const reviewCards = reviewsSection.querySelectorAll('.review-card');
-                        if (reviewCards.length === 0) {
-                            const noReviewsMessage = document.createElement('p');
-                            noReviewsMessage.textContent = 'No reviews yet. Be the first to share your experience!';
-                            reviewsSection.insertBefore(noReviewsMessage, reviewsSection.querySelector('.write-review-section'));
-                        }
-                    } else {
-                        alert('Error deleting review: ' + data.message);
-                    }
-                })
-                .catch(error => {
-                    console.error('Error:', error);
-                    alert('An error occurred while deleting your review. Please try again.');
+    // Build a review card matching the markup in reviews_section.html
+    function escapeHtml(value) {
+        const div = document.createElement('div');
+        div.textContent = value == null ? '' : String(value);
+        return div.innerHTML;
+    }
+
+    function renderReviewCard(review) {
+        const card = document.createElement('div');
+        card.className = 'review-card';
+
+        const username = review.username || 'Anonymous';
+        let prosCons = '';
+        if (review.pros) {
+            prosCons += `<div class="review-pros"><h4>Pros</h4><p>${escapeHtml(review.pros)}</p></div>`;
+        }
+        if (review.cons) {
+            prosCons += `<div class="review-cons"><h4>Cons</h4><p>${escapeHtml(review.cons)}</p></div>`;
+        }
+
+        card.innerHTML = `
+            <div class="review-header">
+                <div class="reviewer-info">
+                    <div class="reviewer-avatar">${escapeHtml(username.charAt(0).toUpperCase())}</div>
+                    <div>
+                        <div class="reviewer-name">${escapeHtml(username)}</div>
+                        ${review.current_status ? `<div class="reviewer-status">${escapeHtml(review.current_status)}</div>` : ''}
+                        <div class="review-date">${escapeHtml(review.created_at_display)}</div>
+                    </div>
+                </div>
+                <div class="review-rating">
+                    <div class="star-rating" data-rating="${escapeHtml(review.rating)}">
+                        <span class="star">★</span>
+                        <span class="star">★</span>
+                        <span class="star">★</span>
+                        <span class="star">★</span>
+                        <span class="star">★</span>
+                    </div>
+                </div>
+            </div>
+            <div class="review-content">
+                <div class="review-text">${escapeHtml(review.review_text)}</div>
+                <div class="review-pros-cons">${prosCons}</div>
+            </div>
+            <div class="review-actions">
+                <div class="review-likes">
+                    <button class="like-button ${review.user_liked ? 'liked' : ''}" data-review-id="${escapeHtml(review.review_id)}">
+                        <i class="fas fa-thumbs-up"></i>
+                        <span class="like-count">${escapeHtml(review.likes)}</span>
+                    </button>
+                </div>
+                ${review.is_owner ? `
+                <div class="review-controls">
+                    <button class="delete-button" data-review-id="${escapeHtml(review.review_id)}">
+                        <i class="fas fa-trash-alt"></i> Delete
+                    </button>
+                </div>` : ''}
+            </div>`;
+
+        fillStarRatings(card);
+        return card;
+    }
+
+    // Lazy-load further pages of reviews as the user scrolls
+    const loadMore = document.querySelector('.reviews-load-more');
+    if (loadMore) {
+        let loading = false;
+        let failed = false;
+
+        function loadNextPage() {
+            const cursor = loadMore.dataset.nextCursor;
+            if (loading || failed || !cursor) {
+                return;
+            }
+            loading = true;
+
+            const url = '/reviews/' + loadMore.dataset.degreePath + '?cursor=' + encodeURIComponent(cursor);
+            fetch(url, {
+                headers: {
+                    'X-Requested-With': 'XMLHttpRequest'
+                },
+                credentials: 'same-origin'
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (!data.success) {
+                    throw new Error(data.message || 'Unknown error');
+                }
+
+                data.reviews.forEach(function(review) {
+                    loadMore.parentNode.insertBefore(renderReviewCard(review), loadMore);
                 });
+
+                if (data.next_cursor) {
+                    loadMore.dataset.nextCursor = data.next_cursor;
+                } else {
+                    observer.disconnect();
+                    loadMore.remove();
+                }
+            })
+            .catch(error => {
+                console.error('Error loading reviews:', error);
+                failed = true;
+                loadMore.textContent = 'Could not load more reviews. Please refresh the page.';
+            })
+            .finally(() => {
+                loading = false;
+
+                // The observer only fires on changes, so keep going while the marker stays in view
+                if (!failed && loadMore.isConnected && loadMore.getBoundingClientRect().top < window.innerHeight + 200) {
+                    loadNextPage();
+                }
+            });
+        }
+
+        const observer = new IntersectionObserver(function(entries) {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadNextPage();
             }
-        });
-    });
+        }, { rootMargin: '200px' });
+        observer.observe(loadMore);
+    }
 
     // Review form submission
     const reviewForm = document.getElementById('review-form');
     if (reviewForm) {
         reviewForm.addEventListener('submit', function(e) {
             e.preventDefault();
-            
+
             const formData = new FormData(this);
             const degreePath = this.dataset.degreePath;
-            
+
             fetch('/submit-review/' + degreePath, {
                 method: 'POST',
                 body: formData,
@@ -135,4 +265,4 @@ document.addEventListener('DOMContentLoaded', function() {
             });
         });
     }
-});
\ No newline at end of file
+});
@@ -0,0 +1,52 @@
+# conftest.py
+# Makes the application modules at the repository root importable from the tests
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Responses of News API, Google News and the education sites, replayed by news_stub
+NEWS_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "news")
+
+
+@pytest.fixture
+def news_stub(monkeypatch, tmp_path):
+    """
+    Serve the responses in tests/fixtures/news locally and point news_fetcher at them
+
+    Yields a function taking {path prefix: delay seconds}; it starts a stub
+    server with those delays (paths are /newsapi, /google/search and
+    /sites/<index>/) and returns the news_fetcher module, configured with a
+    fresh HTTP cache.
+    """
+    import benchmark
+    import news_fetcher
+
+    fixtures = {}
+    for name in os.listdir(NEWS_FIXTURES_DIR):
+        with open(os.path.join(NEWS_FIXTURES_DIR, name), "rb") as f:
+            fixtures[name] = f.read()
+    sites = list(news_fetcher.EDUCATION_SITES)
+    servers = []
+
+    def start(delays=None):
+        server = benchmark.start_news_stub(fixtures, delays or {})
+        servers.append(server)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        monkeypatch.setattr(news_fetcher, "NEWS_API_KEY", "test")
+        monkeypatch.setattr(news_fetcher, "NEWS_API_URL", f"{base}/newsapi")
+        monkeypatch.setattr(news_fetcher, "GOOGLE_NEWS_URL", f"{base}/google")
+        monkeypatch.setattr(news_fetcher, "EDUCATION_SITES",
+                            [dict(site, url=f"{base}/sites/{index}/") for index, site in enumerate(sites)])
+        monkeypatch.setattr(news_fetcher, "news_http_cache",
+                            news_fetcher.HttpCache(str(tmp_path / f"http_cache_{len(servers)}.json")))
+        return news_fetcher
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,263 @@
+# test_career_matching.py
+# Checks that CareerMatchEngine returns exactly what the original matching code returned
+
+import copy
+import random
+
+import pytest
+
+import career_test
+from career_test import CareerMatchEngine, calculate_career_matches
+
+PLANS = ("free", "premium")
+
+
+def baseline_calculate_career_matches(answers, plan_type="free"):
+    """
+    Calculate career matches the way career_test.py did before CareerMatchEngine
+
+    Args:
+        answers: Dictionary of question IDs and their scores (1-5)
+        plan_type: "free" or "premium"
+
+    Returns:
+        List of career matches with scores and insights, limited by plan type
+    """
+    # Initialize trait scores
+    trait_scores = {}
+
+    # Process answers to calculate trait scores
+    for question_id, score in answers.items():
+        # Normalize score to 0-1 range
+        normalized_score = (int(score) - 1) / 4.0
+
+        # Find the question and its associated trait
+        for category in career_test.CAREER_TEST_QUESTIONS:
+            for question in career_test.CAREER_TEST_QUESTIONS[category]:
+                if question["id"] == question_id:
+                    trait_type = None
+                    trait_name = None
+
+                    if category == "personality":
+                        trait_type = "traits"
+                        trait_name = question["trait"]
+                    elif category == "interests":
+                        trait_type = "interests"
+                        trait_name = question["field"]
+                    elif category == "skills":
+                        trait_type = "skills"
+                        trait_name = question["skill"]
+                    elif category == "values":
+                        trait_type = "values"
+                        trait_name = question["value"]
+
+                    if trait_type and trait_name:
+                        if trait_type not in trait_scores:
+                            trait_scores[trait_type] = {}
+
+                        if trait_name not in trait_scores[trait_type]:
+                            trait_scores[trait_type][trait_name] = []
+
+                        trait_scores[trait_type][trait_name].append(normalized_score)
+
+    # Average the scores for each trait
+    for trait_type in trait_scores:
+        for trait_name in trait_scores[trait_type]:
+            scores = trait_scores[trait_type][trait_name]
+            trait_scores[trait_type][trait_name] = sum(scores) / len(scores)
+
+    # Calculate match scores for each career
+    career_matches = []
+
+    for career_id, career in career_test.CAREER_PROFILES.items():
+        # Initialize match components
+        trait_match = 0
+        trait_count = 0
+        skill_match = 0
+        skill_count = 0
+        value_match = 0
+        value_count = 0
+
+        # Calculate trait match
+        if "traits" in trait_scores and "traits" in career:
+            for trait, career_value in career["traits"].items():
+                if trait in trait_scores["traits"]:
+                    trait_match += (1 - abs(career_value - trait_scores["traits"][trait])) * career_value
+                    trait_count += career_value
+
+        # Calculate skill match
+        if "skills" in trait_scores and "skills" in career:
+            for skill, career_value in career["skills"].items():
+                if skill in trait_scores["skills"]:
+                    skill_match += (1 - abs(career_value - trait_scores["skills"][skill])) * career_value
+                    skill_count += career_value
+
+        # Calculate value match
+        if "values" in trait_scores and "values" in career:
+            for value, career_value in career["values"].items():
+                if value in trait_scores["values"]:
+                    value_match += (1 - abs(career_value - trait_scores["values"][value])) * career_value
+                    value_count += career_value
+
+        # Calculate overall match percentage
+        trait_score = trait_match / trait_count if trait_count > 0 else 0
+        skill_score = skill_match / skill_count if skill_count > 0 else 0
+        value_score = value_match / value_count if value_count > 0 else 0
+
+        # Weight the components (can be adjusted)
+        overall_match = (trait_score * 0.4) + (skill_score * 0.4) + (value_score * 0.2)
+        match_percentage = round(overall_match * 100)
+
+        # Identify strengths and gaps
+        strengths = []
+        gaps = []
+
+        # Find top strengths
+        for trait_type in ["traits", "skills", "values"]:
+            if trait_type in trait_scores and trait_type in career:
+                for item, career_value in career[trait_type].items():
+                    if item in trait_scores[trait_type]:
+                        user_value = trait_scores[trait_type][item]
+                        if user_value >= 0.7 and career_value >= 0.7:
+                            strengths.append({
+                                "type": trait_type,
+                                "name": item,
+                                "score": user_value
+                            })
+
+        # Find top gaps
+        for trait_type in ["traits", "skills", "values"]:
+            if trait_type in trait_scores and trait_type in career:
+                for item, career_value in career[trait_type].items():
+                    if item in trait_scores[trait_type]:
+                        user_value = trait_scores[trait_type][item]
+                        if user_value < 0.6 and career_value >= 0.7:
+                            gaps.append({
+                                "type": trait_type,
+                                "name": item,
+                                "score": user_value,
+                                "target": career_value,
+                                "improvement": career["skill_gaps"].get(item,
+                                                                        "Develop this skill through relevant courses and practice")
+                                if trait_type == "skills" else "Focus on developing this area"
+                            })
+
+        # Sort strengths and gaps
+        strengths = sorted(strengths, key=lambda x: x["score"], reverse=True)[:3]
+        gaps = sorted(gaps, key=lambda x: x["target"] - x["score"], reverse=True)[:3]
+
+        # Add career match to results
+        career_matches.append({
+            "id": career_id,
+            "title": career["title"],
+            "category": career["category"],
+            "match_percentage": match_percentage,
+            "trait_score": round(trait_score * 100),
+            "skill_score": round(skill_score * 100),
+            "value_score": round(value_score * 100),
+            "strengths": strengths,
+            "gaps": gaps,
+            "education_paths": career["education_paths"]
+        })
+
+    # Sort career matches by match percentage
+    career_matches = sorted(career_matches, key=lambda x: x["match_percentage"], reverse=True)
+
+    # Limit results based on plan type
+    if plan_type == "free":
+        # Free plan gets limited career matches (top 2)
+        career_matches = career_matches[:2]
+
+        # For free plan, simplify the career matches
+        for match in career_matches:
+            # Simplify the career title to a more general category
+            match["category_title"] = match["category"].title()
+
+            # Limit strengths and gaps
+            match["strengths"] = match["strengths"][:1] if match["strengths"] else []
+            match["gaps"] = match["gaps"][:1] if match["gaps"] else []
+
+            # Simplify education paths
+            match["education_paths"] = match["education_paths"][:1] if match["education_paths"] else []
+    else:
+        # Premium plan gets more detailed matches (top 10)
+        career_matches = career_matches[:10]
+
+    return career_matches
+
+
+def question_ids():
+    return [question["id"] for questions in career_test.CAREER_TEST_QUESTIONS.values() for question in questions]
+
+
+def random_answer_sets(count, seed):
+    """Full, partial, single-answer and empty answer sets, with scores as ints or strings"""
+    rng = random.Random(seed)
+    ids = question_ids()
+    answer_sets = [{}, {"unknown-question": 3}]
+    for i in range(count):
+        chosen = ids if i % 3 == 0 else rng.sample(ids, rng.randint(1, len(ids)))
+        answer_sets.append({question_id: (str if i % 2 else int)(rng.randint(1, 5)) for question_id in chosen})
+    # Uniform answers make many careers score the same, so tie order matters
+    for score in range(1, 6):
+        answer_sets.append({question_id: score for question_id in ids})
+    return answer_sets
+
+
+def assert_same_matches(answers):
+    for plan_type in PLANS:
+        expected = baseline_calculate_career_matches(copy.deepcopy(answers), plan_type)
+        actual = calculate_career_matches(copy.deepcopy(answers), plan_type)
+        assert actual == expected, f"{plan_type} results differ for {answers}"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_engine_matches_baseline_on_random_answers(seed):
+    for answers in random_answer_sets(200, seed):
+        assert_same_matches(answers)
+
+
+def test_engine_matches_baseline_with_tied_profiles(monkeypatch):
+    # Duplicated profiles score identically, so both sides must keep catalogue order on ties
+    profiles = {}
+    for career_id, career in career_test.CAREER_PROFILES.items():
+        profiles[career_id] = career
+        profiles[f"{career_id}-copy"] = dict(career, title=f"{career['title']} (copy)")
+    monkeypatch.setattr(career_test, "CAREER_PROFILES", profiles)
+    monkeypatch.setattr(career_test, "career_match_engine", CareerMatchEngine(career_test.CAREER_TEST_QUESTIONS, profiles))
+
+    for answers in random_answer_sets(50, 99):
+        assert_same_matches(answers)
+
+
+def test_score_answer_sets_keeps_order_and_bounds_chunks_in_flight():
+    processes, chunk_size = 2, 4
+    max_pending = processes * career_test.BATCH_SCORE_PENDING_CHUNKS_PER_PROCESS
+    records = [{"id": i, "answers": answers} for i, answers in enumerate(random_answer_sets(60, 7))]
+    pulled = []
+
+    def produce():
+        for record in records:
+            pulled.append(record["id"])
+            yield record
+
+    scored = []
+    for result in career_test.score_answer_sets(produce(), processes=processes, chunk_size=chunk_size):
+        # The reader may only be max_pending chunks ahead of the chunk being returned
+        assert len(pulled) <= (len(scored) // chunk_size + max_pending) * chunk_size
+        scored.append(result)
+
+    assert [result["id"] for result in scored] == [record["id"] for record in records]
+    assert scored == [career_test.score_answer_set(record, "free") for record in records]
+
+
+def test_non_numeric_answers_are_skipped():
+    ids = question_ids()
+    answers = {question_id: 4 for question_id in ids}
+    legacy = dict(answers, **{ids[0]: "", ids[1]: "n/a", ids[2]: None})
+    cleaned = {question_id: score for question_id, score in answers.items() if question_id not in ids[:3]}
+
+    for plan_type in PLANS:
+        assert calculate_career_matches(legacy, plan_type) == calculate_career_matches(cleaned, plan_type)
+    assert career_test.score_answer_set({"id": 1, "answers": {ids[0]: "x"}})["results"] == \
+        calculate_career_matches({}, "free")
@@ -0,0 +1,41 @@
+# test_keyword_matcher.py
+# Checks that news keywords match whole words only
+
+import pytest
+
+from keyword_matcher import KeywordMatcher
+
+matcher = KeywordMatcher({
+    "policy": ["law", "policy"],
+    "technology": ["e-learning", "online learning"],
+    "higher-education": ["university", "higher education"],
+    "education": ["education"]
+})
+
+
+@pytest.mark.parametrize("text, groups", [
+    ("New law passed", {"policy"}),
+    ("Laws for schools", {"policy"}),
+    # Word boundaries: no match inside longer words
+    ("Mowing the lawn", set()),
+    ("Lawmakers meet", set()),
+    ("An educational app", set()),
+    ("A flawed policymaker", set()),
+    # Hyphenated keywords match any separator, in any case
+    ("E-Learning grows", {"technology"}),
+    ("e learning grows", {"technology"}),
+    ("ONLINE-LEARNING grows", {"technology"}),
+    ("elearning grows", set()),
+    # Plurals fold onto the singular keyword, inside phrases too
+    ("Universities reopen", {"higher-education"}),
+    ("Policies change", {"policy"}),
+    # Overlapping keywords of different groups are all reported
+    ("Higher education policy", {"higher-education", "education", "policy"}),
+    ("", set())
+])
+def test_groups(text, groups):
+    assert matcher.groups(text) == groups
+
+
+def test_groups_without_keywords_are_ignored():
+    assert KeywordMatcher({"empty": [], "symbols": ["--"]}).groups("anything -- at all") == set()
@@ -0,0 +1,70 @@
+# test_news_archive.py
+# Checks that the news archive keeps one copy of each story and ranks undated ones last
+
+import datetime
+
+from news_archive import NewsArchive, ARCHIVE_DEDUP_WINDOW_DAYS
+
+
+def utc_today():
+    return datetime.datetime.now(datetime.timezone.utc).date()
+
+
+def stamp(day, time_of_day):
+    return f"{day.isoformat()}T{time_of_day}Z"
+
+
+def article(url, published_at, **fields):
+    return dict({"title": f"Story at {url}", "url": url, "published_at": published_at, "categories": ["policy"]}, **fields)
+
+
+def test_story_moving_across_midnight_is_archived_once(tmp_path):
+    today = utc_today()
+    yesterday = today - datetime.timedelta(days=1)
+    archive = NewsArchive(str(tmp_path))
+
+    assert archive.append([article("https://example.org/a", stamp(yesterday, "23:30:00"))]) == 1
+    # The next refresh resolves "3 hours ago" to just after midnight
+    assert archive.append([article("https://example.org/a", stamp(today, "00:30:00"))]) == 0
+    # A fresh process reads what is already on disk
+    assert NewsArchive(str(tmp_path)).append([article("https://example.org/a", stamp(today, "01:30:00"))]) == 0
+
+    archived = archive.query(yesterday, today)
+    assert [entry["published_at"] for entry in archived] == [stamp(yesterday, "23:30:00")]
+
+
+def test_first_published_at_is_kept_within_the_window(tmp_path):
+    today = utc_today()
+    first_day = today - datetime.timedelta(days=ARCHIVE_DEDUP_WINDOW_DAYS)
+    archive = NewsArchive(str(tmp_path))
+
+    # Seen with an inferred date first, then with its real, earlier one
+    assert archive.append([article("https://example.org/b", stamp(today, "08:00:00"), published_at_inferred=True)]) == 1
+    assert archive.append([article("https://example.org/b", stamp(first_day, "08:00:00"))]) == 0
+    # Copies within one batch are written once, under the earliest day
+    two_days_ago = today - datetime.timedelta(days=2)
+    assert archive.append([article("https://example.org/c", stamp(today, "09:00:00")),
+                           article("https://example.org/c", stamp(two_days_ago, "09:00:00"))]) == 1
+
+    archived = archive.query(first_day, today)
+    assert [(entry["url"], entry["published_at"]) for entry in archived] == [
+        ("https://example.org/b", stamp(today, "08:00:00")),
+        ("https://example.org/c", stamp(two_days_ago, "09:00:00"))
+    ]
+
+
+def test_undated_articles_sort_after_dated_ones(tmp_path):
+    today = utc_today()
+    archive = NewsArchive(str(tmp_path))
+    archive.append([
+        article("https://example.org/fetched", stamp(today, "12:00:00"), published_at_inferred=True),
+        article("https://example.org/morning", stamp(today, "07:00:00")),
+        article("https://example.org/night", stamp(today, "02:00:00")),
+        article("https://example.org/other", stamp(today, "11:00:00"), categories=["career"])
+    ])
+
+    assert [entry["url"] for entry in archive.query(today, today, "policy")] == [
+        "https://example.org/morning",
+        "https://example.org/night",
+        "https://example.org/fetched"
+    ]
@@ -0,0 +1,85 @@
+# test_news_dedup.py
+# Checks which articles the news deduplicator merges and which it keeps apart
+
+import datetime
+
+import news_fetcher
+from news_archive import NewsArchive
+from news_dedup import NewsDeduplicator, canonical_url
+
+DESCRIPTION = ("The state board will publish revised admission criteria for public universities "
+               "next month, with new weight given to coursework and interviews.")
+
+
+def article(title, description=DESCRIPTION, url=None, **fields):
+    return dict({"title": title, "description": description,
+                 "url": url or "https://example.org/" + "-".join(title.lower().split())}, **fields)
+
+
+def kept_titles(articles):
+    return [entry["title"] for entry in NewsDeduplicator().filter(articles)]
+
+
+def test_syndicated_copies_merge():
+    original = article("State board revises university admission criteria")
+    copies = [
+        article("State board revises university admission criteria - Campus Daily"),
+        article("State board changes university admission criteria"),
+        # The same page behind a tracking link
+        article("Admission criteria story", description="", url=original["url"] + "?utm_source=feed&fbclid=x")
+    ]
+
+    deduplicator = NewsDeduplicator()
+    assert deduplicator.filter([original] + copies) == [original]
+    assert deduplicator.stats["near-duplicate"] == 2
+    assert deduplicator.stats["duplicate-url"] == 1
+    assert deduplicator.decisions[0]["duplicate_of"] == original["title"]
+
+
+def test_short_titles_differing_in_one_word_stay_apart():
+    titles = ["CBSE Class 10 results 2026 declared",
+              "CBSE Class 12 results 2026 declared",
+              "CBSE Class 10 results 2026 postponed"]
+
+    assert kept_titles([article(title, description="") for title in titles]) == titles
+    # An exact repeat of a short title from another source is still dropped
+    repeat = article(titles[0], description="", url="https://example.com/results")
+    assert kept_titles([article(titles[0], description=""), repeat]) == titles[:1]
+
+
+def test_placeholder_descriptions_do_not_merge_different_stories():
+    titles = ["CBSE Class 10 results 2026 declared",
+              "CBSE Class 12 results 2026 declared",
+              "Teacher shortage eases in some states"]
+    placeholder = "Latest education news about board exams from Google News. Click to read more."
+
+    flagged = [article(title, description=placeholder, description_generated=True) for title in titles]
+    assert kept_titles(flagged) == titles
+    # Feeds written before the flag existed are recognized by the placeholder text
+    assert kept_titles([article(title, description=placeholder) for title in titles]) == titles
+
+
+def test_canonical_url_ignores_tracking_and_formatting():
+    assert canonical_url("http://WWW.Example.org/news/a/?utm_medium=x&b=2&a=1#top") == \
+        "https://example.org/news/a?a=1&b=2"
+    assert canonical_url("mailto:desk@example.org") == "mailto:desk@example.org"
+
+
+def test_refound_story_keeps_its_first_added_timestamp(tmp_path, monkeypatch):
+    first_seen = (datetime.datetime.now() - datetime.timedelta(hours=5)).timestamp()
+    existing = article("State board revises university admission criteria",
+                       published_at="2024-05-14T08:00:00Z", categories=["policy"], added_timestamp=first_seen)
+    refound = article("State board revises university admission criteria - Campus Daily", url=existing["url"],
+                      published_at="2024-05-14T09:00:00Z", source="Campus Daily")
+
+    data_file = str(tmp_path / "news_data.json")
+    news_fetcher.write_json_atomic(data_file, {"articles": [existing]})
+    monkeypatch.setattr(news_fetcher, "NEWS_DATA_FILE", data_file)
+    monkeypatch.setattr(news_fetcher, "news_snapshot", news_fetcher.NewsSnapshot(data_file))
+    monkeypatch.setattr(news_fetcher, "news_archive", NewsArchive(str(tmp_path / "archive")))
+    monkeypatch.setattr(news_fetcher, "fetch_all_sources", lambda: ([refound], [], []))
+
+    news_fetcher.update_news_data()
+
+    articles = news_fetcher.load_news_data()["articles"]
+    assert [(entry["title"], entry["added_timestamp"]) for entry in articles] == [(existing["title"], first_seen)]
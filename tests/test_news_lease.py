@@ -0,0 +1,98 @@
+# test_news_lease.py
+# Checks how the news updater lease is taken, renewed and handed over
+
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from news_fetcher import LeaderLease
+
+
+@pytest.fixture
+def lease_path(tmp_path):
+    return str(tmp_path / "news_cache" / "updater.lease")
+
+
+def write_lease(path, **fields):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fields, f)
+
+
+def read_lease(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_expired_lease_is_taken_over(lease_path):
+    first, second = LeaderLease(lease_path, ttl=0.4), LeaderLease(lease_path, ttl=0.4)
+
+    assert first.acquire()
+    assert not second.acquire()
+    # Renewing pushes the expiry forward
+    time.sleep(0.3)
+    assert first.acquire()
+    time.sleep(0.2)
+    assert not second.acquire()
+
+    time.sleep(0.4)
+    assert second.acquire()
+    assert read_lease(lease_path)["owner"] == second.owner
+    assert not first.acquire()
+    assert not first.is_leader
+
+
+def test_lease_of_exited_process_is_taken_over(lease_path):
+    lease = LeaderLease(lease_path, ttl=60)
+    lease.acquire()
+    lease.release()
+
+    # A leader on this host whose process is gone does not have to expire first
+    write_lease(lease_path, owner="gone", host=lease.host, pid=exited_pid(), expires_at=time.time() + 60)
+    assert lease.acquire()
+    assert read_lease(lease_path)["owner"] == lease.owner
+
+    # The PID of a leader on another host cannot be checked, so only expiry counts
+    write_lease(lease_path, owner="remote", host=f"{lease.host}-other", pid=exited_pid(), expires_at=time.time() + 60)
+    assert not lease.acquire()
+    assert not lease.is_leader
+
+
+def test_refresh_is_shared_between_leaders(lease_path):
+    first, second = LeaderLease(lease_path, ttl=0.2), LeaderLease(lease_path, ttl=0.2)
+
+    assert first.acquire()
+    assert first.refresh_due(60)
+    first.mark_refreshed()
+    assert not first.refresh_due(60)
+    assert first.refresh_due(0)
+
+    # Only the holder can record a refresh, and renewing keeps the last one
+    refreshed_at = read_lease(lease_path)["last_refresh"]
+    second.mark_refreshed()
+    assert first.acquire()
+    assert read_lease(lease_path)["last_refresh"] == refreshed_at
+
+    # A new leader does not refresh again before the interval has passed
+    time.sleep(0.25)
+    assert second.acquire()
+    assert not second.refresh_due(60)
+    assert read_lease(lease_path)["last_refresh"] == refreshed_at
+
+
+def test_released_lease_is_free(lease_path):
+    first, second = LeaderLease(lease_path, ttl=60), LeaderLease(lease_path, ttl=60)
+
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert not first.is_leader
+    assert second.acquire()
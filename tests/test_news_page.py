@@ -0,0 +1,43 @@
+# test_news_page.py
+# Checks that /news searches the whole feed before paging it
+
+from news_fetcher import build_category_index, news_page
+
+
+def feed(count):
+    articles = [{
+        "title": f"Story {i}: {'Scholarship' if i % 3 == 0 else 'Campus'} news",
+        "description": "Admissions update" if i % 2 else "Policy brief",
+        "categories": ["policy"] if i % 2 == 0 else ["higher-education"]
+    } for i in range(count)]
+    return {"articles": articles, "category_index": build_category_index(articles)}
+
+
+def titles(result):
+    return [article["title"].split(":")[0] for article in result["articles"]]
+
+
+def test_search_is_applied_before_paging():
+    data = feed(30)
+
+    first = news_page(data, page=1, page_size=4, query="scholarship")
+    assert first["total"] == 10
+    assert first["pages"] == 3
+    assert titles(first) == ["Story 0", "Story 3", "Story 6", "Story 9"]
+    # Matches beyond the first page are reached through the page links
+    assert titles(news_page(data, page=3, page_size=4, query="scholarship")) == ["Story 24", "Story 27"]
+
+
+def test_search_combines_with_category_and_counts_matches():
+    data = feed(30)
+
+    # Every word must appear, in any case, in the title or the description
+    result = news_page(data, category="policy", page_size=50, query="SCHOLARSHIP brief")
+    assert titles(result) == ["Story 0", "Story 6", "Story 12", "Story 18", "Story 24"]
+    assert result["category_counts"]["policy"] == 5
+    assert result["category_counts"]["higher-education"] == 0
+
+    assert news_page(data, query="nothing like this")["total"] == 0
+    unfiltered = news_page(data, query="   ")
+    assert unfiltered["total"] == 30
+    assert unfiltered["category_counts"]["policy"] == 15
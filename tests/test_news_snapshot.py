@@ -0,0 +1,92 @@
+# test_news_snapshot.py
+# Checks when the in-memory news snapshot reloads the data file
+
+import json
+import os
+
+from news_fetcher import NewsSnapshot, write_json_atomic
+
+
+def news_data(title):
+    return {"last_updated": "2024-05-14 10:00:00", "articles": [{"title": title, "categories": ["Admissions"]}]}
+
+
+def titles(data):
+    return [article["title"] for article in data["articles"]]
+
+
+def test_reloads_when_file_is_replaced(tmp_path):
+    path = str(tmp_path / "news_data.json")
+    write_json_atomic(path, news_data("First"))
+    snapshot = NewsSnapshot(path, check_interval=0)
+    first = snapshot.get()
+    assert titles(first) == ["First"]
+    # The category index is built for files written without one
+    assert "category_index" in first
+
+    # Unchanged file: the parsed copy is reused
+    assert snapshot.get() is first
+
+    # A rename over the file gives a new inode, even with equal size and mtime
+    stat = os.stat(path)
+    write_json_atomic(path, news_data("Other"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(path).st_size == stat.st_size
+    assert titles(snapshot.get()) == ["Other"]
+
+
+def test_reloads_when_file_is_rewritten_in_place(tmp_path):
+    path = str(tmp_path / "news_data.json")
+    write_json_atomic(path, news_data("First"))
+    snapshot = NewsSnapshot(path, check_interval=0)
+    assert titles(snapshot.get()) == ["First"]
+
+    # Same inode and size, only the mtime differs
+    inode = os.stat(path).st_ino
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(news_data("Other"), f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert os.stat(path).st_ino == inode
+    assert titles(snapshot.get()) == ["Other"]
+
+
+def test_file_is_not_checked_within_interval(tmp_path):
+    path = str(tmp_path / "news_data.json")
+    write_json_atomic(path, news_data("First"))
+    snapshot = NewsSnapshot(path, check_interval=60)
+    first = snapshot.get()
+
+    write_json_atomic(path, news_data("Other"))
+    assert snapshot.get() is first
+
+
+def test_corrupt_file_keeps_previous_data(tmp_path):
+    path = str(tmp_path / "news_data.json")
+    snapshot = NewsSnapshot(path, check_interval=0)
+    assert snapshot.get() == {"last_updated": None, "articles": []}
+
+    write_json_atomic(path, news_data("First"))
+    first = snapshot.get()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"articles": [{"title": "Trunc')
+    assert snapshot.get() is first
+
+    write_json_atomic(path, news_data("Fixed"))
+    assert titles(snapshot.get()) == ["Fixed"]
+
+
+def test_replace_installs_written_data_without_reading_it(tmp_path):
+    path = str(tmp_path / "news_data.json")
+    write_json_atomic(path, news_data("First"))
+    snapshot = NewsSnapshot(path, check_interval=0)
+    snapshot.get()
+
+    written = news_data("Written")
+    write_json_atomic(path, written)
+    snapshot.replace(written)
+    # The file matches the installed signature, so the object is served as is
+    assert snapshot.get() is written
+
+    write_json_atomic(path, news_data("Later"))
+    assert titles(snapshot.get()) == ["Later"]
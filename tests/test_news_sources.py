@@ -0,0 +1,114 @@
+# test_news_sources.py
+# Fetches every news source from a local stub replaying recorded responses
+
+import datetime
+import time
+
+GOOGLE_QUERY = "college admissions"
+
+
+def test_news_api_articles(news_stub):
+    news_fetcher = news_stub()
+    articles = news_fetcher.fetch_from_news_api()
+
+    # The article without a description is skipped
+    assert [article["title"] for article in articles] == [
+        "Colleges expand career advising for first-year students",
+        "Federal student aid form delays push back college admissions decisions",
+        "Online learning degrees gain ground with working adults",
+        "Engineering colleges revise curriculum to add AI electives",
+        "Graduate employment rates hold steady despite hiring slowdown"
+    ]
+    first = articles[0]
+    assert first["source"] == "Inside Higher Ed"
+    assert first["url"].startswith("https://www.insidehighered.com/news/")
+    assert first["image_url"].endswith("career-advising.jpg")
+    assert first["published_date"] == "May 14, 2024"
+    assert first["published_at"] == "2024-05-14T09:30:00Z"
+    assert articles[1]["image_url"] is None
+
+
+def test_google_news_articles(news_stub):
+    news_fetcher = news_stub()
+    fetched_at = datetime.datetime.now(datetime.timezone.utc)
+    articles = news_fetcher.fetch_google_news_query(GOOGLE_QUERY)
+
+    # Only the first five results are read, and the one without a link is skipped
+    assert [article["title"] for article in articles] == [
+        "Community college enrollment climbs for a second year",
+        "New scholarship fund targets STEM degree students",
+        "University rankings 2024: what changed for students",
+        "Vocational training programs add paid apprenticeships"
+    ]
+    first = articles[0]
+    assert first["url"].startswith(f"{news_fetcher.GOOGLE_NEWS_URL}/articles/CBMi")
+    assert first["source"] == "Campus Daily"
+    assert first["published_date"] == "3 hours ago"
+    assert first["published_at"] == "2024-05-14T07:12:00Z"
+    assert first["query"] == GOOGLE_QUERY
+    # Google News has no descriptions, so the placeholder written instead is marked
+    assert all(article["description_generated"] for article in articles)
+
+    # Without a datetime attribute the relative text is resolved against the fetch time
+    relative = datetime.datetime.strptime(articles[2]["published_at"], "%Y-%m-%dT%H:%M:%SZ")
+    age = fetched_at.replace(tzinfo=None) - relative
+    assert datetime.timedelta(days=2, seconds=-5) <= age <= datetime.timedelta(days=2, seconds=60)
+
+
+def test_education_site_articles(news_stub):
+    news_fetcher = news_stub()
+    inside_higher_ed, education_week = news_fetcher.EDUCATION_SITES
+
+    articles = news_fetcher.fetch_education_site(inside_higher_ed)
+    assert [article["title"] for article in articles] == [
+        "Test-optional policies return at selective colleges",
+        "Adjunct faculty win contract with pay raises",
+        "Career services should start on day one",
+        "State grant program expands to part-time students"
+    ]
+    assert {article["source"] for article in articles} == {"Inside Higher Ed"}
+    # Relative links are resolved against the site, absolute ones are kept
+    assert articles[0]["url"] == f"{inside_higher_ed['url']}news/students/admissions/2024/05/14/test-optional-policies-return"
+    assert articles[2]["url"].startswith("https://www.insidehighered.com/opinion/")
+    assert articles[0]["published_at"] == "2024-05-14T00:00:00Z"
+    assert articles[3]["published_date"] == "Recent"
+    # Without a date the fetch time stands in, and the article is marked as such
+    assert articles[3]["published_at_inferred"]
+    assert "published_at_inferred" not in articles[0]
+    # Only the teaser without a description gets a placeholder
+    assert [bool(article.get("description_generated")) for article in articles] == [False, False, True, False]
+
+    articles = news_fetcher.fetch_education_site(education_week)
+    assert len(articles) == 3
+    assert articles[0]["description"].startswith("Districts are partnering with community colleges")
+    assert articles[1]["url"] == f"{education_week['url']}leadership/teacher-shortage-eases-in-some-states/2024/05"
+    assert articles[2]["published_at"] == "2024-05-12T00:00:00Z"
+
+
+def test_sources_are_fetched_concurrently(news_stub):
+    latency, slowest = 0.2, 0.8
+    news_fetcher = news_stub({"/newsapi": latency, "/google": latency, "/sites/0": latency, "/sites/1": slowest})
+    requests_per_refresh = 1 + len(news_fetcher.GOOGLE_NEWS_QUERIES) + len(news_fetcher.EDUCATION_SITES)
+
+    start = time.perf_counter()
+    news_api, google, sites = news_fetcher.fetch_all_sources(deadline=10, workers=requests_per_refresh)
+    elapsed = time.perf_counter() - start
+
+    # One refresh takes about as long as its slowest source, not the sum of all of them
+    assert slowest <= elapsed < slowest + 0.6 < latency * (requests_per_refresh - 1) + slowest
+    assert (len(news_api), len(google), len(sites)) == (5, 4, 7)
+
+
+def test_source_stalled_past_deadline_is_dropped(news_stub):
+    deadline = 1.0
+    news_fetcher = news_stub({"/sites/1": deadline * 5})
+
+    start = time.perf_counter()
+    news_api, google, sites = news_fetcher.fetch_all_sources(deadline=deadline)
+    elapsed = time.perf_counter() - start
+
+    assert deadline <= elapsed < deadline + 0.5
+    assert (len(news_api), len(google)) == (5, 4)
+    # Only the stalled Education Week page is missing
+    assert len(sites) == 4
+    assert {article["source"] for article in sites} == {"Inside Higher Ed"}
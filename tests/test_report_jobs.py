@@ -0,0 +1,46 @@
+# test_report_jobs.py
+# Checks that a report job is not handed out twice while it is still rendering
+
+import threading
+import time
+
+from report_jobs import ReportJobQueue, JOB_DONE, JOB_RUNNING
+
+
+def test_slow_render_keeps_its_claim(tmp_path):
+    rendering = threading.Event()
+    renders = []
+
+    def render(payload):
+        renders.append(payload["report_key"])
+        rendering.set()
+        time.sleep(1.0)
+        return str(tmp_path / "report.pdf")
+
+    queue = ReportJobQueue(db_path=str(tmp_path / "jobs.db"), workers=0, render=render, timeout=0.3)
+    job = queue.enqueue("result-1", "user-1", {}, [], {}, report_key="key-1")
+
+    worker = threading.Thread(target=queue.run_pending)
+    worker.start()
+    assert rendering.wait(5)
+
+    # Another worker polling well past the timeout must not claim the job again
+    deadline = time.time() + 0.8
+    while time.time() < deadline:
+        assert queue._claim() is None
+        assert queue.get(job["job_id"])["status"] == JOB_RUNNING
+        time.sleep(0.05)
+
+    worker.join()
+    assert renders == ["key-1"]
+    assert queue.get(job["job_id"])["status"] == JOB_DONE
+
+
+def test_job_of_a_dead_worker_is_requeued(tmp_path):
+    queue = ReportJobQueue(db_path=str(tmp_path / "jobs.db"), workers=0, render=lambda payload: None, timeout=0.1)
+    job = queue.enqueue("result-2", "user-2", {}, [], {})
+
+    # Claimed but never renewed, as if its worker had been killed
+    assert queue._claim()["job_id"] == job["job_id"]
+    time.sleep(0.2)
+    assert queue._claim()["job_id"] == job["job_id"]
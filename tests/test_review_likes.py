@@ -0,0 +1,179 @@
+# test_review_likes.py
+# Runs the toggle_review_like database function against a real PostgreSQL server
+
+import os
+import tempfile
+import threading
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+SQL_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "setup_reviews_tables.sql")
+
+CLIENTS = 16
+TOGGLES_PER_CLIENT = 25
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    """
+    Use TEST_DATABASE_URL when set, otherwise start a throwaway server with pgserver
+
+    Each run works in its own schema, so a shared database is left untouched.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    server = None
+    if not url:
+        pgserver = pytest.importorskip("pgserver")
+        server = pgserver.get_server(tempfile.mkdtemp(prefix="careermate_pg_"), cleanup_mode="delete")
+        url = server.get_uri()
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    connection = psycopg2.connect(url)
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA "{schema}"')
+        cursor.execute(f'SET search_path TO "{schema}"')
+        # Minimal stand-in for the Users table the review tables reference
+        cursor.execute('CREATE TABLE "Users" ("id" UUID PRIMARY KEY, "username" TEXT)')
+        with open(SQL_FILE, "r", encoding="utf-8") as f:
+            cursor.execute(f.read())
+
+    yield f"{url}{'&' if '?' in url else '?'}options=-csearch_path%3D{schema}"
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP SCHEMA "{schema}" CASCADE')
+    connection.close()
+    if server is not None:
+        server.cleanup()
+
+
+def test_concurrent_toggles_keep_counter_in_sync(database_url):
+    connection = psycopg2.connect(database_url)
+    connection.autocommit = True
+    users = [str(uuid.uuid4()) for _ in range(CLIENTS * 3 // 4)]
+    review_id = str(uuid.uuid4())
+    with connection.cursor() as cursor:
+        for user_id in users:
+            cursor.execute('INSERT INTO "Users" ("id", "username") VALUES (%s, %s)', (user_id, user_id[:8]))
+        cursor.execute('INSERT INTO "Reviews" ("review_id", "user_id", "degree_path", "rating", "review_text") '
+                       'VALUES (%s, %s, %s, 5, %s)', (review_id, users[0], "graduates/mba", "Great"))
+
+    errors = []
+    barrier = threading.Barrier(CLIENTS)
+
+    def click(user_id):
+        # Some users get two clients, like the same account clicking in two tabs
+        client = psycopg2.connect(database_url)
+        client.autocommit = True
+        try:
+            barrier.wait()
+            with client.cursor() as cursor:
+                for _ in range(TOGGLES_PER_CLIENT):
+                    cursor.execute("SELECT * FROM toggle_review_like(%s, %s)", (review_id, user_id))
+                    if cursor.fetchone() is None:
+                        errors.append("review not found")
+        except Exception as e:
+            errors.append(str(e))
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=click, args=(users[i % len(users)],)) for i in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT "likes" FROM "Reviews" WHERE "review_id" = %s', (review_id,))
+        likes = cursor.fetchone()[0]
+        cursor.execute('SELECT COUNT(*) FROM "ReviewLikes" WHERE "review_id" = %s', (review_id,))
+        like_rows = cursor.fetchone()[0]
+        cursor.execute('SELECT "total_likes" FROM "ReviewAggregates" WHERE "degree_path" = %s', ("graduates/mba",))
+        total_likes = cursor.fetchone()[0]
+    connection.close()
+
+    assert likes == like_rows
+    assert total_likes == like_rows
+    # Users with one client toggled an odd number of times and end up liking the review
+    single_client_users = len(users) - (CLIENTS - len(users))
+    assert like_rows == single_client_users
+
+
+def test_toggle_returns_state_and_ignores_missing_review(database_url):
+    connection = psycopg2.connect(database_url)
+    connection.autocommit = True
+    user_id, review_id = str(uuid.uuid4()), str(uuid.uuid4())
+    with connection.cursor() as cursor:
+        cursor.execute('INSERT INTO "Users" ("id", "username") VALUES (%s, %s)', (user_id, "liker"))
+        cursor.execute('INSERT INTO "Reviews" ("review_id", "user_id", "degree_path", "rating", "review_text") '
+                       'VALUES (%s, %s, %s, 4, %s)', (review_id, user_id, "graduates/msc", "Good"))
+
+        cursor.execute("SELECT * FROM toggle_review_like(%s, %s)", (review_id, user_id))
+        assert cursor.fetchone() == (True, 1)
+        cursor.execute("SELECT * FROM toggle_review_like(%s, %s)", (review_id, user_id))
+        assert cursor.fetchone() == (False, 0)
+        cursor.execute("SELECT * FROM toggle_review_like(%s, %s)", (str(uuid.uuid4()), user_id))
+        assert cursor.fetchone() is None
+    connection.close()
+
+
+def test_delete_review_removes_likes_toggled_concurrently(database_url):
+    connection = psycopg2.connect(database_url)
+    connection.autocommit = True
+    users = [str(uuid.uuid4()) for _ in range(CLIENTS)]
+    review_id, other_review_id = str(uuid.uuid4()), str(uuid.uuid4())
+    with connection.cursor() as cursor:
+        for user_id in users:
+            cursor.execute('INSERT INTO "Users" ("id", "username") VALUES (%s, %s)', (user_id, user_id[:8]))
+        for review, rating in ((review_id, 3), (other_review_id, 5)):
+            cursor.execute('INSERT INTO "Reviews" ("review_id", "user_id", "degree_path", "rating", "review_text") '
+                           'VALUES (%s, %s, %s, %s, %s)', (review, users[0], "graduates/mca", rating, "Fine"))
+        cursor.execute('INSERT INTO "ReviewAggregates" ("degree_path", "review_count", "rating_sum", "rating_3", "rating_5") '
+                       'VALUES (%s, 2, 8, 1, 1)', ("graduates/mca",))
+        cursor.execute("SELECT * FROM toggle_review_like(%s, %s)", (other_review_id, users[1]))
+
+        # Only the owner may delete
+        cursor.execute("SELECT * FROM delete_review(%s, %s)", (review_id, users[1]))
+        assert cursor.fetchone() is None
+
+    errors = []
+    barrier = threading.Barrier(CLIENTS)
+
+    def click(user_id):
+        client = psycopg2.connect(database_url)
+        client.autocommit = True
+        try:
+            barrier.wait()
+            with client.cursor() as cursor:
+                if user_id == users[0]:
+                    cursor.execute("SELECT * FROM delete_review(%s, %s)", (review_id, user_id))
+                    if cursor.fetchone() != ("graduates/mca",):
+                        errors.append("review not deleted")
+                else:
+                    for _ in range(TOGGLES_PER_CLIENT):
+                        cursor.execute("SELECT * FROM toggle_review_like(%s, %s)", (review_id, user_id))
+                        cursor.fetchall()
+        except Exception as e:
+            errors.append(str(e))
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=click, args=(user_id,)) for user_id in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM "Reviews" WHERE "review_id" = %s', (review_id,))
+        assert cursor.fetchone()[0] == 0
+        cursor.execute('SELECT "review_count", "rating_sum", "rating_3", "rating_5", "total_likes" '
+                       'FROM "ReviewAggregates" WHERE "degree_path" = %s', ("graduates/mca",))
+        # Only the other review and its single like remain
+        assert cursor.fetchone() == (1, 5, 0, 1, 1)
+    connection.close()
@@ -1,4 +1,14 @@
+import os
+
 from app import app
+from news_fetcher import start_news_updater
+
+# With NEWS_UPDATER_ENABLED=1 every gunicorn worker runs the updater loop; the
+# updater lease makes sure only one of them on this node fetches news at a time.
+# It is off by default, so deployments that refresh the news from a separate
+# job (python update_news.py) do not start fetching from every web process.
+if os.getenv("NEWS_UPDATER_ENABLED", "0") == "1":
+    start_news_updater()
 
 if __name__ == "__main__":
-    app.run()
\ No newline at end of file
+    app.run()